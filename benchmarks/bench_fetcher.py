@@ -0,0 +1,44 @@
+"""
+Exercises the concurrent fetch layer against a slow, flaky FixtureProvider (no network):
+
+    python -m benchmarks.bench_fetcher
+
+A single request for the whole list fails as soon as one ticker does; the fetcher returns
+the other columns and an error per failed ticker.
+"""
+import time
+
+from benchmarks.bench_price_store import make_fixture
+from quant_core.fetcher import ConcurrentFetcher
+from quant_core.providers import FixtureProvider
+
+
+def run(n_tickers=50, latency=0.05):
+    fixture = make_fixture(n_tickers, years=1)
+    tickers = list(fixture.columns) + ["DELISTED-USD"]
+    # T003 fails twice (recovers on retry), T007 always fails, DELISTED-USD returns nothing
+    failures = {"T003": 2, "T007": 10 ** 6}
+
+    provider = FixtureProvider(fixture, latency=latency, failures=failures)
+    t0 = time.perf_counter()
+    try:
+        provider.fetch(tickers)
+        single = "OK"
+    except Exception as e:
+        single = f"failed ({e})"
+    print(f"One request for {len(tickers)} tickers: {single} in {time.perf_counter() - t0:.2f}s")
+
+    for concurrency in (1, 4):
+        provider = FixtureProvider(fixture, latency=latency, failures=failures)
+        fetcher = ConcurrentFetcher(provider, batch_size=10, max_concurrency=concurrency, backoff=0.05)
+        t0 = time.perf_counter()
+        prices, errors = fetcher.fetch_report(tickers)
+        seconds = time.perf_counter() - t0
+        print(f"Concurrent fetch (max {concurrency} in flight): {prices.shape[1]}/{len(tickers)} tickers "
+              f"in {seconds:.2f}s, {provider.calls} requests")
+        for t, error in errors.items():
+            print(f"  {t}: {error['kind']} after {error['attempts']} attempt(s) - {error['message']}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+"""
+Startup cost of the headless entry points (report and CLI).
+
+    python -m benchmarks.bench_import
+
+Each entry point is imported in a fresh interpreter (best of --repeat runs). The run
+fails if an entry point loads one of the UI/network libraries or exceeds its budget.
+"""
+import sys
+import json
+import argparse
+import subprocess
+
+# Modules that must never be imported on the headless paths
+FORBIDDEN = ["streamlit", "plotly", "yfinance", "pandas_market_calendars"]
+
+# Entry point -> (code run in a fresh interpreter, budget in seconds)
+ENTRY_POINTS = {
+    "cli --help": ("import sys; sys.argv = ['quant_core', '--help']\ntry:\n    import runpy; runpy.run_module('quant_core', run_name='__main__')\nexcept SystemExit:\n    pass", 0.2),
+    "report_generator": ("import report_generator", 1.0),
+    "quant_a engine": ("import quant_a_single_asset.engine", 1.0),
+    "quant_b engine": ("import quant_b_portfolio.portfolio_engine", 1.0),
+}
+
+PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code, repeat=3):
+    """
+    Best import time of `code` in fresh interpreters, plus the forbidden modules it loaded.
+    """
+    best, loaded = None, []
+    for _ in range(repeat):
+        probe = PROBE.format(code=code, forbidden=FORBIDDEN)
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = result["seconds"] if best is None else min(best, result["seconds"])
+        loaded = result["loaded"]
+    return best, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time benchmark of the headless entry points")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, (code, budget) in ENTRY_POINTS.items():
+        seconds, loaded = measure(code, args.repeat)
+        ok = seconds <= budget and not loaded
+        failed |= not ok
+        extra = f"  loaded: {', '.join(loaded)}" if loaded else ""
+        print(f"{name:<20} {seconds * 1000:8.1f} ms  (budget {budget * 1000:.0f} ms)  {'ok' if ok else 'FAIL'}{extra}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Measures cold-start and warm-reload latency of the local price store.
+Runs fully offline against a FixtureProvider that sleeps `latency` seconds per request,
+behind the concurrent fetch layer as in the app, so the cold start pays for the network
+the store then saves:
+
+    python -m benchmarks.bench_price_store
+"""
+import tempfile
+import numpy as np
+import pandas as pd
+
+from quant_core.bar_store import BarStore
+from quant_core.fetcher import ConcurrentFetcher
+from quant_core.providers import FixtureProvider
+
+
+def make_fixture(n_tickers=50, years=2, seed=0):
+    """
+    Random-walk closes ending today, one column per fake ticker.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=365 * years, freq="D")
+    rets = rng.normal(0.0003, 0.02, size=(len(index), n_tickers))
+    closes = 100 * np.exp(np.cumsum(rets, axis=0))
+    return pd.DataFrame(closes, index=index, columns=[f"T{i:03d}" for i in range(n_tickers)])
+
+
+def run(n_tickers=50, years=2, latency=0.25):
+    fixture = make_fixture(n_tickers, years)
+    tickers = list(fixture.columns)
+    with tempfile.TemporaryDirectory() as root:
+        provider = FixtureProvider(fixture, latency=latency)
+        store = BarStore(root=root, provider=ConcurrentFetcher(provider), max_age=300)
+
+        store.load(tickers, period=f"{years}y")
+        cold = store.last_stats
+
+        # Same process: served from memory, files and metadata only stat-ed
+        store.load(tickers, period=f"{years}y")
+        warm = store.last_stats
+
+        # New process on the same directory: every file is read once, nothing is fetched
+        restarted = BarStore(root=root, provider=ConcurrentFetcher(provider), max_age=300)
+        restarted.load(tickers, period=f"{years}y")
+        restart = restarted.last_stats
+
+        # Force the tail refresh path (every ticker's last bar is stale)
+        store.max_age = -1
+        store.load(tickers, period=f"{years}y")
+        tail = store.last_stats
+
+    print(f"Tickers: {n_tickers}, bars: {len(fixture)}, latency: {latency * 1000:.0f} ms/request, "
+          f"provider calls: {provider.calls}")
+    for label, stats in [("cold start", cold), ("warm reload", warm), ("restart", restart), ("tail refresh", tail)]:
+        print(f"{label:>13}: total {stats['total_seconds'] * 1000:8.1f} ms "
+              f"(read {stats['read_seconds'] * 1000:.1f} ms, fetch {stats['fetch_seconds'] * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+"""
+Compares the rebalancing engines against the original day-by-day loop, checking
+equivalence and timing across asset counts and history lengths (calendar schedule,
+then a 5% tolerance band). simulate_portfolio runs the event kernel (simulate_events);
+on calendar schedules the segment engine behind the batch and compact simulations
+(simulate_rebalanced) is checked as well, directly and chunk by chunk:
+
+    python -m benchmarks.bench_rebalance
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from quant_b_portfolio.portfolio_engine import simulate_portfolio, simulate_portfolio_compact
+from quant_b_portfolio.rebalance_engine import simulate_rebalanced_loop, simulate_rebalanced, rebalance_mask, DEFAULT_BAND
+from quant_core.intraday import CompactPanel
+
+
+def make_prices(n_assets, n_days, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01", periods=n_days, freq="D")
+    rets = rng.normal(0.0003, 0.02, size=(n_days, n_assets))
+    return pd.DataFrame(100 * np.cumprod(1 + rets, axis=0), index=index,
+                        columns=[f"A{i}" for i in range(n_assets)])
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), out
+
+
+def segment_paths(prices, weights, freq):
+    """
+    The calendar-schedule paths of the segment engine: in one matrix product (as the batch
+    simulation) and chunk by chunk over a float64 CompactPanel (as the compact one).
+    """
+    returns = prices.pct_change().fillna(0).to_numpy(dtype=float)
+    w = np.array([weights[t] for t in prices.columns])
+    direct = simulate_rebalanced(returns, w, rebalance_mask(prices.index, freq))
+    panel = CompactPanel.from_frame(prices, dtype=np.float64)
+    chunked = simulate_portfolio_compact(panel, weights, freq, chunk_rows=max(2, len(prices) // 7)).values
+    return direct, chunked
+
+
+def run(asset_counts=(3, 10, 50), day_counts=(365, 730, 1825), freq="Monthly"):
+    band = DEFAULT_BAND if freq == "Tolerance Band" else None
+    print(freq)
+    header = f"{'assets':>6} {'days':>6} {'loop ms':>10} {'vector ms':>10} {'speedup':>8} {'max abs err':>12}"
+    print(header if band else header + f" {'segment ms':>10} {'max abs err':>12}")
+    for n_assets in asset_counts:
+        for n_days in day_counts:
+            prices = make_prices(n_assets, n_days)
+            normalized = prices / prices.iloc[0] * 100
+            weights = {t: 1.0 / n_assets for t in prices.columns}
+            returns = prices.pct_change().fillna(0)
+
+            loop_s, expected = best_of(lambda: simulate_rebalanced_loop(returns, weights, freq, band), repeat=1)
+            vec_s, actual = best_of(lambda: simulate_portfolio(prices, normalized, weights, freq))
+            err = float(np.max(np.abs(expected.values - actual.values)))
+            assert np.allclose(expected.values, actual.values, rtol=1e-10, atol=1e-8)
+            line = (f"{n_assets:>6} {n_days:>6} {loop_s * 1000:>10.1f} {vec_s * 1000:>10.2f} "
+                    f"{loop_s / vec_s:>7.0f}x {err:>12.2e}")
+            if band is None:
+                seg_s, paths = best_of(lambda: segment_paths(prices, weights, freq))
+                seg_err = max(float(np.max(np.abs(expected.values - p))) for p in paths)
+                assert all(np.allclose(expected.values, p, rtol=1e-10, atol=1e-8) for p in paths)
+                line += f" {seg_s * 1000:>10.2f} {seg_err:>12.2e}"
+            print(line)
+
+
+if __name__ == "__main__":
+    run()
+    run(freq="Tolerance Band")
@@ -0,0 +1,86 @@
+"""
+Cold report script vs resident daemon, fully offline: a fixture provider reveals one new
+daily bar per run, the cold script runs in a fresh process each time (as from cron) and
+the daemon keeps its state between runs.
+
+    python -m benchmarks.bench_report_daemon [--tickers 20] [--runs 5]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import resource
+import subprocess
+
+from benchmarks.bench_price_store import make_fixture
+from quant_core.bar_store import BarStore, set_default_store
+from quant_core.fetcher import ConcurrentFetcher
+from quant_core.providers import FixtureProvider
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_configs(path, tickers):
+    os.makedirs(path, exist_ok=True)
+    configs = {
+        "a_momentum.json": {"ticker": tickers[0], "strategy": "Momentum (SMA Crossover)",
+                            "params": {"short_window": 20, "long_window": 50}},
+        "a_rsi.json": {"ticker": tickers[1], "strategy": "RSI Strategy", "params": {"rsi_period": 14}},
+        "b_hold.json": {"tickers": tickers[:5], "weights": {}, "equal_weights": True, "freq": "None", "timeframe": "1y"},
+        "b_monthly.json": {"tickers": tickers, "weights": {}, "equal_weights": True, "freq": "Monthly", "timeframe": "1y"},
+    }
+    for name, conf in configs.items():
+        with open(os.path.join(path, name), "w") as f:
+            json.dump(conf, f)
+
+
+def write_fixture(path, frame):
+    os.makedirs(path, exist_ok=True)
+    for t in frame.columns:
+        frame[[t]].rename(columns={t: "Close"}).to_csv(os.path.join(path, f"{t}.csv"), index_label="Date")
+
+
+def run(n_tickers=20, runs=5):
+    fixture = make_fixture(n_tickers, years=2)
+    tickers = list(fixture.columns)
+    with tempfile.TemporaryDirectory() as root:
+        cfg, fx = os.path.join(root, "cfg"), os.path.join(root, "fx")
+        write_configs(cfg, tickers)
+        env = {**os.environ, "PYTHONPATH": ROOT, "QUANT_DATA_PROVIDER": f"fixture:{fx}",
+               "QUANT_PRICE_STORE": os.path.join(root, "store_cold")}
+
+        provider = FixtureProvider(fixture.iloc[:len(fixture) - runs])
+        set_default_store(BarStore(root=os.path.join(root, "store_warm"), provider=ConcurrentFetcher(provider), max_age=0))
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            from report_daemon import ReportDaemon
+            daemon = ReportDaemon([cfg], log_path=None, profile_log=None)
+            print(f"{'run':>4} {'cold s':>8} {'cold MB':>8} {'daemon s':>9} {'daemon MB':>10} {'new bars':>9}")
+            for i in range(runs):
+                # One more bar is available on each run
+                visible = fixture.iloc[:len(fixture) - runs + i + 1]
+                write_fixture(fx, visible)
+                provider.frames = visible
+
+                t0 = time.perf_counter()
+                subprocess.run([sys.executable, "-m", "quant_core", "report", "--configs", cfg],
+                               cwd=root, env=env, check=True, capture_output=True)
+                cold_s = time.perf_counter() - t0
+                cold_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+                record = daemon.tick()
+                print(f"{i + 1:>4} {cold_s:>8.3f} {cold_mb:>8.1f} {record['seconds']:>9.3f} "
+                      f"{record['rss_mb']:>10.1f} {record['new_bars']:>9}")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run(args.tickers, args.runs)
@@ -0,0 +1,261 @@
+"""
+Offline benchmark suite for the engines, built on the synthetic price generator.
+
+    python -m benchmarks.run_benchmarks                     # default sizes
+    python -m benchmarks.run_benchmarks --sizes 500x10 10000x500 --output out.json
+    python -m benchmarks.run_benchmarks --compare old.json new.json
+
+Each stage is timed (best of --repeat runs) and its peak Python/NumPy allocation is
+measured with tracemalloc in a separate run. Results are saved as JSON under
+benchmarks/results/ so runs from different commits can be compared.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_prices
+from quant_core.bar_store import BarStore, set_default_store
+from quant_core.providers import FixtureProvider
+from quant_core.memo import Memo, set_memo
+from quant_core.panel import clear_panels
+from quant_a_single_asset.engine import apply_strategy, compute_performance_metrics
+from quant_a_single_asset.screener import screen_universe
+from quant_b_portfolio.portfolio_engine import fetch_portfolio_data, simulate_portfolio, get_advanced_metrics
+from quant_b_portfolio.batch_engine import simulate_portfolios, random_weights
+from quant_b_portfolio.optimizer import optimize_portfolio, OBJECTIVES
+from quant_b_portfolio.monte_carlo import simulate_risk
+from quant_core.charting import decimate
+from quant_core.drawdowns import drawdown_episodes
+from quant_core.rolling import rolling_metrics, rolling_max_drawdown, rolling_correlation
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_SIZES = ["500x10", "2500x50", "10000x500"]
+# Weight vectors of the batch simulation stages
+BATCH_PORTFOLIOS = 100
+# Rolling window of the rolling metric stages, and the columns given to the slow pandas references
+ROLLING_WINDOW = 63
+ROLLING_REFERENCE_COLUMNS = 5
+STRATEGIES = {
+    "Buy and Hold": {},
+    "Momentum (SMA Crossover)": {"short_window": 20, "long_window": 50},
+    "RSI Strategy": {"rsi_period": 14},
+    "Bollinger Bands": {"bb_window": 20, "bb_std": 2.0},
+}
+
+
+def measure(fn, repeat=3):
+    """
+    Returns (result, best seconds, peak MB).
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(times), peak / 1e6
+
+
+def portfolio_loop(prices, normalized, weight_matrix, rebalance_freq):
+    """
+    Total return and realized volatility of each portfolio, simulated one at a time.
+    """
+    total_return, port_vol = [], []
+    for w in weight_matrix:
+        values = simulate_portfolio(prices, normalized, dict(zip(prices.columns, w)), rebalance_freq)
+        total_return.append(values.iloc[-1] / 100 - 1)
+        port_vol.append(values.pct_change().std() * np.sqrt(252))
+    return {"Total Return": np.array(total_return), "Portfolio Vol": np.array(port_vol)}
+
+
+def window_max_drawdown(x):
+    # pandas rolling().apply reference for rolling_max_drawdown
+    return np.min(x / np.maximum.accumulate(x) - 1)
+
+
+def pandas_rolling(levels, window):
+    """
+    rolling_metrics computed with pandas rolling mean/std.
+    """
+    returns = levels.pct_change()
+    vol = returns.rolling(window).std() * np.sqrt(252)
+    return {"Volatility": vol, "Sharpe Ratio": returns.rolling(window).mean() * 252 / vol}
+
+
+def pandas_correlation(returns, window):
+    """
+    Pairwise rolling correlation with pandas, one pair at a time.
+    """
+    cols = list(returns.columns)
+    return {(a, b): returns[a].rolling(window).corr(returns[b])
+            for i, a in enumerate(cols) for b in cols[i + 1:]}
+
+
+def check(name, actual, expected, rtol=1e-9, atol=1e-12):
+    """
+    Fails the run when an optimized engine drifts from its reference (NaNs must match).
+    """
+    for key, value in expected.items():
+        a, b = np.asarray(actual[key], dtype=float), np.asarray(value, dtype=float)
+        err = float(np.nanmax(np.abs(a - b))) if np.isfinite(a - b).any() else 0.0
+        assert np.allclose(a, b, rtol=rtol, atol=atol, equal_nan=True), f"{name}: {key} differs by {err:.2e}"
+    print(f"{'':>11} {name}: OK")
+
+
+def bench_size(n_bars, n_assets, repeat=3, seed=0):
+    rows = []
+
+    def record(stage, fn, n=repeat):
+        result, seconds, peak = measure(fn, n)
+        rows.append({"stage": stage, "bars": n_bars, "assets": n_assets, "seconds": seconds, "peak_mb": peak})
+        print(f"{n_bars:>6}x{n_assets:<4} {stage:<40} {seconds * 1000:>10.1f} ms {peak:>9.1f} MB")
+        return result
+
+    fixture = generate_prices(n_bars, n_assets, seed=seed)
+    tickers = list(fixture.columns)
+    weights = {t: 1.0 / n_assets for t in tickers}
+
+    with tempfile.TemporaryDirectory() as root:
+        # Cold start: every fetch downloads from the provider into a fresh store
+        def cold_fetch():
+            store = BarStore(root=tempfile.mkdtemp(dir=root), provider=FixtureProvider(fixture))
+            set_default_store(store)
+            return fetch_portfolio_data(tickers, period="max")
+        record("fetch (cold store)", cold_fetch, n=1)
+
+        # Warm store, but the shared panel is rebuilt each time
+        def warm_fetch():
+            clear_panels()
+            return fetch_portfolio_data(tickers, period="max")
+        prices, normalized = record("fetch (warm store)", warm_fetch)
+        set_default_store(None)
+
+    for freq in ["Weekly", "Monthly", "Yearly", "Tolerance Band", "None"]:
+        port = record(f"simulate_portfolio [{freq}]",
+                      lambda: simulate_portfolio(prices, normalized, weights, freq))
+    metrics = record("get_advanced_metrics", lambda: get_advanced_metrics(prices, port, weights))
+
+    # Many weight vectors: one batched pass vs one simulate_portfolio per portfolio
+    weight_matrix = random_weights(BATCH_PORTFOLIOS, n_assets, seed=seed)
+    batch = record(f"simulate_portfolios [{BATCH_PORTFOLIOS} x Monthly]",
+                   lambda: simulate_portfolios(prices, weight_matrix, "Monthly", return_paths=False))
+    looped = record(f"simulate_portfolio loop [{BATCH_PORTFOLIOS} x Monthly]",
+                    lambda: portfolio_loop(prices, normalized, weight_matrix, "Monthly"), n=1)
+    check("simulate_portfolios vs loop", batch, looped)
+    for objective in OBJECTIVES:
+        record(f"optimize_portfolio [{objective}]",
+               lambda: optimize_portfolio(metrics["Covariance"], metrics["Expected Returns"], objective, target_vol=0.2))
+    record("simulate_risk [bootstrap 10k x 252]", lambda: simulate_risk(prices, weights, 10_000, 252), n=1)
+    record("decimate (chart lines)", lambda: [decimate(normalized[t]) for t in tickers] + [decimate(port)])
+    record("drawdown_episodes (assets + portfolio)", lambda: drawdown_episodes(normalized.assign(Portfolio=port)))
+
+    # Rolling metrics of the whole matrix vs pandas; the pandas max drawdown and correlation
+    # run a Python function per window or pair, so they only get the first few columns
+    window, levels = ROLLING_WINDOW, normalized.assign(Portfolio=port)
+    rolling = record(f"rolling_metrics [{window}] vol/Sharpe/max dd", lambda: rolling_metrics(levels, window))
+    expected = record(f"pandas rolling [{window}] vol/Sharpe", lambda: pandas_rolling(levels, window))
+    check("rolling_metrics vs pandas", rolling, expected, rtol=1e-8)
+    few = levels.iloc[:, :ROLLING_REFERENCE_COLUMNS]
+    mdd = record(f"rolling_max_drawdown [{window}] x {few.shape[1]}", lambda: rolling_max_drawdown(few, window))
+    expected = record(f"pandas rolling.apply max dd [{window}] x {few.shape[1]}",
+                      lambda: few.rolling(window).apply(window_max_drawdown, raw=True), n=1)
+    check("rolling_max_drawdown vs pandas", {"Max Drawdown": mdd}, {"Max Drawdown": expected})
+    few_returns = few.pct_change()
+    corr = record(f"rolling_correlation [{window}] x {few.shape[1]}", lambda: rolling_correlation(few_returns, window))
+    expected = record(f"pandas rolling corr [{window}] x {few.shape[1]}", lambda: pandas_correlation(few_returns, window))
+    check("rolling_correlation vs pandas", corr, expected, rtol=1e-8, atol=1e-10)
+
+    series = prices[tickers[0]]
+    for strategy, params in STRATEGIES.items():
+        strat = record(f"apply_strategy [{strategy}]", lambda: apply_strategy(series, strategy, params))
+    record("compute_performance_metrics", lambda: compute_performance_metrics(strat))
+    record("screen_universe [RSI Strategy]", lambda: screen_universe(prices, "RSI Strategy", {"rsi_period": 14}))
+    return rows
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+def run(sizes=DEFAULT_SIZES, repeat=3, output=None):
+    # Engines are timed without memoization (nothing cached in memory or on disk)
+    set_memo(Memo(cache_dir=None, max_memory_items=0))
+    results = []
+    for size in sizes:
+        n_bars, n_assets = (int(x) for x in size.lower().split("x"))
+        results.extend(bench_size(n_bars, n_assets, repeat))
+
+    commit = git_commit()
+    payload = {
+        "commit": commit,
+        "timestamp": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{commit}-{pd.Timestamp.now().strftime('%Y%m%d%H%M%S')}.json")
+    with open(output, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results saved: {output}")
+    return payload
+
+
+def compare(old_path, new_path, threshold=1.2):
+    """
+    Prints the time ratio (new / old) per stage and flags regressions above threshold.
+    Returns the number of regressions.
+    """
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    base = {(r["stage"], r["bars"], r["assets"]): r for r in old["results"]}
+    regressions = 0
+    print(f"{old['commit']} -> {new['commit']}")
+    for r in new["results"]:
+        key = (r["stage"], r["bars"], r["assets"])
+        if key not in base:
+            continue
+        ratio = r["seconds"] / max(base[key]["seconds"], 1e-9)
+        flag = "REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print(f"{r['bars']:>6}x{r['assets']:<4} {r['stage']:<40} {ratio:>6.2f}x  "
+              f"{base[key]['peak_mb']:>8.1f} -> {r['peak_mb']:>8.1f} MB {flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline engine benchmarks")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="BARSxASSETS, e.g. 2500x50")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args(argv)
+    if args.compare:
+        return 1 if compare(*args.compare, threshold=args.threshold) else 0
+    run(args.sizes, args.repeat, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
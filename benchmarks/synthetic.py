@@ -0,0 +1,43 @@
+"""
+Seeded synthetic price generator for offline benchmarks.
+"""
+import numpy as np
+import pandas as pd
+
+
+def generate_prices(n_bars=500, n_assets=10, correlation=0.3, crypto_fraction=0.5,
+                    annual_drift=0.05, annual_vol=0.3, holiday_rate=0.02, seed=0, end=None):
+    """
+    Correlated geometric Brownian motion on a 7-day calendar ending `end` (default today).
+
+    correlation: constant pairwise correlation (one-factor model) or a full (N x N) matrix.
+    The first `crypto_fraction` of the columns trade every day ("-USD" tickers); the rest
+    mimic stocks: NaN on weekends and on random holidays, like a mixed Yahoo download.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end)
+    index = pd.date_range(end=end, periods=n_bars, freq="D")
+    dt = 1 / 365
+
+    if np.isscalar(correlation):
+        rho = float(correlation)
+        common = rng.standard_normal((n_bars, 1))
+        shocks = np.sqrt(rho) * common + np.sqrt(1 - rho) * rng.standard_normal((n_bars, n_assets))
+    else:
+        chol = np.linalg.cholesky(np.asarray(correlation, dtype=float))
+        shocks = rng.standard_normal((n_bars, n_assets)) @ chol.T
+
+    vols = annual_vol * rng.uniform(0.5, 1.5, size=n_assets)
+    log_rets = (annual_drift - 0.5 * vols ** 2) * dt + vols * np.sqrt(dt) * shocks
+    log_rets[0] = 0
+    prices = 100 * np.exp(np.cumsum(log_rets, axis=0))
+
+    n_crypto = int(round(n_assets * crypto_fraction))
+    names = [f"C{i:03d}-USD" for i in range(n_crypto)] + [f"S{i:03d}.PA" for i in range(n_assets - n_crypto)]
+    frame = pd.DataFrame(prices, index=index, columns=names)
+
+    if n_assets > n_crypto:
+        closed = np.asarray(index.dayofweek >= 5)
+        closed |= rng.random(n_bars) < holiday_rate
+        frame.iloc[closed, n_crypto:] = np.nan
+    return frame
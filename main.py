@@ -1,18 +1,19 @@
+import importlib.util
 import streamlit as st
 
-# 1. Attempt to import Quant B (already exists)
-try:
-    from quant_b_portfolio.portfolio_ui import run_portfolio_module
-    QUANT_B_AVAILABLE = True
-except ImportError:
-    QUANT_B_AVAILABLE = False
+# The UI modules (and plotly) are only imported for the page being rendered;
+# here we just check that their files are present.
+def module_available(name):
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:
+        return False
 
-# 2. Attempt to import Quant A (may be missing)
-try:
-    from quant_a_single_asset.ui import run_single_asset_module
-    QUANT_A_AVAILABLE = True
-except ImportError:
-    QUANT_A_AVAILABLE = False
+# 1. Quant B (already exists)
+QUANT_B_AVAILABLE = module_available("quant_b_portfolio.portfolio_ui")
+
+# 2. Quant A (may be missing)
+QUANT_A_AVAILABLE = module_available("quant_a_single_asset.ui")
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -30,12 +31,14 @@ selection = st.sidebar.radio(
 # --- Main Logic ---
 if selection == "Portfolio Management (Quant B)":
     if QUANT_B_AVAILABLE:
+        from quant_b_portfolio.portfolio_ui import run_portfolio_module
         run_portfolio_module()
     else:
         st.error("Error: Portfolio module files not found in 'quant_b_portfolio' folder.")
 
 elif selection == "Single Asset Analysis (Quant A)":
     if QUANT_A_AVAILABLE:
+        from quant_a_single_asset.ui import run_single_asset_module
         run_single_asset_module()
     else:
         # User-friendly message if the folder/module isn't there yet
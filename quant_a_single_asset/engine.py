@@ -1,15 +1,17 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
+from quant_core.panel import get_panel
+from quant_core.memo import memoize
 
-def fetch_asset_data(ticker, period="1y"):
+def fetch_asset_data(ticker, period="1y", interval="1d"):
     """
-    Retrieves historical price data for a single asset.
+    Retrieves historical price data for a single asset (served from the shared price panel,
+    e.g. the one the screener loaded for the whole universe).
     """
     try:
-        data = yf.download(ticker, period=period, interval="1d", auto_adjust=True)
-        if data.empty: return None
-        return data['Close'].squeeze() 
+        panel = get_panel([ticker], period=period, interval=interval)
+        if panel.empty or ticker not in panel: return None
+        return panel.asset(ticker)
     except Exception as e:
         print(f"Error: {e}")
         return None
@@ -60,16 +62,54 @@ def apply_strategy(prices, strategy_type="Buy and Hold", params=None):
     strat_returns = returns * position
     return (1 + strat_returns).cumprod() * 100
 
-def compute_performance_metrics(strategy_series):
+def apply_strategy_frame(prices, strategy_type="Buy and Hold", params=None):
+    """
+    Column-wise version of apply_strategy: one strategy path per price column.
+    Columns must share the same bars (no gaps), as for a single asset.
+    """
+    params = params or {}
+    returns = prices.pct_change().fillna(0)
+
+    if strategy_type == "Momentum (SMA Crossover)":
+        short_sma = prices.rolling(window=params.get('short_window', 20)).mean()
+        long_sma = prices.rolling(window=params.get('long_window', 50)).mean()
+        position = (short_sma > long_sma).astype(int).shift(1).fillna(0)
+
+    elif strategy_type in ("RSI Strategy", "Bollinger Bands"):
+        if strategy_type == "RSI Strategy":
+            window = params.get('rsi_period', 14)
+            delta = prices.diff()
+            gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+            rsi = 100 - (100 / (1 + gain / loss))
+            buy, sell = rsi < 30, rsi > 70
+        else:
+            window = params.get('bb_window', 20)
+            num_std = params.get('bb_std', 2)
+            sma = prices.rolling(window=window).mean()
+            std = prices.rolling(window=window).std()
+            buy, sell = prices < sma - std * num_std, prices > sma + std * num_std
+        # Same latching as apply_strategy: 1 on buy, 0 on sell (sell wins), held in between
+        signal = np.where(buy, 1.0, np.nan)
+        signal[sell.to_numpy()] = 0.0
+        position = pd.DataFrame(signal, index=prices.index, columns=prices.columns).ffill().fillna(0).shift(1)
+
+    else: # Buy and Hold
+        return (1 + returns).cumprod() * 100
+
+    return (1 + returns * position).cumprod() * 100
+
+def compute_performance_metrics(strategy_series, periods_per_year=252):
     """
     Computes standard risk/return metrics for the strategy.
+    periods_per_year annualizes per-bar returns (see quant_core.intraday.periods_per_year).
     """
     if strategy_series.empty or strategy_series.std() == 0:
         return {"Sharpe Ratio": 0, "Max Drawdown": 0, "Total Return": 0, "Volatility": 0}
 
     returns = strategy_series.pct_change().dropna()
-    vol = float(returns.std() * np.sqrt(252))
-    sharpe = float((returns.mean() * 252) / vol) if vol > 0 else 0
+    vol = float(returns.std() * np.sqrt(periods_per_year))
+    sharpe = float((returns.mean() * periods_per_year) / vol) if vol > 0 else 0
     
     cum_max = strategy_series.cummax()
     drawdown = (strategy_series - cum_max) / cum_max
@@ -81,3 +121,32 @@ def compute_performance_metrics(strategy_series):
         "Total Return": float((strategy_series.iloc[-1] / 100) - 1),
         "Volatility": vol
     }
+
+def compute_performance_metrics_frame(strategy_frame, periods_per_year=252):
+    """
+    Column-wise version of compute_performance_metrics: one row of metrics per strategy column.
+    """
+    cols = ["Sharpe Ratio", "Max Drawdown", "Total Return", "Volatility"]
+    if strategy_frame.empty:
+        return pd.DataFrame(0.0, index=strategy_frame.columns, columns=cols)
+
+    returns = strategy_frame / strategy_frame.shift(1) - 1
+    vol = returns.std() * np.sqrt(periods_per_year)
+    sharpe = (returns.mean() * periods_per_year / vol).where(vol > 0, 0.0)
+
+    cum_max = strategy_frame.cummax()
+    max_dd = ((strategy_frame - cum_max) / cum_max).min()
+
+    metrics = pd.DataFrame({
+        "Sharpe Ratio": sharpe,
+        "Max Drawdown": max_dd,
+        "Total Return": strategy_frame.iloc[-1] / 100 - 1,
+        "Volatility": vol
+    }, columns=cols).astype(float)
+    # Flat strategies report zeros, as in the single-series version
+    metrics.loc[strategy_frame.std() == 0] = 0.0
+    return metrics
+
+# Memoized variants (content hash of prices + config), shared by the dashboard and the report
+cached_apply_strategy = memoize("apply_strategy")(apply_strategy)
+cached_compute_performance_metrics = memoize("compute_performance_metrics")(compute_performance_metrics)
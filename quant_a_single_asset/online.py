@@ -0,0 +1,328 @@
+import json
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+class RollingWindow:
+    """
+    Fixed-size window with O(1) updates of its mean (compensated running sum)
+    and sample standard deviation (Welford replace update).
+    """
+
+    def __init__(self, window):
+        self.window = int(window)
+        self.values = deque()
+        self.total = 0.0
+        self.comp = 0.0
+        self.mean_w = 0.0
+        self.m2 = 0.0
+
+    def _add(self, x):
+        # Neumaier compensated summation keeps the running sum exact over long histories
+        t = self.total + x
+        if abs(self.total) >= abs(x):
+            self.comp += (self.total - t) + x
+        else:
+            self.comp += (x - t) + self.total
+        self.total = t
+
+    def push(self, x):
+        x = float(x)
+        if len(self.values) == self.window:
+            old = self.values.popleft()
+            self._add(-old)
+            delta = x - old
+            new_mean = self.mean_w + delta / self.window
+            self.m2 = max(self.m2 + delta * (x - new_mean + old - self.mean_w), 0.0)
+            self.mean_w = new_mean
+        else:
+            n = len(self.values) + 1
+            delta = x - self.mean_w
+            self.mean_w += delta / n
+            self.m2 += delta * (x - self.mean_w)
+        self.values.append(x)
+        self._add(x)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.window
+
+    @property
+    def mean(self):
+        return (self.total + self.comp) / self.window if self.ready else np.nan
+
+    @property
+    def std(self):
+        if not self.ready or self.window < 2:
+            return np.nan
+        return math.sqrt(self.m2 / (self.window - 1))
+
+    def to_dict(self):
+        return {"window": self.window, "values": list(self.values), "total": self.total,
+                "comp": self.comp, "mean": self.mean_w, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls(d["window"])
+        obj.values = deque(d["values"])
+        obj.total, obj.comp, obj.mean_w, obj.m2 = d["total"], d["comp"], d["mean"], d["m2"]
+        return obj
+
+
+class OnlineStrategy:
+    """
+    Bar-by-bar version of apply_strategy: indicators are updated in O(1) per new price
+    and the cumulative strategy value is extended instead of recomputed.
+    """
+
+    def __init__(self, strategy_type="Buy and Hold", params=None):
+        self.strategy_type = strategy_type
+        self.params = dict(params or {})
+        p = self.params
+        self.windows = {}
+        if strategy_type == "Momentum (SMA Crossover)":
+            self.windows["short"] = RollingWindow(p.get('short_window', 20))
+            self.windows["long"] = RollingWindow(p.get('long_window', 50))
+        elif strategy_type == "RSI Strategy":
+            self.windows["gain"] = RollingWindow(p.get('rsi_period', 14))
+            self.windows["loss"] = RollingWindow(p.get('rsi_period', 14))
+        elif strategy_type == "Bollinger Bands":
+            self.windows["band"] = RollingWindow(p.get('bb_window', 20))
+        self.last_price = None
+        self.position = 0.0      # Position held over the next bar
+        self.signal = np.nan     # Latched RSI/Bollinger signal
+        self.cum = 1.0
+        self.count = 0
+
+    @property
+    def latching(self):
+        return self.strategy_type in ("RSI Strategy", "Bollinger Bands")
+
+    def _next_position(self, price):
+        w = self.windows
+        if self.strategy_type == "Momentum (SMA Crossover)":
+            return 1.0 if w["short"].mean > w["long"].mean else 0.0
+        if self.strategy_type == "RSI Strategy":
+            gain, loss = w["gain"].mean, w["loss"].mean
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rsi = 100 - (100 / (1 + np.float64(gain) / np.float64(loss)))
+            if rsi < 30: self.signal = 1.0
+            elif rsi > 70: self.signal = 0.0
+        elif self.strategy_type == "Bollinger Bands":
+            band = w["band"]
+            num_std = self.params.get('bb_std', 2)
+            if price < band.mean - band.std * num_std: self.signal = 1.0
+            elif price > band.mean + band.std * num_std: self.signal = 0.0
+        else:
+            return 1.0
+        return 0.0 if np.isnan(self.signal) else self.signal
+
+    def update(self, price):
+        """
+        Consumes one new close and returns the strategy value (base 100) for that bar.
+        """
+        price = float(price)
+        if self.last_price is None:
+            delta = np.nan
+            value = np.nan if self.latching else 100.0
+        else:
+            delta = price - self.last_price
+            ret = price / self.last_price - 1
+            self.cum *= 1 + ret * self.position
+            value = self.cum * 100
+
+        if self.strategy_type == "Momentum (SMA Crossover)":
+            self.windows["short"].push(price)
+            self.windows["long"].push(price)
+        elif self.strategy_type == "RSI Strategy":
+            self.windows["gain"].push(delta if delta > 0 else 0.0)
+            self.windows["loss"].push(-delta if delta < 0 else 0.0)
+        elif self.strategy_type == "Bollinger Bands":
+            self.windows["band"].push(price)
+
+        self.position = self._next_position(price)
+        self.last_price = price
+        self.count += 1
+        return value
+
+    def to_dict(self):
+        return {"strategy_type": self.strategy_type, "params": self.params,
+                "windows": {k: w.to_dict() for k, w in self.windows.items()},
+                "last_price": self.last_price, "position": self.position,
+                "signal": None if np.isnan(self.signal) else self.signal,
+                "cum": self.cum, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls(d["strategy_type"], d["params"])
+        obj.windows = {k: RollingWindow.from_dict(w) for k, w in d["windows"].items()}
+        obj.last_price, obj.position, obj.cum, obj.count = d["last_price"], d["position"], d["cum"], d["count"]
+        obj.signal = np.nan if d["signal"] is None else d["signal"]
+        return obj
+
+
+class OnlineMetrics:
+    """
+    Running version of compute_performance_metrics (Welford moments of the returns,
+    running peak for the drawdown).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.level_mean = 0.0
+        self.level_m2 = 0.0
+        self.n_ret = 0
+        self.ret_mean = 0.0
+        self.ret_m2 = 0.0
+        self.prev = None
+        self.peak = -np.inf
+        self.max_dd = 0.0
+        self.last = None
+
+    def update(self, value):
+        if value is None or np.isnan(value):
+            self.prev = None
+            return
+        self.n += 1
+        d = value - self.level_mean
+        self.level_mean += d / self.n
+        self.level_m2 += d * (value - self.level_mean)
+        if self.prev is not None:
+            r = value / self.prev - 1
+            self.n_ret += 1
+            d = r - self.ret_mean
+            self.ret_mean += d / self.n_ret
+            self.ret_m2 += d * (r - self.ret_mean)
+        self.peak = max(self.peak, value)
+        self.max_dd = min(self.max_dd, (value - self.peak) / self.peak)
+        self.prev = value
+        self.last = value
+
+    def metrics(self, periods_per_year=252):
+        if self.n == 0 or self.level_m2 == 0:
+            return {"Sharpe Ratio": 0, "Max Drawdown": 0, "Total Return": 0, "Volatility": 0}
+        std = math.sqrt(self.ret_m2 / (self.n_ret - 1)) if self.n_ret > 1 else np.nan
+        vol = float(std * np.sqrt(periods_per_year))
+        sharpe = float((self.ret_mean * periods_per_year) / vol) if vol > 0 else 0
+        return {
+            "Sharpe Ratio": sharpe,
+            "Max Drawdown": float(self.max_dd),
+            "Total Return": float((self.last / 100) - 1),
+            "Volatility": vol
+        }
+
+    def to_dict(self):
+        return {k: (None if isinstance(v, float) and np.isinf(v) else v) for k, v in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls()
+        obj.__dict__.update(d)
+        if obj.peak is None:
+            obj.peak = -np.inf
+        return obj
+
+
+class IncrementalBacktest:
+    """
+    Keeps the strategy series and its metrics up to date as new bars arrive.
+    update() only processes bars after the last one seen; a revised last bar is
+    replayed from a checkpoint, and a different history start triggers a rebuild
+    (apply_strategy rebases the whole path on the first bar).
+    """
+
+    def __init__(self, strategy_type="Buy and Hold", params=None, periods_per_year=252):
+        self.strategy_type = strategy_type
+        self.params = dict(params or {})
+        self.periods_per_year = periods_per_year
+        self._reset()
+
+    def _reset(self):
+        # Bars pushed by the last update() (a replayed last bar counts)
+        self.new_bars = 0
+        self.strategy = OnlineStrategy(self.strategy_type, self.params)
+        self.tracker = OnlineMetrics()
+        self.checkpoint = None
+        self.index = []
+        self.values = []
+        self.last_bar = None
+
+    def _push(self, ts, price):
+        value = self.strategy.update(price)
+        self.tracker.update(value)
+        self.index.append(ts)
+        self.values.append(value)
+        self.last_bar = (ts, float(price))
+
+    def _restore_checkpoint(self):
+        state = self.checkpoint
+        self.strategy = OnlineStrategy.from_dict(state["strategy"])
+        self.tracker = OnlineMetrics.from_dict(state["tracker"])
+        self.index.pop()
+        self.values.pop()
+        self.last_bar = None if not self.index else (self.index[-1], state["last_price"])
+
+    def update(self, prices):
+        """
+        Extends the backtest with the bars of `prices` it has not seen yet.
+        Returns (strategy_series, metrics) over the whole history; new_bars is then the
+        number of bars processed (0 when nothing changed).
+        """
+        if len(prices) == 0:
+            self._reset()
+            return pd.Series(dtype=float), self.tracker.metrics(self.periods_per_year)
+
+        if not self.index or self.index[0] != prices.index[0] or self.last_bar[0] not in prices.index:
+            self._reset()
+            new = prices
+        else:
+            last_ts, last_price = self.last_bar
+            new = prices.loc[prices.index > last_ts]
+            # The last bar may still have been forming: replay it if it changed
+            if float(prices.loc[last_ts]) != last_price and self.checkpoint is not None:
+                self._restore_checkpoint()
+                new = prices.loc[prices.index >= last_ts]
+
+        for i, (ts, price) in enumerate(new.items()):
+            if i == len(new) - 1:
+                self.checkpoint = {"strategy": self.strategy.to_dict(), "tracker": self.tracker.to_dict(),
+                                   "last_price": self.last_bar[1] if self.last_bar else None}
+            self._push(ts, price)
+        self.new_bars = len(new)
+
+        series = pd.Series(self.values, index=pd.Index(self.index, name=prices.index.name), name=prices.name)
+        return series, self.tracker.metrics(self.periods_per_year)
+
+    def to_dict(self, include_series=True):
+        d = {"strategy_type": self.strategy_type, "params": self.params,
+             "periods_per_year": self.periods_per_year,
+             "strategy": self.strategy.to_dict(), "tracker": self.tracker.to_dict(),
+             "checkpoint": self.checkpoint,
+             "last_bar": None if self.last_bar is None else [pd.Timestamp(self.last_bar[0]).isoformat(), self.last_bar[1]]}
+        if include_series:
+            d["index"] = [pd.Timestamp(t).isoformat() for t in self.index]
+            d["values"] = [None if np.isnan(v) else v for v in self.values]
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        obj = cls(d["strategy_type"], d["params"], d.get("periods_per_year", 252))
+        obj.strategy = OnlineStrategy.from_dict(d["strategy"])
+        obj.tracker = OnlineMetrics.from_dict(d["tracker"])
+        obj.checkpoint = d.get("checkpoint")
+        obj.index = [pd.Timestamp(t) for t in d.get("index", [])]
+        obj.values = [np.nan if v is None else v for v in d.get("values", [])]
+        if d.get("last_bar") and obj.index:
+            obj.last_bar = (pd.Timestamp(d["last_bar"][0]), d["last_bar"][1])
+        return obj
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from quant_a_single_asset.engine import apply_strategy_frame, compute_performance_metrics_frame
+from quant_core.panel import get_panel
+from quant_core.intraday import asset_calendar, periods_per_year
+from quant_core.memo import memoize
+from quant_core.universe import ALL_TICKERS
+
+# Metrics the screener can rank by, and whether lower is better
+RANK_METRICS = {"Sharpe Ratio": False, "Total Return": False, "Max Drawdown": False, "Volatility": True}
+
+
+def load_universe(period="1y", interval="1d", tickers=ALL_TICKERS):
+    """
+    Closes of the whole universe in one read of the local price store (one column per ticker,
+    union calendar, gaps left as NaN). The panel is shared, so single-asset fetches for the
+    same period are then served from it. Returns None if nothing could be loaded.
+    """
+    try:
+        panel = get_panel(tickers, period=period, interval=interval)
+        return None if panel.empty else panel.frame("raw")
+    except Exception as e:
+        print(f"Error: {e}")
+        return None
+
+
+def _calendar_groups(prices):
+    """
+    Columns grouped by their exact set of bars and their trading calendar.
+    """
+    valid = prices.notna().to_numpy()
+    groups = {}
+    for i, ticker in enumerate(prices.columns):
+        if valid[:, i].any():
+            groups.setdefault((valid[:, i].tobytes(), asset_calendar(ticker)), []).append(ticker)
+    return list(groups.values())
+
+
+def screen_universe(prices, strategy_type="Buy and Hold", params=None, interval="1d",
+                    rank_by="Sharpe Ratio", top_k=10):
+    """
+    Runs one Quant A strategy on every ticker of `prices` (as returned by load_universe) and
+    ranks them by `rank_by`. Tickers sharing the same bars are computed together as one
+    DataFrame, so each row equals apply_strategy + compute_performance_metrics on that
+    ticker's own history, annualized with its calendar.
+    Returns the top_k rows (indexed by ticker): the metrics and the number of bars.
+    """
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"Unknown ranking metric: {rank_by}")
+    frames = []
+    for tickers in _calendar_groups(prices):
+        group = prices[tickers].dropna()
+        values = apply_strategy_frame(group, strategy_type, params)
+        metrics = compute_performance_metrics_frame(values, periods_per_year(interval, tickers[:1]))
+        metrics["Bars"] = len(group)
+        frames.append(metrics)
+    if not frames:
+        return pd.DataFrame(columns=list(RANK_METRICS) + ["Bars"])
+    table = pd.concat(frames)
+    table.index.name = "Ticker"
+    return table.sort_values(rank_by, ascending=RANK_METRICS[rank_by], kind="stable").head(top_k)
+
+# Memoized variant: the universe panel only changes when new bars arrive
+cached_screen_universe = memoize("screen_universe")(screen_universe)
@@ -0,0 +1,125 @@
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from quant_a_single_asset.engine import compute_performance_metrics_frame
+
+# Default grids, matching the ranges of the UI sliders
+DEFAULT_GRIDS = {
+    "Momentum (SMA Crossover)": {"short_window": list(range(5, 51, 5)), "long_window": list(range(20, 201, 10))},
+    "RSI Strategy": {"rsi_period": list(range(5, 31))},
+    "Bollinger Bands": {"bb_window": list(range(10, 51, 5)), "bb_std": [1.0, 1.5, 2.0, 2.5, 3.0]},
+    "Buy and Hold": {},
+}
+
+# Strategies evaluated per column block (bounds the T x G working set)
+BLOCK_SIZE = 512
+# Grids larger than this are spread across a process pool
+PARALLEL_THRESHOLD = 5000
+
+
+def expand_grid(grid):
+    """
+    Turns {"param": [values...]} into a list of param dicts (cartesian product).
+    A list of dicts is returned unchanged.
+    """
+    if isinstance(grid, dict):
+        keys = list(grid.keys())
+        return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+    return list(grid)
+
+
+class _RollingCache:
+    """
+    Computes each rolling statistic once per window and shares it across the grid.
+    """
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.delta = prices.diff()
+        self._cache = {}
+
+    def _get(self, key, fn):
+        if key not in self._cache:
+            self._cache[key] = fn().to_numpy(dtype=float)
+        return self._cache[key]
+
+    def sma(self, window):
+        return self._get(("sma", window), lambda: self.prices.rolling(window=window).mean())
+
+    def std(self, window):
+        return self._get(("std", window), lambda: self.prices.rolling(window=window).std())
+
+    def rsi(self, window):
+        def compute():
+            gain = (self.delta.where(self.delta > 0, 0)).rolling(window=window).mean()
+            loss = (-self.delta.where(self.delta < 0, 0)).rolling(window=window).mean()
+            return 100 - (100 / (1 + gain / loss))
+        return self._get(("rsi", window), compute)
+
+
+def _latch(buy, sell, index):
+    # Same signal latching as apply_strategy: 1 on buy, 0 on sell, held in between
+    signal = np.where(buy, 1.0, np.nan)
+    signal[sell] = 0.0
+    return pd.DataFrame(signal, index=index).ffill().fillna(0).shift(1)
+
+
+def _positions(cache, strategy_type, combos):
+    prices = cache.prices
+    index = prices.index
+    if strategy_type == "Momentum (SMA Crossover)":
+        short = np.column_stack([cache.sma(p.get('short_window', 20)) for p in combos])
+        long = np.column_stack([cache.sma(p.get('long_window', 50)) for p in combos])
+        return pd.DataFrame((short > long).astype(int), index=index).shift(1).fillna(0)
+    if strategy_type == "RSI Strategy":
+        rsi = np.column_stack([cache.rsi(p.get('rsi_period', 14)) for p in combos])
+        return _latch(rsi < 30, rsi > 70, index)
+    if strategy_type == "Bollinger Bands":
+        sma = np.column_stack([cache.sma(p.get('bb_window', 20)) for p in combos])
+        std = np.column_stack([cache.std(p.get('bb_window', 20)) for p in combos])
+        num_std = np.array([p.get('bb_std', 2) for p in combos], dtype=float)
+        px = prices.to_numpy(dtype=float)[:, None]
+        return _latch(px < sma - std * num_std, px > sma + std * num_std, index)
+    return pd.DataFrame(1.0, index=index, columns=range(len(combos)))
+
+
+def _sweep_block(prices, strategy_type, combos, cache=None, periods_per_year=252):
+    cache = cache if cache is not None else _RollingCache(prices)
+    returns = prices.pct_change().fillna(0).to_numpy(dtype=float)[:, None]
+    position = _positions(cache, strategy_type, combos)
+    strat_values = (1 + position * returns).cumprod() * 100
+    metrics = compute_performance_metrics_frame(strat_values, periods_per_year)
+    metrics.index = range(len(combos))
+    return pd.concat([pd.DataFrame(combos), metrics], axis=1)
+
+
+def _sweep_chunk(prices, strategy_type, combos, periods_per_year=252):
+    # Worker entry point: one cache per chunk, shared by all of its column blocks
+    cache = _RollingCache(prices)
+    blocks = [_sweep_block(prices, strategy_type, combos[i:i + BLOCK_SIZE], cache, periods_per_year)
+              for i in range(0, len(combos), BLOCK_SIZE)]
+    return pd.concat(blocks, ignore_index=True)
+
+
+def sweep_strategy(prices, strategy_type, grid=None, n_jobs=None, periods_per_year=252):
+    """
+    Evaluates apply_strategy for every parameter set of a grid at once.
+    Returns one row per parameter set: the parameters followed by the
+    compute_performance_metrics columns.
+    """
+    grid = DEFAULT_GRIDS.get(strategy_type, {}) if grid is None else grid
+    combos = expand_grid(grid) or [{}]
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    if n_jobs == 1 or len(combos) <= PARALLEL_THRESHOLD:
+        return _sweep_chunk(prices, strategy_type, combos, periods_per_year)
+
+    # Contiguous chunks of the (ordered) grid share most of their windows
+    chunk = int(np.ceil(len(combos) / n_jobs))
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        parts = pool.map(_sweep_chunk, [prices] * n_jobs, [strategy_type] * n_jobs,
+                         [combos[i:i + chunk] for i in range(0, len(combos), chunk)],
+                         [periods_per_year] * n_jobs)
+        return pd.concat(list(parts), ignore_index=True)
@@ -1,14 +1,25 @@
 import streamlit as st
-import plotly.graph_objects as go
 import json
 import os
-from .engine import fetch_asset_data, apply_strategy, compute_performance_metrics
+from .engine import fetch_asset_data, cached_apply_strategy, cached_compute_performance_metrics
+from .sweep import sweep_strategy
+from .walk_forward import walk_forward
+from .online import IncrementalBacktest
+from .screener import load_universe, cached_screen_universe, RANK_METRICS
+from quant_core.intraday import PERIODS_BY_INTERVAL, DEFAULT_PERIOD, periods_per_year
+from quant_core.profiling import start_profiler, finish_profiler, span
+from quant_core.charting import line_figure
+from quant_core.universe import UNIVERSE, ALL_TICKERS
+from quant_core.refresher import get_refresher
+from quant_core.panel import fetch_errors
+from quant_core.drawdowns import cached_drawdown_episodes
+from quant_core.rolling import cached_rolling_metrics
 
 CONFIG_A_FILE = "asset_config_a.json"
 
-def save_config_a(ticker, strategy, params):
+def save_config_a(ticker, strategy, params, interval="1d", period="1y"):
     """Saves the configuration for Quant A and the future Report Generator."""
-    config = {"ticker": ticker, "strategy": strategy, "params": params}
+    config = {"ticker": ticker, "strategy": strategy, "params": params, "interval": interval, "period": period}
     with open(CONFIG_A_FILE, "w") as f:
         json.dump(config, f)
 
@@ -22,29 +33,26 @@ def load_config_a():
     return {"ticker": "MC.PA", "strategy": "Buy and Hold", "params": {}}
 
 def run_single_asset_module():
+    # Timing spans of this rerun; the breakdown is shown when the sidebar toggle is on
+    profiler = start_profiler("quant_a", st.session_state.get("profile_quant_a", False))
+    try:
+        single_asset_page()
+    finally:
+        finish_profiler(profiler)
+    if st.sidebar.checkbox("Show Performance Breakdown", key="profile_quant_a"):
+        st.subheader("Performance Breakdown")
+        totals = profiler.totals()
+        cols = st.columns(len(totals))
+        for col, (stage, seconds) in zip(cols, totals.items()):
+            col.metric(stage.capitalize(), f"{seconds * 1000:.1f} ms")
+        st.dataframe(profiler.frame().drop(columns=["run"]), use_container_width=True)
+
+def single_asset_page():
     st.title("Single Asset Analysis (Quant A)")
     conf = load_config_a()
 
-    # 1. Asset Dictionaries (Mirrors Quant B for consistency)
-    assets_dict = {
-        "CAC 40 (France)": [
-            "AI.PA", "AIR.PA", "ALO.PA", "MT.AS", "AXA.PA", "BNP.PA", "EN.PA", "CAP.PA", 
-            "CA.PA", "ACA.PA", "BN.PA", "DSY.PA", "ENGI.PA", "EL.PA", "ERF.PA", "RMS.PA", 
-            "KER.PA", "OR.PA", "LR.PA", "MC.PA", "ML.PA", "ORA.PA", "PUB.PA", "RNO.PA", 
-            "SAF.PA", "SGO.PA", "SAN.PA", "SU.PA", "GLE.PA", "STLA.PA", "STM.PA", "TEP.PA", 
-            "HO.PA", "TTE.PA", "URW.AS", "VIE.PA", "VIV.PA", "WLN.PA", "DG.PA", "EDEN.PA"
-        ],
-        "Crypto 50 (Global)": [
-            "BTC-USD", "ETH-USD", "USDT-USD", "BNB-USD", "SOL-USD", "XRP-USD", "USDC-USD", 
-            "ADA-USD", "DOGE-USD", "TRX-USD", "DOT-USD", "LINK-USD", "MATIC-USD", "SHIB-USD", 
-            "DAI-USD", "LTC-USD", "BCH-USD", "UNI-USD", "AVAX-USD", "XLM-USD", "ATOM-USD", 
-            "XMR-USD", "ETC-USD", "FIL-USD", "HBAR-USD", "APT-USD", "NEAR-USD", "VET-USD", 
-            "OP-USD", "ARB-USD", "RNDR-USD", "INJ-USD", "STX-USD", "GRT-USD", "KAS-USD", 
-            "THETA-USD", "MKR-USD", "LDO-USD", "BSV-USD", "AAVE-USD", "EGLD-USD", "TIA-USD", 
-            "QNT-USD", "FLOW-USD", "SUI-USD", "SEI-USD", "ALGO-USD", "FTM-USD", "GALA-USD", "DYDX-USD"
-        ],
-        "Manual Input": []
-    }
+    # 1. Asset Dictionaries (same universe as Quant B)
+    assets_dict = {**UNIVERSE, "Manual Input": []}
 
     # --- Sidebar: Asset Selection ---
     st.sidebar.header("Asset Selection")
@@ -68,6 +76,17 @@ def run_single_asset_module():
             default_idx = 0
         ticker = st.sidebar.selectbox("Select Asset", available_tickers, index=default_idx)
 
+    # --- Sidebar: Bars ---
+    interval_options = list(PERIODS_BY_INTERVAL.keys())
+    saved_interval = conf.get('interval', "1d")
+    interval = st.sidebar.selectbox("Bar Interval", interval_options,
+                                    index=interval_options.index(saved_interval) if saved_interval in interval_options else 0)
+    period_options = PERIODS_BY_INTERVAL[interval]
+    saved_period = conf.get('period', DEFAULT_PERIOD[interval])
+    if saved_period not in period_options:
+        saved_period = DEFAULT_PERIOD[interval]
+    period = st.sidebar.selectbox("Period", period_options, index=period_options.index(saved_period))
+
     # --- Sidebar: Strategy ---
     strat_list = ["Buy and Hold", "Momentum (SMA Crossover)", "RSI Strategy", "Bollinger Bands"]
     try:
@@ -86,14 +105,29 @@ def run_single_asset_module():
         params['bb_std'] = st.sidebar.slider("Std Dev", 1.0, 3.0, conf['params'].get('bb_std', 2.0))
 
     if st.sidebar.button("Save & Analyze"):
-        save_config_a(ticker, strategy_type, params)
+        save_config_a(ticker, strategy_type, params, interval, period)
 
     # --- Calculation & Display ---
-    prices = fetch_asset_data(ticker)
+    get_refresher().subscribe([ticker], period, interval)
+    with span("fetch_asset_data", "fetch") as s:
+        prices = s.record(fetch_asset_data(ticker, period=period, interval=interval))
     
     if prices is not None:
-        strategy_val = apply_strategy(prices, strategy_type, params)
-        metrics = compute_performance_metrics(strategy_val)
+        # Incremental backtest: only bars that arrived since the last rerun are processed
+        ann_factor = periods_per_year(interval, [ticker])
+        bt_key = (ticker, interval, strategy_type, json.dumps(params, sort_keys=True))
+        cached = st.session_state.get("quant_a_backtest")
+        if cached is None or cached[0] != bt_key:
+            cached = (bt_key, IncrementalBacktest(strategy_type, params, ann_factor))
+            st.session_state["quant_a_backtest"] = cached
+        with span("incremental_backtest") as s:
+            s.record(prices)
+            strategy_val, metrics = cached[1].update(prices)
+        # Publish under the memo keys of apply_strategy/compute_performance_metrics so the report can reuse them
+        # (only when bars were processed: hashing the series on every rerun would cost O(history))
+        if cached[1].new_bars:
+            cached_apply_strategy.store(strategy_val, prices, strategy_type, params)
+            cached_compute_performance_metrics.store(metrics, strategy_val, ann_factor)
         
         # --- Title and Asset Price ---
         st.subheader(f"Backtest {ticker}: {strategy_type}")
@@ -101,13 +135,15 @@ def run_single_asset_module():
         st.markdown(f"#### Current Price: `{current_price:,.2f}`") 
         
         # --- Performance Chart ---
-        fig = go.Figure()
-        norm_p = (prices / prices.iloc[0]) * 100
-        fig.add_trace(go.Scatter(x=prices.index, y=norm_p, name="Asset (Base 100)", line=dict(color='gray', dash='dot')))
-        fig.add_trace(go.Scatter(x=strategy_val.index, y=strategy_val, name="Strategy Path", line=dict(color='gold', width=3)))
-        
-        fig.update_layout(template="plotly_dark", hovermode="x unified", margin=dict(t=20))
-        st.plotly_chart(fig, use_container_width=True)
+        with span("performance_chart", "render") as s:
+            s.record(prices)
+            # Decimated to the pixel budget (extremes kept) and cached until the data changes
+            norm_p = (prices / prices.iloc[0]) * 100
+            fig = line_figure([
+                (norm_p, "Asset (Base 100)", dict(color='gray', dash='dot')),
+                (strategy_val, "Strategy Path", dict(color='gold', width=3)),
+            ], template="plotly_dark", hovermode="x unified", margin=dict(t=20))
+            st.plotly_chart(fig, use_container_width=True)
         
         # --- Metrics Display ---
         m1, m2, m3, m4 = st.columns(4)
@@ -115,5 +151,74 @@ def run_single_asset_module():
         m2.metric("Sharpe Ratio", f"{metrics['Sharpe Ratio']:.2f}")
         m3.metric("Max Drawdown", f"{metrics['Max Drawdown']:.2%}")
         m4.metric("Volatility", f"{metrics['Volatility']:.2%}")
+
+        # --- Drawdown Episodes (strategy and asset in one pass) ---
+        if st.checkbox("Show Drawdown Episodes"):
+            dd1, dd2 = st.columns(2)
+            series = dd1.radio("Series", ["Strategy", ticker], horizontal=True)
+            k = dd2.slider("Episodes", 3, 20, 5)
+            with span("drawdown_episodes") as s:
+                episodes = cached_drawdown_episodes(s.record(strategy_val.rename("Strategy").to_frame().join(prices.rename(ticker))))
+            formats = {"Depth": "{:.2%}"}
+            st.markdown("**Deepest**")
+            st.dataframe(episodes.deepest(k, asset=series).style.format(formats), use_container_width=True)
+            st.markdown("**Longest Underwater**")
+            st.dataframe(episodes.longest(k, asset=series).style.format(formats), use_container_width=True)
+
+        # --- Rolling Metrics (strategy and asset in one pass, whatever the window) ---
+        if st.checkbox("Show Rolling Metrics"):
+            rm1, rm2 = st.columns(2)
+            rolling_metric = rm1.radio("Metric", ["Sharpe Ratio", "Volatility", "Max Drawdown"], horizontal=True)
+            window = rm2.slider("Window (bars)", 10, 252, 63)
+            with span("rolling_metrics") as s:
+                levels = s.record(strategy_val.rename("Strategy").to_frame().join(prices.rename(ticker)))
+                rolling = cached_rolling_metrics(levels, window, ann_factor)[rolling_metric].dropna()
+            if rolling.empty:
+                st.info("Not enough bars for this window.")
+            else:
+                fig = line_figure([
+                    (rolling[ticker], ticker, dict(color='gray', dash='dot')),
+                    (rolling["Strategy"], "Strategy", dict(color='gold', width=2)),
+                ], template="plotly_dark", hovermode="x unified", margin=dict(t=20))
+                st.plotly_chart(fig, use_container_width=True)
+
+        # --- Parameter Sweep (whole slider grid in one pass) ---
+        if strategy_type != "Buy and Hold" and st.checkbox("Show Parameter Sweep"):
+            with span("sweep_strategy") as s:
+                sweep = s.record(sweep_strategy(prices, strategy_type, periods_per_year=ann_factor))
+            st.dataframe(sweep.sort_values("Sharpe Ratio", ascending=False), use_container_width=True)
+
+        # --- Walk-Forward (grid swept on each train window, scored on the next test window) ---
+        if strategy_type != "Buy and Hold" and st.checkbox("Show Walk-Forward"):
+            wf1, wf2 = st.columns(2)
+            train = wf1.slider("Train (bars)", 63, 504, 252)
+            test = wf2.slider("Test (bars)", 21, 252, 63)
+            with span("walk_forward") as s:
+                s.record(prices)
+                splits = walk_forward(prices, strategy_type, train=train, test=test, periods_per_year=ann_factor)
+            if splits.empty:
+                st.info("Not enough history for one train/test split: choose a longer period.")
+            else:
+                st.dataframe(splits, use_container_width=True)
+
+        # --- Universe Screener (same strategy and parameters on all listed tickers) ---
+        if st.checkbox("Show Universe Screener"):
+            sc1, sc2 = st.columns(2)
+            rank_by = sc1.selectbox("Rank By", list(RANK_METRICS.keys()))
+            top_k = sc2.slider("Top", 5, len(ALL_TICKERS), 10)
+            with span("load_universe", "fetch") as s:
+                universe = s.record(load_universe(period=period, interval=interval))
+            if universe is None:
+                st.info("No universe data available.")
+            else:
+                skipped = [t for t in ALL_TICKERS if t not in universe.columns]
+                if skipped:
+                    st.caption(f"Skipped (no data): {', '.join(skipped)}")
+                ranking = cached_screen_universe(universe, strategy_type, params, interval, rank_by, top_k)
+                st.dataframe(ranking.style.format({"Sharpe Ratio": "{:.2f}", "Max Drawdown": "{:.2%}",
+                                                   "Total Return": "{:.2%}", "Volatility": "{:.2%}"}),
+                             use_container_width=True)
     else:
-        st.error("No data found for this ticker. Please check the symbol.")
+        error = fetch_errors([ticker]).get(ticker)
+        detail = f" ({error['kind']}: {error['message']})" if error else ""
+        st.error(f"No data found for this ticker. Please check the symbol.{detail}")
@@ -0,0 +1,48 @@
+import pandas as pd
+from quant_a_single_asset.engine import apply_strategy, compute_performance_metrics
+from quant_a_single_asset.sweep import sweep_strategy, expand_grid, DEFAULT_GRIDS
+
+
+def walk_forward_splits(n_bars, train=252, test=63, step=None):
+    """
+    Rolling (train_start, train_end, test_end) positions; the test window follows the train window.
+    """
+    step = step or test
+    return [(s, s + train, s + train + test) for s in range(0, n_bars - train - test + 1, step)]
+
+
+def walk_forward(prices, strategy_type, grid=None, train=252, test=63, step=None,
+                 rank_by="Sharpe Ratio", n_jobs=1, periods_per_year=252):
+    """
+    Walk-forward evaluation of a Quant A strategy: on each split the grid is swept on the
+    train window, the best parameters (by `rank_by`) are kept, and they are evaluated
+    out of sample on the following test window.
+    Returns one row per split with the chosen parameters and train/test metrics.
+    """
+    grid = DEFAULT_GRIDS.get(strategy_type, {}) if grid is None else grid
+    combos = expand_grid(grid) or [{}]
+    rows = []
+    for train_start, train_end, test_end in walk_forward_splits(len(prices), train, test, step):
+        train_prices = prices.iloc[train_start:train_end]
+        sweep = sweep_strategy(train_prices, strategy_type, combos, n_jobs=n_jobs, periods_per_year=periods_per_year)
+        # Sweep rows follow the grid order, so the best row maps back to its parameter dict
+        scores = sweep[rank_by]
+        best = scores.idxmin() if rank_by == "Volatility" else scores.idxmax()
+        params = combos[best]
+
+        # Indicators warm up on the train window; only the test bars are scored (rebased to 100)
+        path = apply_strategy(prices.iloc[train_start:test_end], strategy_type, params)
+        test_path = path.iloc[train_end - train_start - 1:]
+        test_path = test_path / test_path.iloc[0] * 100
+        test_metrics = compute_performance_metrics(test_path, periods_per_year)
+
+        row = {
+            "Train Start": prices.index[train_start],
+            "Test Start": prices.index[train_end],
+            "Test End": prices.index[test_end - 1],
+            **params,
+            f"Train {rank_by}": float(scores[best]),
+        }
+        row.update({f"Test {k}": v for k, v in test_metrics.items()})
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from quant_b_portfolio.rebalance_engine import FREQUENCIES, DEFAULT_BAND, rebalance_mask, simulate_rebalanced, simulate_events
+from quant_b_portfolio.covariance import CovarianceEstimator
+
+# Upper bound on the working set of one chunk of portfolios (value paths + returns),
+# not counting the T x K paths returned with return_paths
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def random_weights(n_portfolios, n_assets, seed=None):
+    """
+    Draws long-only weight vectors uniformly from the simplex (K x N, rows sum to 1).
+    """
+    rng = np.random.default_rng(seed)
+    return rng.dirichlet(np.ones(n_assets), size=n_portfolios)
+
+
+def _chunk_size(n_rows, max_bytes):
+    # Two (T x k) float64 buffers per chunk: the value paths and their returns
+    return max(1, int(max_bytes // (2 * 8 * max(n_rows, 1))))
+
+
+def simulate_portfolios(prices, weight_matrix, rebalance_freq="None", tickers=None,
+                        chunk_size=None, max_chunk_bytes=DEFAULT_CHUNK_BYTES, return_paths=True,
+                        band=None, calendar=None, periods_per_year=252):
+    """
+    Simulates K portfolios over the same price panel in one pass.
+
+    weight_matrix: (K x N) array or DataFrame whose columns are tickers.
+    rebalance_freq, band and calendar are those of simulate_portfolio. Calendar schedules
+    run K portfolios per matrix product; with a drift band the rebalance dates depend on
+    each path, so the portfolios go through simulate_events one by one.
+    Returns the K value paths (T x K DataFrame, or None if return_paths is False) and
+    the metrics of get_advanced_metrics as arrays of length K ('Ex-Ante Vol' is w' S w,
+    computed without any path), annualized with periods_per_year bars.
+
+    Portfolios are simulated chunk_size at a time, which bounds the working set of the
+    simulation (about max_chunk_bytes). The returned paths are not chunked: with
+    return_paths the full T x K array is allocated, so use return_paths=False when only
+    the metrics of many portfolios are needed.
+    """
+    if rebalance_freq not in FREQUENCIES:
+        raise ValueError(f"Unknown rebalance frequency: {rebalance_freq}")
+    if rebalance_freq == "Tolerance Band" and band is None:
+        band = DEFAULT_BAND
+    if isinstance(weight_matrix, pd.DataFrame):
+        tickers = list(weight_matrix.columns)
+        weight_matrix = weight_matrix.to_numpy(dtype=float)
+    else:
+        weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=float))
+        tickers = list(prices.columns) if tickers is None else list(tickers)
+
+    panel = prices[tickers].to_numpy(dtype=float)
+    n_rows, n_ports = panel.shape[0], weight_matrix.shape[0]
+    if chunk_size is None:
+        chunk_size = _chunk_size(n_rows, max_chunk_bytes)
+
+    # Shared inputs, computed once for every chunk
+    asset_rets = prices[tickers].pct_change().dropna()
+    estimator = CovarianceEstimator("sample", periods_per_year=periods_per_year).fit(asset_rets)
+    indiv_vols = np.asarray(estimator.volatilities())
+    buy_and_hold = rebalance_freq == "None" and band is None
+    if buy_and_hold:
+        normalized = panel / panel[0] * 100
+    else:
+        returns = np.nan_to_num(prices[tickers].pct_change().to_numpy(dtype=float))
+        mask = rebalance_mask(prices.index, rebalance_freq, calendar)
+
+    paths = np.empty((n_rows, n_ports)) if return_paths else None
+    total_return = np.empty(n_ports)
+    port_vol = np.empty(n_ports)
+
+    for lo in range(0, n_ports, chunk_size):
+        w = weight_matrix[lo:lo + chunk_size]
+        if buy_and_hold:
+            values = normalized @ w.T
+        elif band is None:
+            values = simulate_rebalanced(returns, w, mask)
+        else:
+            values = np.column_stack([simulate_events(returns, wk, mask, band)[0] for wk in w])
+        port_rets = values[1:] / values[:-1] - 1
+        port_vol[lo:lo + len(w)] = np.std(port_rets, axis=0, ddof=1) * np.sqrt(periods_per_year)
+        total_return[lo:lo + len(w)] = values[-1] / 100 - 1
+        if return_paths:
+            paths[:, lo:lo + len(w)] = values
+
+    return {
+        "Values": pd.DataFrame(paths, index=prices.index) if return_paths else None,
+        "Total Return": total_return,
+        "Portfolio Vol": port_vol,
+        "Diversification Benefit": weight_matrix @ indiv_vols - port_vol,
+        "Ex-Ante Vol": estimator.portfolio_volatility(weight_matrix),
+    }
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+METHODS = ["sample", "ewma", "shrinkage"]
+
+
+class CovarianceEstimator:
+    """
+    Covariance of asset returns for large universes.
+
+    method: "sample" (unbiased sample covariance), "ewma" (RiskMetrics exponential
+    weighting with decay `lam`) or "shrinkage" (sample covariance shrunk towards a
+    scaled identity with the Oracle Approximating Shrinkage intensity).
+    dtype: np.float32 halves the memory of the N x N state.
+
+    The state is updated incrementally: update() merges a batch of new return rows
+    (Chan's parallel moment update) and remove() drops rows leaving a rolling window.
+    """
+
+    def __init__(self, method="sample", lam=0.94, dtype=np.float64, periods_per_year=252):
+        if method not in METHODS:
+            raise ValueError(f"Unknown covariance method: {method}")
+        self.method = method
+        self.lam = lam
+        self.dtype = np.dtype(dtype)
+        self.periods_per_year = periods_per_year
+        self.columns = None
+        self.n = 0
+        self.mean = None
+        self.m2 = None        # Sum of centered cross-products (sample / shrinkage)
+        self.ewma = None      # Exponentially weighted second moment (ewma)
+
+    # --- State updates ---
+    def _rows(self, returns):
+        if isinstance(returns, pd.DataFrame):
+            if self.columns is None:
+                self.columns = list(returns.columns)
+            returns = returns[self.columns].dropna()
+        x = np.asarray(returns, dtype=self.dtype)
+        return x[~np.isnan(x).any(axis=1)] if x.ndim == 2 else x.reshape(1, -1)
+
+    def fit(self, returns):
+        self.n, self.mean, self.m2, self.ewma = 0, None, None, None
+        if isinstance(returns, pd.DataFrame):
+            self.columns = list(returns.columns)
+        return self.update(returns)
+
+    def update(self, new_returns):
+        """
+        Adds new rows of returns to the estimate.
+        """
+        x = self._rows(new_returns)
+        n_b = len(x)
+        if n_b == 0:
+            return self
+        mean_b = x.mean(axis=0)
+        centered = x - mean_b
+        m2_b = centered.T @ centered
+
+        if self.method == "ewma":
+            if self.ewma is None:
+                # Seed with the sample second moment of the first batch
+                self.ewma = (x.T @ x / n_b).astype(self.dtype)
+            else:
+                decay = self.lam ** np.arange(n_b - 1, -1, -1, dtype=self.dtype)
+                weighted = x * ((1 - self.lam) * decay)[:, None]
+                self.ewma = (self.lam ** n_b) * self.ewma + weighted.T @ x
+
+        if self.n == 0:
+            self.n, self.mean, self.m2 = n_b, mean_b, m2_b
+        else:
+            n = self.n + n_b
+            delta = mean_b - self.mean
+            self.m2 = self.m2 + m2_b + np.outer(delta, delta) * (self.n * n_b / n)
+            self.mean = self.mean + delta * (n_b / n)
+            self.n = n
+        return self
+
+    def remove(self, old_returns):
+        """
+        Removes rows previously added (rolling window). Only for sample/shrinkage.
+        """
+        if self.method == "ewma":
+            raise ValueError("EWMA estimates forget old rows by themselves; nothing to remove")
+        x = self._rows(old_returns)
+        n_b = len(x)
+        if n_b == 0:
+            return self
+        if n_b >= self.n:
+            return self.fit(np.empty((0, len(self.mean))))
+        mean_b = x.mean(axis=0)
+        centered = x - mean_b
+        n = self.n - n_b
+        mean_a = (self.n * self.mean - n_b * mean_b) / n
+        delta = mean_b - mean_a
+        self.m2 = self.m2 - centered.T @ centered - np.outer(delta, delta) * (n * n_b / self.n)
+        self.mean, self.n = mean_a, n
+        return self
+
+    # --- Estimates ---
+    def covariance(self):
+        """
+        Per-period covariance matrix (N x N ndarray).
+        """
+        if self.n < 2:
+            size = 0 if self.mean is None else len(self.mean)
+            return np.full((size, size), np.nan, dtype=self.dtype)
+        if self.method == "ewma":
+            return self.ewma
+        sample = self.m2 / (self.n - 1)
+        if self.method == "shrinkage":
+            return oas_shrink(sample, self.n)
+        return sample
+
+    def _frame(self, values):
+        labels = self.columns if self.columns is not None else range(len(values))
+        return pd.DataFrame(values, index=labels, columns=labels)
+
+    def covariance_frame(self):
+        return self._frame(self.covariance())
+
+    def volatilities(self):
+        """
+        Annualized volatility per asset.
+        """
+        vols = np.sqrt(np.diag(self.covariance()) * self.periods_per_year)
+        return pd.Series(vols, index=self.columns) if self.columns is not None else vols
+
+    def correlation(self):
+        cov = self.covariance()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        np.fill_diagonal(corr, 1.0)
+        return self._frame(np.clip(corr, -1, 1))
+
+    def portfolio_volatility(self, weights):
+        """
+        Annualized ex-ante volatility sqrt(w' S w) for a dict of weights, a (N,) vector
+        or a (K x N) weight matrix (one value per portfolio).
+        """
+        if isinstance(weights, dict):
+            weights = np.array([weights.get(c, 0.0) for c in self.columns])
+        return ex_ante_volatility(weights, self.covariance(), self.periods_per_year)
+
+
+def oas_shrink(sample_cov, n_obs):
+    """
+    Oracle Approximating Shrinkage towards mu * I (Chen, Wiesel, Eldar & Hero, 2010).
+    """
+    p = sample_cov.shape[0]
+    mu = np.trace(sample_cov) / p
+    alpha = np.mean(sample_cov ** 2)
+    num = alpha + mu ** 2
+    den = (n_obs + 1) * (alpha - mu ** 2 / p)
+    shrinkage = 1.0 if den == 0 else min(num / den, 1.0)
+    shrunk = (1 - shrinkage) * sample_cov
+    shrunk.flat[::p + 1] += shrinkage * mu
+    return shrunk
+
+
+def ex_ante_volatility(weights, cov, periods_per_year=252):
+    """
+    sqrt(w' S w) annualized, for one weight vector or a (K x N) matrix.
+    """
+    w = np.asarray(weights, dtype=cov.dtype)
+    if w.ndim == 1:
+        return float(np.sqrt(w @ cov @ w * periods_per_year))
+    return np.sqrt(np.einsum("kn,nm,km->k", w, cov, w) * periods_per_year)
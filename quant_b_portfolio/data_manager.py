@@ -1,12 +1,18 @@
 import json
-import pandas as pd
 import os
+import threading
 from datetime import datetime
+from quant_b_portfolio.history_store import HistoryStore, HISTORY_DB, portfolio_identifier, config_identifier
 
 CONFIG_FILE = "portfolio_config.json"
+# Legacy append-only history, imported once into the SQLite store
 HISTORY_FILE = "portfolio_history.csv"
 
-def save_config(tickers, weights, freq, timeframe, equal_weights):
+# History stores opened by this process, by absolute path
+_stores = {}
+_stores_lock = threading.Lock()
+
+def save_config(tickers, weights, freq, timeframe, equal_weights, interval="1d", band=None, calendar=None, weighting="Manual"):
     """
     Saves the current configuration to a JSON file.
     """
@@ -15,7 +21,11 @@ def save_config(tickers, weights, freq, timeframe, equal_weights):
         "weights": weights,
         "freq": freq,
         "timeframe": timeframe,
-        "equal_weights": equal_weights
+        "equal_weights": equal_weights,
+        "interval": interval,
+        "band": band,
+        "calendar": calendar,
+        "weighting": weighting
     }
     try:
         with open(CONFIG_FILE, "w") as f:
@@ -38,24 +48,37 @@ def load_config():
             return None
     return None
 
-def log_daily_performance(metrics):
+def get_history_store(path=HISTORY_DB):
     """
-    Appends the daily performance metrics to a CSV file.
+    Opens the performance history store, importing the legacy CSV the first time.
+    The store is opened once per process and path (not on every Streamlit rerun).
+    """
+    key = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = HistoryStore(path)
+            if os.path.exists(HISTORY_FILE):
+                try:
+                    store.import_csv(HISTORY_FILE)
+                except Exception as e:
+                    print(f"Error importing legacy history: {e}")
+            _stores[key] = store
+    return store
+
+def log_daily_performance(metrics, tickers=(), config=None):
+    """
+    Records the daily performance metrics in the history store.
     """
-    row = {
-        "Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "Total Return": metrics["Total Return"],
-        "Portfolio Volatility": metrics["Portfolio Vol"],
-        "Diversification Benefit": metrics["Diversification Benefit"]
-    }
-    df = pd.DataFrame([row])
-    
     try:
-        if not os.path.exists(HISTORY_FILE):
-            df.to_csv(HISTORY_FILE, index=False)
-        else:
-            df.to_csv(HISTORY_FILE, mode='a', header=False, index=False)
+        store = get_history_store()
+        store.append(
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            portfolio_identifier(tickers) if tickers else "unknown",
+            config_identifier(config or {}),
+            metrics
+        )
         return True
     except Exception as e:
         print(f"Error logging history: {e}")
-        return False
\ No newline at end of file
+        return False
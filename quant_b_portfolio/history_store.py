@@ -0,0 +1,195 @@
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import date, datetime
+from contextlib import contextmanager
+import pandas as pd
+
+HISTORY_DB = "portfolio_history.db"
+
+# Column names shown in the UI (same as the legacy CSV, plus the identifiers)
+COLUMNS = {
+    "ts": "Date",
+    "portfolio_id": "Portfolio",
+    "config_id": "Config",
+    "total_return": "Total Return",
+    "portfolio_vol": "Portfolio Volatility",
+    "diversification_benefit": "Diversification Benefit",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS performance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    portfolio_id TEXT NOT NULL,
+    config_id TEXT NOT NULL,
+    total_return REAL,
+    portfolio_vol REAL,
+    diversification_benefit REAL
+);
+CREATE INDEX IF NOT EXISTS idx_performance_portfolio_ts ON performance (portfolio_id, ts);
+CREATE INDEX IF NOT EXISTS idx_performance_ts ON performance (ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def portfolio_identifier(tickers):
+    """
+    Readable, order-independent identifier of a basket of tickers.
+    """
+    return "+".join(sorted(t.upper() for t in tickers))
+
+
+def config_identifier(config):
+    """
+    Short stable hash of a portfolio configuration (tickers, weights, frequency, ...).
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+def _is_date_only(value):
+    """
+    True for a bound given as a day ("2024-01-31", a date) rather than a point in time.
+    """
+    if isinstance(value, str):
+        return ":" not in value
+    return isinstance(value, date) and not isinstance(value, datetime)
+
+
+class HistoryStore:
+    """
+    Indexed SQLite store of logged portfolio performance, replacing the append-only CSV.
+    Supports batched writes, date-range queries and paginated reads.
+    """
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            # WAL lets dashboard sessions read while the report/UI writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- Writes ---
+    @staticmethod
+    def _insert(conn, rows):
+        records = [(r["ts"], r["portfolio_id"], r["config_id"], r.get("total_return"),
+                    r.get("portfolio_vol"), r.get("diversification_benefit")) for r in rows]
+        conn.executemany(
+            "INSERT INTO performance (ts, portfolio_id, config_id, total_return, portfolio_vol, "
+            "diversification_benefit) VALUES (?, ?, ?, ?, ?, ?)", records)
+        return len(records)
+
+    def append_many(self, rows):
+        """
+        Inserts rows (dicts with ts, portfolio_id, config_id and the three metrics) in one transaction.
+        """
+        with self._connect() as conn:
+            return self._insert(conn, rows)
+
+    def append(self, ts, portfolio_id, config_id, metrics):
+        return self.append_many([{
+            "ts": ts, "portfolio_id": portfolio_id, "config_id": config_id,
+            "total_return": float(metrics["Total Return"]),
+            "portfolio_vol": float(metrics["Portfolio Vol"]),
+            "diversification_benefit": float(metrics["Diversification Benefit"]),
+        }])
+
+    # --- Reads ---
+    def _where(self, portfolio_id=None, start=None, end=None):
+        clauses, args = [], []
+        if portfolio_id is not None:
+            clauses.append("portfolio_id = ?")
+            args.append(portfolio_id)
+        if start is not None:
+            clauses.append("ts >= ?")
+            args.append(pd.Timestamp(start).strftime("%Y-%m-%d %H:%M:%S"))
+        if end is not None:
+            if _is_date_only(end):
+                # A date includes the whole day: everything before the next midnight
+                clauses.append("ts < ?")
+                args.append((pd.Timestamp(end) + pd.Timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S"))
+            else:
+                clauses.append("ts <= ?")
+                args.append(pd.Timestamp(end).strftime("%Y-%m-%d %H:%M:%S"))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def _frame(self, sql, args):
+        with self._connect() as conn:
+            df = pd.read_sql_query(sql, conn, params=args)
+        return df.rename(columns=COLUMNS)
+
+    def query(self, start=None, end=None, portfolio_id=None):
+        """
+        All rows in [start, end] (inclusive), oldest first.
+        """
+        where, args = self._where(portfolio_id, start, end)
+        cols = ", ".join(COLUMNS)
+        return self._frame(f"SELECT {cols} FROM performance{where} ORDER BY ts, id", args)
+
+    def count(self, portfolio_id=None, start=None, end=None):
+        where, args = self._where(portfolio_id, start, end)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM performance{where}", args).fetchone()[0]
+
+    def page(self, page=0, page_size=50, portfolio_id=None, newest_first=True):
+        """
+        One page of rows (page 0 = most recent rows when newest_first).
+        """
+        where, args = self._where(portfolio_id)
+        order = "DESC" if newest_first else "ASC"
+        cols = ", ".join(COLUMNS)
+        sql = f"SELECT {cols} FROM performance{where} ORDER BY ts {order}, id {order} LIMIT ? OFFSET ?"
+        return self._frame(sql, args + [int(page_size), int(page) * int(page_size)])
+
+    def portfolios(self):
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute("SELECT DISTINCT portfolio_id FROM performance ORDER BY portfolio_id")]
+
+    # --- Legacy CSV ---
+    def import_csv(self, csv_path, portfolio_id="legacy", config_id="legacy", chunksize=10000):
+        """
+        One-time import of the old portfolio_history.csv. Returns the number of rows imported
+        (0 if this file was already imported).
+
+        The rows and the "imported" marker are written in one transaction: an import that
+        fails halfway leaves nothing behind and is simply run again.
+        """
+        key = f"imported:{os.path.abspath(csv_path)}"
+        with self._connect() as conn:
+            # Take the write lock first, so two processes cannot both import the file
+            conn.execute("BEGIN IMMEDIATE")
+            if conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+            total = 0
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+                rows = [{
+                    "ts": pd.Timestamp(r["Date"]).strftime("%Y-%m-%d %H:%M:%S"),
+                    "portfolio_id": portfolio_id, "config_id": config_id,
+                    "total_return": r.get("Total Return"),
+                    "portfolio_vol": r.get("Portfolio Volatility"),
+                    "diversification_benefit": r.get("Diversification Benefit"),
+                } for r in chunk.to_dict("records")]
+                total += self._insert(conn, rows)
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(total)))
+        return total
+
+
+if __name__ == "__main__":
+    # One-time importer: python -m quant_b_portfolio.history_store portfolio_history.csv [portfolio_history.db]
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python -m quant_b_portfolio.history_store <history.csv> [store.db]")
+        sys.exit(1)
+    store = HistoryStore(sys.argv[2] if len(sys.argv) > 2 else HISTORY_DB)
+    print(f"Imported {store.import_csv(sys.argv[1])} rows into {store.path}")
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from quant_core.memo import memoize
+from quant_core.providers import period_start
+from quant_b_portfolio.rebalance_engine import rebalance_mask, simulate_events, DEFAULT_BAND
+
+
+def horizon_start(period, index):
+    """
+    Row where a horizon ("1mo", "6mo", "1y", ...) starts in a longer history.
+    """
+    return int(index.searchsorted(period_start(period, index), side="left"))
+
+
+def _path_metrics(values, periods_per_year):
+    returns = values[1:] / values[:-1] - 1
+    vol = float(returns.std(ddof=1) * np.sqrt(periods_per_year)) if len(returns) > 1 else 0.0
+    peaks = np.maximum.accumulate(values)
+    return {
+        "Total Return": float(values[-1] / values[0] - 1),
+        "Volatility": vol,
+        "Sharpe Ratio": float(returns.mean() * periods_per_year / vol) if vol > 0 else 0.0,
+        "Max Drawdown": float((values / peaks - 1).min()),
+    }
+
+
+def horizon_table(prices, weights_dict, periods, rebalance_freq="None", band=None, calendar=None,
+                  periods_per_year=252):
+    """
+    Portfolio path and metrics for several horizons from one history, `prices` being the
+    cleaned closes of the longest one (fetch_portfolio_data). Returns are computed once;
+    each horizon is a suffix of them, rebased to 100 on its first bar and simulated with its
+    own rebalancing schedule, so every path equals simulate_portfolio on that horizon alone.
+    Returns (table indexed by horizon, {horizon: path}).
+    """
+    tickers = list(weights_dict.keys())
+    weights = np.array([weights_dict[t] for t in tickers], dtype=float)
+    closes = prices[tickers].to_numpy(dtype=float)
+    returns = np.zeros_like(closes)
+    returns[1:] = closes[1:] / closes[:-1] - 1
+    if rebalance_freq == "Tolerance Band" and band is None:
+        band = DEFAULT_BAND
+
+    rows, paths = [], {}
+    for period in periods:
+        start = horizon_start(period, prices.index)
+        if start >= len(prices) - 1:
+            continue
+        index = prices.index[start:]
+        if rebalance_freq == "None" and band is None:
+            values, stats = (closes[start:] / closes[start] * 100) @ weights, None
+        else:
+            # Row `start` of the shared returns is never applied: the path starts at 100 there
+            mask = rebalance_mask(index, rebalance_freq, calendar)
+            values, stats = simulate_events(returns[start:], weights, mask, band)
+        paths[period] = pd.Series(values, index=index)
+        row = {"Horizon": period, "Start": index[0], "Bars": len(index), **_path_metrics(values, periods_per_year)}
+        if stats is not None:
+            row.update(stats)
+        rows.append(row)
+    table = pd.DataFrame(rows).set_index("Horizon") if rows else pd.DataFrame()
+    return table, paths
+
+# Memoized variant (content hash of prices + config), recomputed only when new bars arrive
+cached_horizon_table = memoize("horizon_table")(horizon_table)
@@ -0,0 +1,132 @@
+import math
+import numpy as np
+import pandas as pd
+from quant_b_portfolio.covariance import CovarianceEstimator
+from quant_b_portfolio.rebalance_engine import rebalance_mask, simulate_events, DEFAULT_BAND
+
+
+class IncrementalPortfolio:
+    """
+    Keeps a portfolio's value path and report metrics up to date as bars are appended to
+    its price panel (the Quant B counterpart of IncrementalBacktest).
+
+    update() only simulates the bars after the last one seen: buy-and-hold values are a
+    dot product of the new rows, rebalanced paths continue simulate_events from the saved
+    positions, the asset covariance takes the new return rows (Chan update) and the path
+    volatility is a running Welford variance. When the already-seen rows changed (a new
+    window start, a revised last bar, a late bar of another asset), it rebuilds from the
+    first bar, so the results always equal simulate_portfolio / rebalance_portfolio and
+    get_advanced_metrics on the full panel.
+    """
+
+    def __init__(self, weights_dict, rebalance_freq="None", band=None, calendar=None, periods_per_year=252):
+        self.weights_dict = dict(weights_dict)
+        self.rebalance_freq = rebalance_freq
+        self.calendar = calendar
+        if rebalance_freq == "Tolerance Band" and band is None:
+            band = DEFAULT_BAND
+        self.band = band
+        self.periods_per_year = periods_per_year
+        self.rebuilds = 0
+        self._reset()
+
+    @property
+    def buy_and_hold(self):
+        return self.rebalance_freq == "None"
+
+    def _reset(self):
+        self.index = None
+        self.raw = None
+        self.columns = None
+        self.values = np.empty(0)
+        self.base = None
+        self.last_filled = None
+        self.sim_state = {}
+        self.estimator = None
+        self.n_ret = 0
+        self.ret_mean = 0.0
+        self.ret_m2 = 0.0
+
+    def _seen(self, panel):
+        """
+        True when the panel extends the rows already simulated without changing them.
+        """
+        n = 0 if self.index is None else len(self.index)
+        return (n > 0 and len(panel) >= n and panel.columns == self.columns
+                and panel.index[:n].equals(self.index)
+                and np.array_equal(panel.values[:n], self.raw, equal_nan=True))
+
+    def _push_returns(self, values):
+        # Welford update of the portfolio return moments
+        for r in (values[1:] / values[:-1] - 1).tolist():
+            self.n_ret += 1
+            d = r - self.ret_mean
+            self.ret_mean += d / self.n_ret
+            self.ret_m2 += d * (r - self.ret_mean)
+
+    def update(self, panel):
+        """
+        Extends the simulation with the rows of `panel` (a PriceStore of the portfolio's
+        assets) it has not seen yet. Returns (portfolio_series, rebal_stats, metrics);
+        rebal_stats is None for buy-and-hold.
+        """
+        tickers = list(self.weights_dict)
+        weights = np.array([self.weights_dict[t] for t in tickers], dtype=float)
+        cols = [panel.col[t] for t in tickers]
+
+        if self._seen(panel):
+            start = len(self.index)
+            tail = panel.values[start:]
+            # Gaps of the new rows are filled forward from the last filled row
+            filled = pd.DataFrame(np.vstack([self.last_filled, tail])).ffill().to_numpy()
+        else:
+            if self.index is not None:
+                self.rebuilds += 1
+            self._reset()
+            start = 0
+            filled = panel.filled
+            self.base = filled[0]
+            self.estimator = CovarianceEstimator("sample", periods_per_year=self.periods_per_year)
+            self.estimator.columns = list(panel.columns)
+
+        # Returns of the new rows; row 0 is the last seen bar (or the ignored first bar)
+        returns = np.zeros_like(filled)
+        returns[1:] = filled[1:] / filled[:-1] - 1
+        new = filled[1:] if start else filled
+
+        if len(new):
+            if self.buy_and_hold:
+                added = (new[:, cols] / self.base[cols] * 100) @ weights
+            else:
+                mask = rebalance_mask(panel.index, self.rebalance_freq, self.calendar)
+                lo = max(start - 1, 0)
+                path, _ = simulate_events(returns[:, cols], weights, mask[lo:], self.band, state=self.sim_state)
+                added = path[1:] if start else path
+            joined = np.concatenate([self.values[-1:], added]) if start else added
+            self._push_returns(joined)
+            self.values = np.concatenate([self.values, added])
+            self.estimator.update(returns[1:])
+
+        self.index = panel.index
+        self.raw = panel.values
+        self.columns = list(panel.columns)
+        self.last_filled = filled[-1]
+
+        series = pd.Series(self.values, index=self.index)
+        stats = None if self.buy_and_hold else dict(self.sim_state.get("stats", {"Rebalances": 0, "Turnover": 0.0}))
+        return series, stats, self.metrics()
+
+    def metrics(self):
+        """
+        The report subset of get_advanced_metrics ("sample" covariance).
+        """
+        std = math.sqrt(self.ret_m2 / (self.n_ret - 1)) if self.n_ret > 1 else np.nan
+        port_vol = std * np.sqrt(self.periods_per_year)
+        indiv_vols = self.estimator.volatilities()
+        weighted_vol = sum(indiv_vols[t] * w for t, w in self.weights_dict.items())
+        return {
+            "Portfolio Vol": port_vol,
+            "Ex-Ante Vol": self.estimator.portfolio_volatility(self.weights_dict),
+            "Diversification Benefit": weighted_vol - port_vol,
+            "Total Return": (self.values[-1] / 100) - 1,
+        }
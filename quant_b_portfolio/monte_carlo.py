@@ -0,0 +1,188 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from quant_b_portfolio.covariance import CovarianceEstimator
+from quant_b_portfolio.rebalance_engine import rebalance_mask, DEFAULT_BAND
+from quant_core.memo import memoize
+
+METHODS = ["bootstrap", "normal"]
+
+# Upper bound on the working set of one chunk of paths (simulated returns + growth)
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Paths kept (from the first chunks) to draw the fan chart
+DEFAULT_KEEP_PATHS = 500
+
+
+def _chunk_paths(horizon, n_assets, max_bytes):
+    # Two float64 (paths x horizon x assets) buffers per chunk
+    return max(1, int(max_bytes // (2 * 8 * horizon * max(n_assets, 1))))
+
+
+def _matrix_sqrt(cov):
+    """
+    Symmetric square root through eigh: unlike Cholesky it accepts the singular
+    covariances of wide universes (more assets than observations).
+    """
+    vals, vecs = np.linalg.eigh(cov)
+    return vecs * np.sqrt(np.clip(vals, 0, None))
+
+
+def _draw_returns(rng, n_paths, horizon, source, method, block_size):
+    """
+    (n_paths x horizon x columns) simulated returns.
+    bootstrap: source is the (T x columns) history, resampled in contiguous blocks.
+    normal: source is (mean, square root of the covariance).
+    """
+    if method == "bootstrap":
+        n_hist = len(source)
+        block = min(block_size, n_hist)
+        n_blocks = -(-horizon // block)
+        starts = rng.integers(0, n_hist - block + 1, size=(n_paths, n_blocks))
+        rows = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, :horizon]
+        return source[rows]
+    mean, root = source
+    z = rng.standard_normal((n_paths * horizon, root.shape[1]))
+    rets = z @ root.T
+    rets += mean
+    return np.maximum(rets, -1.0, out=rets).reshape(n_paths, horizon, -1)
+
+
+def _future_mask(index, horizon, rebalance_freq="None", calendar=None):
+    """
+    Rebalance flags of the next `horizon` bars (as rebalance_mask: True resets the
+    positions before that bar's return). Future dates repeat the latest week of bars,
+    so weekends, overnight gaps and sessions recur on the same weekdays as in the history.
+    """
+    naive = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+    stamps = naive.to_numpy()
+    if len(stamps) < 2:
+        return np.zeros(horizon, dtype=bool)
+    # Last bar exactly a whole number of weeks before the latest one (else the full history)
+    whole = np.flatnonzero((stamps[-1] - stamps[:-1]) % np.timedelta64(7, "D") == np.timedelta64(0))
+    deltas = np.diff(stamps[whole[-1] if len(whole) else 0:])
+    steps = np.tile(deltas, -(-horizon // len(deltas)))[:horizon]
+    future = pd.DatetimeIndex(stamps[-1] + np.concatenate(([np.timedelta64(0)], np.cumsum(steps))))
+    if index.tz is not None:
+        future = future.tz_localize("UTC").tz_convert(index.tz)
+    return rebalance_mask(future, rebalance_freq, calendar)[1:]
+
+
+def _rebalanced_paths(rets, weights, mask, band):
+    """
+    (n_paths x horizon) values of portfolios reset to the target weights on the bars of
+    `mask` and, with `band`, after any bar where a weight drifted more than `band` from
+    its target (the rules of simulate_events). All paths advance one bar at a time.
+    """
+    n_paths, horizon, _ = rets.shape
+    paths = np.empty((n_paths, horizon))
+    positions = np.tile(weights * 100, (n_paths, 1))
+    drifted = np.zeros(n_paths, dtype=bool)
+    for t in range(horizon):
+        reset = np.ones(n_paths, dtype=bool) if mask[t] else drifted
+        if reset.any():
+            positions[reset] = positions[reset].sum(axis=1)[:, None] * weights
+        positions *= 1 + rets[:, t]
+        values = positions.sum(axis=1)
+        paths[:, t] = values
+        if band is not None:
+            drifted = (np.abs(positions / values[:, None] - weights) > band).any(axis=1)
+    return paths
+
+
+def _simulate_chunk(seed, n_paths, horizon, source, method, block_size, weights, mask, band, keep):
+    """
+    One chunk of paths from its own seed. Returns (terminal values, max drawdowns, kept paths).
+    mask is None for buy and hold.
+    """
+    rng = np.random.default_rng(seed)
+    rets = _draw_returns(rng, n_paths, horizon, source, method, block_size)
+    if mask is None:
+        # Buy and hold: each asset compounds on its own, the weights drift
+        growth = np.cumprod(1 + rets, axis=1, out=rets)
+        paths = growth @ weights * 100
+    else:
+        paths = _rebalanced_paths(rets, weights, mask, band)
+    peaks = np.maximum(np.maximum.accumulate(paths, axis=1), 100.0)
+    max_dd = (paths / peaks - 1).min(axis=1)
+    # Copies, so the chunk's full path array is released
+    return paths[:, -1].copy(), np.minimum(max_dd, 0.0), paths[:keep].copy()
+
+
+def simulate_risk(prices, weights_dict, n_paths=10_000, horizon=252, method="bootstrap", block_size=20,
+                  rebalance_freq="None", band=None, calendar=None, confidence=0.95, seed=0, n_jobs=1,
+                  max_chunk_bytes=DEFAULT_CHUNK_BYTES, keep_paths=DEFAULT_KEEP_PATHS, cov_method="sample"):
+    """
+    Simulates `n_paths` future paths of the portfolio over `horizon` bars (base 100).
+
+    method: "bootstrap" resamples blocks of `block_size` historical returns (keeping their
+    cross-sectional and short-term serial dependence), "normal" draws from a multivariate
+    normal with the historical mean and the `cov_method` covariance.
+    rebalance_freq, band and calendar are those of simulate_portfolio: "None" is buy and
+    hold (weights drift); otherwise the paths are reset to the target weights on the
+    schedule's future bars (see _future_mask) and, with a band, whenever they drift out of it.
+
+    Paths are generated in chunks bounded by max_chunk_bytes, each with its own child of
+    SeedSequence(seed): the result only depends on the seed and the chunking, not on n_jobs.
+    Returns the VaR/CVaR of the horizon return at `confidence`, terminal-value quantiles,
+    drawdown quantiles and a sample of paths for the fan chart.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simulation method: {method}")
+    tickers = list(weights_dict.keys())
+    weights = np.array([weights_dict[t] for t in tickers], dtype=float)
+    returns = prices[tickers].pct_change().dropna()
+    if len(returns) < 2:
+        return None
+
+    if method == "bootstrap":
+        source = returns.to_numpy(dtype=float)
+    else:
+        estimator = CovarianceEstimator(cov_method).fit(returns)
+        source = (returns.mean().to_numpy(), _matrix_sqrt(estimator.covariance()))
+    mask = None
+    if rebalance_freq != "None":
+        if rebalance_freq == "Tolerance Band" and band is None:
+            band = DEFAULT_BAND
+        mask = _future_mask(prices.index, horizon, rebalance_freq, calendar)
+
+    chunk = min(n_paths, _chunk_paths(horizon, len(tickers), max_chunk_bytes))
+    sizes = [min(chunk, n_paths - lo) for lo in range(0, n_paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    keeps, left = [], keep_paths
+    for size in sizes:
+        keeps.append(min(size, left))
+        left -= keeps[-1]
+    args = [(s, size, horizon, source, method, block_size, weights, mask, band, k)
+            for s, size, k in zip(seeds, sizes, keeps)]
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(args))
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_simulate_chunk, *zip(*args)))
+    else:
+        results = [_simulate_chunk(*a) for a in args]
+
+    terminal = np.concatenate([r[0] for r in results])
+    max_dd = np.concatenate([r[1] for r in results])
+    kept = np.concatenate([r[2] for r in results])
+    horizon_ret = terminal / 100 - 1
+
+    cutoff = np.quantile(horizon_ret, 1 - confidence)
+    quantiles = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+    steps = np.arange(horizon + 1)
+    sample = pd.DataFrame(np.column_stack([np.full(len(kept), 100.0), kept]).T, index=steps)
+    return {
+        "VaR": float(-cutoff),
+        "CVaR": float(-horizon_ret[horizon_ret <= cutoff].mean()),
+        "Expected Return": float(horizon_ret.mean()),
+        "Probability of Loss": float((horizon_ret < 0).mean()),
+        "Terminal Quantiles": pd.Series(np.quantile(terminal, quantiles), index=quantiles),
+        "Drawdown Quantiles": pd.Series(np.quantile(max_dd, quantiles), index=quantiles),
+        "Bands": sample.quantile([0.05, 0.25, 0.5, 0.75, 0.95], axis=1).T,
+        "Paths": sample,
+    }
+
+# Seeded simulations are deterministic, so they can be memoized like the other engines
+cached_simulate_risk = memoize("simulate_risk")(simulate_risk)
@@ -0,0 +1,302 @@
+import time
+import numpy as np
+import pandas as pd
+
+OBJECTIVES = ["Min Variance", "Max Sharpe", "Risk Parity", "Target Volatility"]
+
+# Search range of the risk aversion (relative to the scale of returns and variances)
+GAMMA_RANGE = (1e-3, 1e5)
+
+# Warm Max Sharpe search: first step around the previous log10(gamma), and the smallest
+# step handed to the next rerun (the golden section stops at a 1e-3 bracket)
+WARM_STEP = 0.05
+MIN_WARM_STEP = 0.01
+
+# Relative distance from target_vol within which the target counts as reached
+TARGET_VOL_RTOL = 1e-3
+
+
+def project_simplex(v, cap=1.0):
+    """
+    Euclidean projection onto {0 <= w <= cap, sum(w) = 1}.
+    The solution is clip(v - tau, 0, cap); the sum is piecewise linear in tau, so tau is
+    found exactly between two consecutive breakpoints.
+    """
+    n = len(v)
+    cap = max(cap, 1.0 / n)
+    breaks = np.sort(np.concatenate([v, v - cap]))
+    sums = np.clip(v[None, :] - breaks[:, None], 0, cap).sum(axis=1)   # decreasing in tau
+    k = np.searchsorted(-sums, -1.0)
+    if k == 0:
+        return np.clip(v - breaks[0], 0, cap)
+    lo, hi = breaks[k - 1], breaks[k]
+    s_lo, s_hi = sums[k - 1], sums[k]
+    tau = lo if s_lo == s_hi else lo + (s_lo - 1.0) * (hi - lo) / (s_lo - s_hi)
+    return np.clip(v - tau, 0, cap)
+
+
+def project_return_plane(v, mu):
+    """
+    Euclidean projection onto {y >= 0, mu'y = 1}: y = max(v - tau * mu, 0), where
+    mu'y decreases with tau (piecewise linearly between the breakpoints v_i / mu_i).
+    """
+    nz = mu != 0
+    breaks = np.sort(v[nz] / mu[nz])
+    sums = np.maximum(v[None, :] - breaks[:, None] * mu[None, :], 0) @ mu
+    k = np.searchsorted(-sums, -1.0)
+    if k == 0:
+        lo, hi, s_lo, s_hi = breaks[0] - 1.0, breaks[0], np.maximum(v - (breaks[0] - 1.0) * mu, 0) @ mu, sums[0]
+    elif k == len(breaks):
+        lo, hi, s_lo, s_hi = breaks[-1], breaks[-1] + 1.0, sums[-1], np.maximum(v - (breaks[-1] + 1.0) * mu, 0) @ mu
+    else:
+        lo, hi, s_lo, s_hi = breaks[k - 1], breaks[k], sums[k - 1], sums[k]
+    tau = lo if s_lo == s_hi else lo + (s_lo - 1.0) * (hi - lo) / (s_lo - s_hi)
+    return np.maximum(v - tau * mu, 0)
+
+
+def _fista(grad, project, x0, step, tol=1e-10, max_iter=5000, curvature=None, min_step=0.0):
+    """
+    Accelerated projected gradient with adaptive restart. Returns (x, iterations, step).
+
+    For a quadratic objective, `curvature(d)` is its second-order term along d (d'Qd / 2
+    for Hessian Q). `step` is then only a first guess: it is halved until the quadratic
+    upper bound curvature(d) <= |d|^2 / (2 step) holds (backtracking, never below
+    min_step, the 1 / L step that always holds), and the step that worked is returned
+    so the next solve of a nearby problem can start from it.
+    """
+    w = project(x0)
+    y, t = w.copy(), 1.0
+    for it in range(1, max_iter + 1):
+        g = grad(y)
+        w_next = project(y - step * g)
+        if curvature is not None:
+            while step > min_step:
+                # Exact for a quadratic, without the cancellation of comparing objective values
+                d = w_next - y
+                if curvature(d) <= (d @ d) / (2 * step):
+                    break
+                step = max(step / 2, min_step)
+                w_next = project(y - step * g)
+        if np.abs(w_next - w).max() < tol * max(np.abs(w_next).max(), 1.0):
+            return w_next, it, step
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        # Restart the momentum when it points uphill
+        if (y - w_next) @ (w_next - w) > 0:
+            t_next, y = 1.0, w_next.copy()
+        else:
+            y = w_next + ((t - 1) / t_next) * (w_next - w)
+        w, t = w_next, t_next
+    return w, max_iter, step
+
+
+def _solve_qp(cov, mu, gamma, w0, cap, lipschitz, tol=1e-10, step=None):
+    """
+    min gamma * w'Cw - mu'w over the capped simplex. Returns (w, iterations, step).
+    Without `step` it uses 1 / (2 gamma L), which always satisfies the bound; a step from
+    a previous solve (in units of 1 / (2 gamma)) is tried first and backtracked if needed.
+    """
+    if step is None:
+        return _fista(lambda w: 2 * gamma * (cov @ w) - mu, lambda v: project_simplex(v, cap),
+                      w0, 1.0 / (2 * gamma * lipschitz), tol)
+    w, it, used = _fista(lambda w: 2 * gamma * (cov @ w) - mu, lambda v: project_simplex(v, cap),
+                         w0, max(step, 1.0 / lipschitz) / (2 * gamma), tol,
+                         curvature=lambda d: gamma * (d @ cov @ d), min_step=1.0 / (2 * gamma * lipschitz))
+    return w, it, used * 2 * gamma
+
+
+def _max_sharpe_direct(cov, excess, w0, lipschitz, tol=1e-10):
+    """
+    Uncapped max Sharpe as one convex problem: min y'Cy over {y >= 0, excess'y = 1},
+    then w = y / sum(y) (Cornuejols & Tutuncu). Warm-starts from w0 rescaled.
+    """
+    scale = w0 @ excess
+    y0 = w0 / scale if scale > 0 else np.maximum(excess, 0) / (excess @ np.maximum(excess, 0))
+    y, it, _ = _fista(lambda y: 2 * (cov @ y), lambda v: project_return_plane(v, excess),
+                      y0, 1.0 / (2 * lipschitz), tol)
+    return y / y.sum(), it
+
+
+def _risk_parity(cov, budgets, w0=None, tol=1e-12, max_iter=100):
+    """
+    Equal (or budgeted) risk contributions: Newton's method on the convex problem
+    min 1/2 y'Cy - sum(b log y) (Spinu, 2013), then w = y / sum(y).
+    """
+    y = w0 / np.sqrt(w0 @ cov @ w0) if w0 is not None else 1 / np.sqrt(np.diag(cov) * len(cov))
+    y = np.maximum(y, 1e-12)
+    for it in range(1, max_iter + 1):
+        grad = cov @ y - budgets / y
+        hess = cov + np.diag(budgets / y ** 2)
+        step = np.linalg.solve(hess, grad)
+        # Damp the step to stay in y > 0
+        alpha = 1.0
+        while np.any(y - alpha * step <= 0):
+            alpha /= 2
+        y = y - alpha * step
+        if np.abs(grad).max() < tol:
+            return y / y.sum(), it
+    return y / y.sum(), max_iter
+
+
+def _portfolio_stats(w, cov, mu, periods_per_year, risk_free):
+    vol = float(np.sqrt(max(w @ cov @ w, 0.0) * periods_per_year))
+    ret = float(w @ mu * periods_per_year)
+    return ret, vol, (ret - risk_free) / vol if vol > 0 else 0.0
+
+
+def _golden_max(f, lo, hi, tol=1e-3):
+    """
+    Maximizer of a unimodal f on [lo, hi] by golden section search.
+    """
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+    fa, fb = f(a), f(b)
+    while hi - lo > tol:
+        if fa < fb:
+            lo, a, fa = a, b, fb
+            b = lo + ratio * (hi - lo)
+            fb = f(b)
+        else:
+            hi, b, fb = b, a, fa
+            a = hi - ratio * (hi - lo)
+            fa = f(a)
+    return (lo + hi) / 2
+
+
+def _bracket_max(f, center, step, lo, hi):
+    """
+    Bracket of the maximum of a unimodal f around `center` (the previous optimum), moving
+    in steps that double towards the better side. Stays within [lo, hi].
+    """
+    center = min(max(center, lo), hi)
+    f_center = f(center)
+    left, right = max(lo, center - step), min(hi, center + step)
+    f_left, f_right = f(left), f(right)
+    if f_left <= f_center >= f_right:
+        return left, right
+    direction = 1 if f_right > f_left else -1
+    prev, best, f_best = center, (right if direction > 0 else left), max(f_left, f_right)
+    while lo < best < hi:
+        step *= 2
+        nxt = min(hi, max(lo, best + direction * step))
+        f_next = f(nxt)
+        if f_next <= f_best:
+            return (prev, nxt) if direction > 0 else (nxt, prev)
+        prev, best, f_best = best, nxt, f_next
+    return (prev, best) if direction > 0 else (best, prev)
+
+
+def optimize_portfolio(cov, expected_returns=None, objective="Min Variance", target_vol=None, max_weight=1.0,
+                       w0=None, risk_aversion0=None, search_step0=None, step0=None, periods_per_year=252, risk_free=0.0, tol=1e-10):
+    """
+    Long-only, fully invested weights for the given per-period covariance (DataFrame)
+    and per-period expected returns (Series), as estimated for get_advanced_metrics.
+
+    objective: "Min Variance", "Max Sharpe", "Risk Parity" (max_weight not applied) or
+    "Target Volatility" (annualized `target_vol`, highest expected return at that risk).
+    Without a weight cap, Max Sharpe is solved directly in its convex form. Otherwise it, like
+    Target Volatility, searches the frontier of min gamma * w'Cw - mu'w on log10(gamma)
+    (golden section / bisection); each solve is warm-started from the solution at the
+    nearest risk aversion already solved.
+    Warm start on reruns: w0, risk_aversion0, search_step0 and step0 are the 'Weights',
+    'Risk Aversion', 'Search Step' and 'Step Size' of the previous result; the search then
+    starts from that solution, in a bracket of that width around it, and the solver from
+    the gradient step that last worked.
+    Returns the weights and their annualized return, volatility and Sharpe ratio, with
+    the iteration count and the solve time. For Target Volatility, 'Target Reached' is
+    False when max_weight (or the assets) cannot reach target_vol: the weights are then the
+    frontier portfolio closest to it, at the 'Volatility' returned.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    if objective == "Target Volatility" and (target_vol is None or not target_vol > 0):
+        raise ValueError(f"Target Volatility needs a positive target_vol, got {target_vol!r}")
+    t0 = time.perf_counter()
+    tickers = list(cov.columns)
+    c = cov.to_numpy(dtype=float)
+    n = len(tickers)
+    mu = np.zeros(n) if expected_returns is None else np.asarray(pd.Series(expected_returns)[tickers], dtype=float)
+    start = np.full(n, 1.0 / n) if w0 is None else np.asarray(w0, dtype=float)
+    lipschitz = float(np.linalg.eigvalsh(c)[-1])
+    excess = mu - risk_free / periods_per_year
+    iterations = 0
+    log_gamma = None
+    search_step = None
+    step_size = None
+    target_reached = None
+
+    if objective == "Max Sharpe" and max_weight >= 1.0 and np.any(excess > 0):
+        w, iterations = _max_sharpe_direct(c, excess, start, lipschitz, tol)
+    elif objective == "Risk Parity":
+        w, iterations = _risk_parity(c, np.full(n, 1.0 / n), w0=None if w0 is None else np.maximum(start, 1e-6))
+    elif objective == "Min Variance":
+        w, iterations, _ = _solve_qp(c, np.zeros(n), 1.0, start, max_weight, lipschitz, tol)
+    else:
+        # gamma is scaled so the range spans the max-return corner to the min-variance portfolio
+        scale = max(np.abs(mu).max(), 1e-12) / max(np.diag(c).mean(), 1e-18)
+        # Solutions by log10(gamma): each solve starts from the closest one (the first from w0)
+        solved = {}
+
+        # Step of the last solve (in units of 1 / (2 gamma)): the full-investment constraint
+        # cancels the market direction, so steps well above 1 / L usually hold on the frontier
+        state = {"step": 2.0 / lipschitz if step0 is None else step0}
+
+        def solve(log_gamma):
+            nonlocal iterations
+            if log_gamma not in solved:
+                seed = solved[min(solved, key=lambda g: abs(g - log_gamma))] if solved else start
+                solved[log_gamma], it, step = _solve_qp(c, mu, scale * 10 ** log_gamma, seed, max_weight, lipschitz,
+                                                        tol, step=state["step"])
+                # Let the next solve try a slightly larger step again
+                state["step"] = step * 1.25
+                iterations += it
+            return solved[log_gamma]
+
+        full_lo, full_hi = np.log10(GAMMA_RANGE[0]), np.log10(GAMMA_RANGE[1])
+        if objective == "Max Sharpe":
+            def sharpe(log_gamma):
+                return _portfolio_stats(solve(log_gamma), c, mu, periods_per_year, risk_free)[2]
+            if risk_aversion0 is None:
+                log_gamma = _golden_max(sharpe, full_lo, full_hi)
+                search_step = WARM_STEP
+            else:
+                step = WARM_STEP if search_step0 is None else search_step0
+                lo, hi = _bracket_max(sharpe, risk_aversion0, step, full_lo, full_hi)
+                log_gamma = _golden_max(sharpe, lo, hi)
+                # Next rerun: about as far as the optimum moved this time
+                search_step = max(MIN_WARM_STEP, 2 * abs(log_gamma - risk_aversion0))
+        else:
+            # Volatility decreases with the risk aversion: widen a warm bracket if needed
+            def vol_at(log_gamma):
+                return _portfolio_stats(solve(log_gamma), c, mu, periods_per_year, risk_free)[1]
+            lo, hi = full_lo, full_hi
+            if risk_aversion0 is not None:
+                lo, hi = max(lo, risk_aversion0 - 0.5), min(hi, risk_aversion0 + 0.5)
+            while lo > full_lo and vol_at(lo) < target_vol:
+                lo, hi = max(full_lo, lo - 2 * (hi - lo)), lo
+            while hi < full_hi and vol_at(hi) > target_vol:
+                lo, hi = hi, min(full_hi, hi + 2 * (hi - lo))
+            while hi - lo > 1e-6:
+                mid = (lo + hi) / 2
+                if vol_at(mid) > target_vol:
+                    lo = mid
+                else:
+                    hi = mid
+            log_gamma = hi
+        w = solve(log_gamma)
+        step_size = state["step"]
+
+    ret, vol, sharpe_ratio = _portfolio_stats(w, c, mu, periods_per_year, risk_free)
+    if objective == "Target Volatility":
+        target_reached = bool(abs(vol - target_vol) <= TARGET_VOL_RTOL * target_vol)
+    return {
+        "Weights": pd.Series(w, index=tickers),
+        "Expected Return": ret,
+        "Volatility": vol,
+        "Sharpe Ratio": sharpe_ratio,
+        "Risk Aversion": log_gamma,
+        "Search Step": search_step,
+        "Step Size": step_size,
+        "Target Reached": target_reached,
+        "Iterations": iterations,
+        "Seconds": time.perf_counter() - t0,
+    }
@@ -1,83 +1,150 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
+from quant_core.panel import get_panel
+from quant_core.providers import period_start
+from quant_core.memo import memoize
+from quant_b_portfolio.rebalance_engine import rebalance_mask, simulate_rebalanced, simulate_events, DEFAULT_BAND
+from quant_b_portfolio.covariance import CovarianceEstimator
+from quant_core.intraday import DEFAULT_CHUNK_ROWS
 
-def fetch_portfolio_data(tickers, period="1y", interval="1d"):
+def fetch_portfolio_data(tickers, period="1y", interval="1d", source_period=None):
     """
-    Retrieves data, cleans it, and normalizes it to start at 100.
+    Retrieves data (served from the shared price panel), cleans it, and normalizes it to start at 100.
+    Both frames are read-only views of the panel's gap-filled and normalized arrays.
+    With source_period (a longer horizon), that panel is loaded once and `period` is a window
+    of it rebased to 100, so switching between horizons never reloads or realigns.
     """
     try:
-        data = yf.download(tickers, period=period, interval=interval, auto_adjust=True)
-        if data.empty: return None
-        
-        prices = data['Close']
-        if len(tickers) == 1:
-            prices = prices.to_frame(name=tickers[0])
-            
-        # Clean Data: Fill gaps so we don't get 'straight lines'
-        prices = prices.ffill().bfill()
-        
-        # Normalization: Start everything at 100 for visual comparison
-        normalized = (prices / prices.iloc[0]) * 100
-        return prices, normalized
+        panel = get_panel(tickers, period=source_period or period, interval=interval)
+        if source_period and source_period != period and not panel.empty:
+            panel = panel.window(start=period_start(period, panel.index))
+        if panel.empty: return None, None
+        return panel.frame("filled"), panel.frame("normalized")
     except Exception as e:
         print(f"Error: {e}")
         return None, None
 
-def simulate_portfolio(prices, normalized_data, weights_dict, rebalance_freq="None"):
+def prepare_portfolio_data(prices):
+    """
+    Cleans raw closes (as loaded for these tickers only) and normalizes them to start at 100.
+    """
+    # Rows where none of these tickers traded only exist because of other columns
+    prices = prices.dropna(how="all")
+
+    # Clean Data: Fill gaps so we don't get 'straight lines'
+    prices = prices.ffill().bfill()
+    
+    # Normalization: Start everything at 100 for visual comparison
+    normalized = (prices / prices.iloc[0]) * 100
+    return prices, normalized
+
+def simulate_portfolio(prices, normalized_data, weights_dict, rebalance_freq="None", band=None, calendar=None):
     """
     Calculates portfolio value based on weights and rebalancing rules.
     """
     # BUY AND HOLD STRATEGY
-    if rebalance_freq == "None":
+    if rebalance_freq == "None" and band is None:
         portfolio_val = pd.Series(0.0, index=normalized_data.index)
         for ticker, weight in weights_dict.items():
             portfolio_val += normalized_data[ticker] * weight
         return portfolio_val
 
-    # REBALANCING STRATEGY
+    # REBALANCING STRATEGY (event-driven kernel, see rebalance_engine)
     else:
-        returns = prices.pct_change().fillna(0)
-        portfolio_val = pd.Series(100.0, index=returns.index)
-        # Initial positions in dollars (starting with $100)
-        current_positions = {t: 100.0 * w for t, w in weights_dict.items()}
-        
-        for i in range(1, len(returns.index)):
-            curr_date, prev_date = returns.index[i], returns.index[i-1]
-            
-            # Trigger Rebalancing
-            rebalance = False
-            if rebalance_freq == "Monthly" and curr_date.month != prev_date.month: rebalance = True
-            elif rebalance_freq == "Yearly" and curr_date.year != prev_date.year: rebalance = True
-            
-            if rebalance:
-                total_current = sum(current_positions.values())
-                current_positions = {t: total_current * w for t, w in weights_dict.items()}
-            
-            # Apply performance
-            day_sum = 0
-            for t in weights_dict.keys():
-                current_positions[t] *= (1 + returns.at[curr_date, t])
-                day_sum += current_positions[t]
-            portfolio_val.at[curr_date] = day_sum
-            
-        return portfolio_val
+        return rebalance_portfolio(prices, weights_dict, rebalance_freq, band, calendar)[0]
 
-def get_advanced_metrics(prices, portfolio_series, weights_dict):
+def rebalance_portfolio(prices, weights_dict, rebalance_freq="Monthly", band=None, calendar=None):
     """
-    Computes diversification effect, volatility, and correlation.
+    Rebalanced portfolio path plus its rebalancing statistics (event count and turnover).
+    rebalance_freq: a calendar schedule ("Weekly", "Monthly", "Quarterly", "Yearly"),
+    optionally aligned to an exchange calendar, or "Tolerance Band" (drift above `band`,
+    DEFAULT_BAND if not given). A band can also be combined with a schedule.
+    """
+    returns = prices.pct_change().fillna(0)
+    tickers = list(weights_dict.keys())
+    weights = np.array([weights_dict[t] for t in tickers], dtype=float)
+    if rebalance_freq == "Tolerance Band" and band is None:
+        band = DEFAULT_BAND
+    mask = rebalance_mask(returns.index, rebalance_freq, calendar)
+    values, stats = simulate_events(returns[tickers].to_numpy(dtype=float), weights, mask, band)
+    return pd.Series(values, index=returns.index), stats
+
+def estimate_risk_model(prices, cov_method="sample", periods_per_year=252):
+    """
+    Covariance estimator fitted on the asset returns (one matrix product gives the
+    covariance, the individual vols and the correlation). Memoized, so the metrics and
+    the optimizer share the same fit.
     """
     returns = prices.pct_change().dropna()
+    return CovarianceEstimator(cov_method, periods_per_year=periods_per_year).fit(returns)
+
+def get_advanced_metrics(prices, portfolio_series, weights_dict, cov_method="sample", periods_per_year=252):
+    """
+    Computes diversification effect, volatility, and correlation.
+    'Portfolio Vol' is realized on the simulated path; 'Ex-Ante Vol' is sqrt(w' S w)
+    from the chosen covariance estimator ("sample", "ewma" or "shrinkage").
+    Volatilities are annualized with periods_per_year bars; 'Covariance' and
+    'Expected Returns' are per bar (the optimizer inputs).
+    """
     port_rets = portfolio_series.pct_change().dropna()
+    sample = cached_estimate_risk_model(prices, "sample", periods_per_year)
+    estimator = sample if cov_method == "sample" else cached_estimate_risk_model(prices, cov_method, periods_per_year)
     
     # Diversification Effect = (Weighted Avg Vol) - (Portfolio Vol)
-    indiv_vols = returns.std() * np.sqrt(252)
+    indiv_vols = sample.volatilities()
     weighted_vol = sum(indiv_vols[t] * weights_dict[t] for t in weights_dict.keys())
-    port_vol = port_rets.std() * np.sqrt(252)
+    port_vol = port_rets.std() * np.sqrt(periods_per_year)
     
     return {
-        "Correlation": returns.corr(),
+        "Correlation": estimator.correlation(),
+        "Covariance": estimator.covariance_frame(),
+        "Expected Returns": pd.Series(estimator.mean, index=estimator.columns),
         "Portfolio Vol": port_vol,
+        "Ex-Ante Vol": estimator.portfolio_volatility(weights_dict),
         "Diversification Benefit": weighted_vol - port_vol,
         "Total Return": (portfolio_series.iloc[-1] / 100) - 1
-    }
\ No newline at end of file
+    }
+
+def simulate_portfolio_compact(panel, weights_dict, rebalance_freq="None", chunk_rows=DEFAULT_CHUNK_ROWS, calendar=None,
+                               return_stats=False):
+    """
+    simulate_portfolio over a CompactPanel (float32 prices, e.g. months of 1m bars),
+    processed in chunks of rows so only one chunk is ever widened to float64.
+    The panel must already be cleaned (prepare_portfolio_data). Calendar schedules only.
+    With return_stats, also returns the rebalancing statistics of rebalance_portfolio.
+    """
+    tickers = list(weights_dict.keys())
+    cols = [panel.columns.index(t) for t in tickers]
+    weights = np.array([weights_dict[t] for t in tickers], dtype=float)
+    n_rows = len(panel.epochs)
+    values = np.empty(n_rows)
+    stats = {"Rebalances": 0, "Turnover": 0.0}
+    if n_rows == 0:
+        series = pd.Series(values, index=panel.index)
+        return (series, stats) if return_stats else series
+    first = panel.values[0, cols].astype(float)
+    mask = None if rebalance_freq == "None" else rebalance_mask(panel.index, rebalance_freq, calendar)
+
+    positions = None
+    for lo, hi in panel.chunks(chunk_rows):
+        # Each chunk overlaps the previous one by a row so returns stay continuous
+        start = max(lo - 1, 0)
+        block = panel.values[start:hi, cols].astype(float)
+        if mask is None:
+            values[lo:hi] = (block[lo - start:] / first * 100) @ weights
+            continue
+        returns = np.zeros_like(block)
+        returns[1:] = block[1:] / block[:-1] - 1
+        # The overlapping row is the chunk's row 0, whose flag is never read: no event counts twice
+        chunk_values, positions = simulate_rebalanced(returns, weights, mask[start:hi], positions=positions,
+                                                      return_positions=True, stats=stats)
+        values[lo:hi] = chunk_values[lo - start:]
+    series = pd.Series(values, index=panel.index)
+    stats["Turnover"] = float(stats["Turnover"])
+    return (series, stats) if return_stats else series
+
+# Memoized variants (content hash of prices + config), shared by the dashboard and the report
+cached_simulate_portfolio = memoize("simulate_portfolio")(simulate_portfolio)
+cached_rebalance_portfolio = memoize("rebalance_portfolio")(rebalance_portfolio)
+cached_estimate_risk_model = memoize("estimate_risk_model")(estimate_risk_model)
+cached_get_advanced_metrics = memoize("get_advanced_metrics", version=2)(get_advanced_metrics)
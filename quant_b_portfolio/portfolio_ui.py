@@ -1,12 +1,39 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-import os
-from quant_b_portfolio.portfolio_engine import fetch_portfolio_data, simulate_portfolio, get_advanced_metrics
+from quant_b_portfolio.portfolio_engine import fetch_portfolio_data, cached_simulate_portfolio, cached_rebalance_portfolio, cached_get_advanced_metrics, cached_estimate_risk_model, simulate_portfolio_compact
+from quant_b_portfolio.optimizer import optimize_portfolio, OBJECTIVES
+from quant_b_portfolio.rebalance_engine import FREQUENCIES, DEFAULT_BAND
+from quant_b_portfolio.monte_carlo import cached_simulate_risk
+from quant_b_portfolio.horizons import cached_horizon_table
+from quant_core.intraday import PERIODS_BY_INTERVAL, DEFAULT_PERIOD, CompactPanel, periods_per_year
+from quant_core.profiling import start_profiler, finish_profiler, span
+from quant_core.charting import line_figure
+from quant_core.universe import UNIVERSE, ALL_TICKERS
+from quant_core.refresher import get_refresher
+from quant_core.panel import fetch_errors
+from quant_core.drawdowns import cached_drawdown_episodes
+from quant_core.rolling import cached_rolling_metrics, cached_rolling_correlation
 from streamlit_autorefresh import st_autorefresh # for the 5-minute refresh 
-from quant_b_portfolio.data_manager import save_config, load_config, log_daily_performance
+from quant_b_portfolio.data_manager import save_config, load_config, log_daily_performance, get_history_store
+from quant_b_portfolio.history_store import portfolio_identifier
 
 def run_portfolio_module():
+    # Timing spans of this rerun; the breakdown is shown when the sidebar toggle is on
+    profiler = start_profiler("quant_b", st.session_state.get("profile_quant_b", False))
+    try:
+        portfolio_page()
+    finally:
+        finish_profiler(profiler)
+    if st.sidebar.checkbox("Show Performance Breakdown", key="profile_quant_b"):
+        st.subheader("Performance Breakdown")
+        totals = profiler.totals()
+        cols = st.columns(len(totals))
+        for col, (stage, seconds) in zip(cols, totals.items()):
+            col.metric(stage.capitalize(), f"{seconds * 1000:.1f} ms")
+        st.dataframe(profiler.frame().drop(columns=["run"]), use_container_width=True)
+
+def portfolio_page():
     # Auto-refresh every 5 minutes = 300 seconds
     st_autorefresh(interval=5 * 60 * 1000, key="datarefresh")
 
@@ -18,6 +45,10 @@ def run_portfolio_module():
     default_freq = "None"
     default_timeframe = "1y"
     default_equal = True
+    default_interval = "1d"
+    default_band = DEFAULT_BAND
+    default_calendar = None
+    default_weighting = "Manual"
     saved_weights = {}
 
     if saved_config:
@@ -25,33 +56,19 @@ def run_portfolio_module():
         default_freq = saved_config.get("freq", default_freq)
         default_timeframe = saved_config.get("timeframe", default_timeframe)
         default_equal = saved_config.get("equal_weights", default_equal)
+        default_interval = saved_config.get("interval", default_interval)
+        default_band = saved_config.get("band") or default_band
+        default_calendar = saved_config.get("calendar", default_calendar)
+        default_weighting = saved_config.get("weighting", default_weighting)
         saved_weights = saved_config.get("weights", {})
 
     st.title("Professional Portfolio Analyzer")
 
-    # 1. Asset Dictionaries Configuration
-    # Shuffled CAC 40 and Top 50 Cryptos for a diverse selection
-    assets_dict = {
-        "CAC 40 (France)": [
-            "AI.PA", "AIR.PA", "ALO.PA", "MT.AS", "AXA.PA", "BNP.PA", "EN.PA", "CAP.PA", 
-            "CA.PA", "ACA.PA", "BN.PA", "DSY.PA", "ENGI.PA", "EL.PA", "ERF.PA", "RMS.PA", 
-            "KER.PA", "OR.PA", "LR.PA", "MC.PA", "ML.PA", "ORA.PA", "PUB.PA", "RNO.PA", 
-            "SAF.PA", "SGO.PA", "SAN.PA", "SU.PA", "GLE.PA", "STLA.PA", "STM.PA", "TEP.PA", 
-            "HO.PA", "TTE.PA", "URW.AS", "VIE.PA", "VIV.PA", "WLN.PA", "DG.PA", "EDEN.PA"
-        ],
-        "Crypto 50 (Global)": [
-            "BTC-USD", "ETH-USD", "USDT-USD", "BNB-USD", "SOL-USD", "XRP-USD", "USDC-USD", 
-            "ADA-USD", "DOGE-USD", "TRX-USD", "DOT-USD", "LINK-USD", "MATIC-USD", "SHIB-USD", 
-            "DAI-USD", "LTC-USD", "BCH-USD", "UNI-USD", "AVAX-USD", "XLM-USD", "ATOM-USD", 
-            "XMR-USD", "ETC-USD", "FIL-USD", "HBAR-USD", "APT-USD", "NEAR-USD", "VET-USD", 
-            "OP-USD", "ARB-USD", "RNDR-USD", "INJ-USD", "STX-USD", "GRT-USD", "KAS-USD", 
-            "THETA-USD", "MKR-USD", "LDO-USD", "BSV-USD", "AAVE-USD", "EGLD-USD", "TIA-USD", 
-            "QNT-USD", "FLOW-USD", "SUI-USD", "SEI-USD", "ALGO-USD", "FTM-USD", "GALA-USD", "DYDX-USD"
-        ]
-    }
-
-    # Flatten list for the multiselect widget
-    all_tickers = assets_dict["CAC 40 (France)"] + assets_dict["Crypto 50 (Global)"]
+    # 1. Asset Dictionaries Configuration (quant_core.universe)
+    assets_dict = UNIVERSE
+
+    # Flat list for the multiselect widget
+    all_tickers = ALL_TICKERS
 
     # --- CSS Injection for Tag Coloring ---
     # French Stocks = Blue (#1f77b4), Cryptos = Red (#d62728)
@@ -67,17 +84,17 @@ def run_portfolio_module():
     st.sidebar.header("Strategy Settings")
     
     # Helper to find index for selectbox defaults
-    freq_options = ["None", "Monthly", "Yearly"]
+    freq_options = FREQUENCIES
     try:
         freq_index = freq_options.index(default_freq)
     except ValueError:
         freq_index = 0
 
-    time_options = ["1mo", "6mo", "1y", "2y"]
+    interval_options = list(PERIODS_BY_INTERVAL.keys())
     try:
-        time_index = time_options.index(default_timeframe)
+        interval_index = interval_options.index(default_interval)
     except ValueError:
-        time_index = 2
+        interval_index = 0
 
     tickers = st.sidebar.multiselect(
         "Assets Selection", 
@@ -85,22 +102,93 @@ def run_portfolio_module():
         default=default_tickers
     )
     
-    equal_weight_active = st.sidebar.checkbox("Use Equal Weights", value=default_equal)
+    weighting_options = ["Manual"] + OBJECTIVES
+    weighting = st.sidebar.selectbox("Weighting Method", weighting_options,
+                                     index=weighting_options.index(default_weighting) if default_weighting in weighting_options else 0)
+    target_vol, max_weight = None, 1.0
+    if weighting == "Target Volatility":
+        target_vol = st.sidebar.slider("Target Volatility (%)", 1.0, 100.0, 15.0, 0.5) / 100
+    if weighting in ("Min Variance", "Max Sharpe", "Target Volatility"):
+        max_weight = st.sidebar.slider("Max Weight per Asset (%)", 5.0, 100.0, 100.0, 5.0) / 100
+    equal_weight_active = weighting == "Manual" and st.sidebar.checkbox("Use Equal Weights", value=default_equal)
     freq = st.sidebar.selectbox("Rebalancing Frequency", freq_options, index=freq_index)
+    band, calendar = None, None
+    if freq == "Tolerance Band":
+        band = st.sidebar.slider("Drift Band (%)", 1.0, 25.0, float(default_band * 100), 0.5) / 100
+    elif freq != "None":
+        # Mixed stock/crypto panels have weekend bars: rebalance on exchange sessions instead
+        calendar_labels = {"Every bar": None, "Euronext sessions": "XPAR", "NYSE sessions": "XNYS"}
+        calendar_keys = list(calendar_labels.keys())
+        calendar_index = list(calendar_labels.values()).index(default_calendar) if default_calendar in calendar_labels.values() else 0
+        calendar = calendar_labels[st.sidebar.selectbox("Rebalance On", calendar_keys, index=calendar_index)]
+    interval = st.sidebar.selectbox("Bar Interval", interval_options, index=interval_index)
+    # Yahoo keeps a limited intraday history, so the timeframes depend on the interval
+    time_options = PERIODS_BY_INTERVAL[interval]
+    try:
+        time_index = time_options.index(default_timeframe)
+    except ValueError:
+        time_index = time_options.index(DEFAULT_PERIOD[interval])
     timeframe = st.sidebar.selectbox("Timeframe", time_options, index=time_index)
+    cov_labels = {"Sample": "sample", "EWMA (0.94)": "ewma", "Shrinkage (OAS)": "shrinkage"}
+    cov_method = cov_labels[st.sidebar.selectbox("Covariance Estimator", list(cov_labels.keys()))]
 
     # --- SAVE BUTTON ---
     if st.sidebar.button("Save Configuration"):
         # We save the weights currently in the user_weights dictionary (captured later in code)
         # Note: If equal_weight is active, specific weights matter less, but we save them anyway.
         current_weights_to_save = st.session_state.get('current_user_weights', {})
-        if save_config(tickers, current_weights_to_save, freq, timeframe, equal_weight_active):
+        if save_config(tickers, current_weights_to_save, freq, timeframe, equal_weight_active, interval, band, calendar, weighting):
             st.sidebar.success("Configuration saved successfully!")
 
     if len(tickers) >= 3: 
-        prices, normalized = fetch_portfolio_data(tickers, period=timeframe)
-        
+        # The longest timeframe is loaded once; the selected one is a rebased window of it
+        longest = time_options[-1]
+        # Prices come from the shared background refresher once it has polled these tickers
+        refresher = get_refresher()
+        refresher.subscribe(tickers, longest, interval)
+        data_version = refresher.version(tickers, longest, interval)
+        with span("fetch_portfolio_data", "fetch") as s:
+            prices, normalized = s.record(fetch_portfolio_data(tickers, period=timeframe, interval=interval,
+                                                               source_period=longest))
+
+        # Tickers that returned no data (delisted, unknown, network errors) are left out
+        if prices is not None:
+            failed = [t for t in tickers if t not in prices.columns]
+            if failed:
+                errors = fetch_errors(failed)
+                st.warning("No data for " + ", ".join(
+                    f"{t} ({errors[t]['kind']}: {errors[t]['message']})" if t in errors else t for t in failed
+                ) + ". These assets are left out.")
+                tickers = [t for t in tickers if t in prices.columns]
+                if len(tickers) < 3:
+                    prices = None
+
         if prices is not None:
+            ann_factor = periods_per_year(interval, tickers)
+
+            # Optimized weights, from the same (memoized) risk model as the metrics below.
+            # The previous solution warm-starts the solver on each autorefresh.
+            optimized = None
+            if weighting != "Manual":
+                risk_model = cached_estimate_risk_model(prices, cov_method, ann_factor)
+                warm_key = (tuple(tickers), weighting, cov_method, target_vol, max_weight)
+                warm = st.session_state.get("optimizer_warm")
+                warm = warm[1] if warm is not None and warm[0] == warm_key else None
+                with span("optimize_portfolio") as s:
+                    s.record(prices)
+                    opt = optimize_portfolio(risk_model.covariance_frame(), pd.Series(risk_model.mean, index=risk_model.columns),
+                                             weighting, target_vol=target_vol, max_weight=max_weight,
+                                             w0=None if warm is None else warm["Weights"].values,
+                                             risk_aversion0=None if warm is None else warm["Risk Aversion"],
+                                             search_step0=None if warm is None else warm["Search Step"],
+                                             step0=None if warm is None else warm["Step Size"],
+                                             periods_per_year=ann_factor)
+                st.session_state["optimizer_warm"] = (warm_key, opt)
+                optimized = opt["Weights"]
+                if opt["Target Reached"] is False:
+                    st.warning(f"Target volatility {target_vol:.2%} cannot be reached with these assets and a "
+                               f"{max_weight:.0%} max weight: the closest portfolio has {opt['Volatility']:.2%} volatility.")
+
             # 3. Dynamic Weight Selection 
             st.subheader("Asset Allocation")
             cols = st.columns(len(tickers))
@@ -117,6 +205,12 @@ def run_portfolio_module():
                 else:
                     default_val = auto_w
 
+                if optimized is not None:
+                    user_weights[ticker] = float(optimized[ticker])
+                    col.write(f"{ticker}: **{optimized[ticker]:.2%}**")
+                    col.write(f"Price: **{prices[ticker].iloc[-1]:,.2f}**")
+                    continue
+
                 # Input for weights
                 w = col.number_input(
                     f"{ticker} (%)", 
@@ -147,68 +241,203 @@ def run_portfolio_module():
                 # NORMALIZATION: Force the total to be exactly 1.0 for math precision
                 final_weights = {k: v / total_sum for k, v in user_weights.items()}
                 
-                if equal_weight_active:
+                if optimized is not None:
+                    st.success(f"{weighting} weights: expected return {opt['Expected Return']:.2%}, "
+                               f"volatility {opt['Volatility']:.2%}, Sharpe {opt['Sharpe Ratio']:.2f} "
+                               f"(solved in {opt['Seconds'] * 1000:.1f} ms, {opt['Iterations']} iterations).")
+                elif equal_weight_active:
                     st.success(f"Equal weighting applied: {100/len(tickers):.2f}% per asset.")
                 else:
                     st.success(f"Weights normalized to 100% for calculation accuracy.")
                 
-                # Run the simulation with final normalized weights
-                portfolio_ts = simulate_portfolio(prices, normalized, final_weights, freq)
-                metrics = get_advanced_metrics(prices, portfolio_ts, final_weights)
+                # Run the simulation with final normalized weights; an autorefresh that brought
+                # no new snapshot reuses this session's last results without rehashing the prices
+                run_key = None if data_version is None else (
+                    data_version, tuple(tickers), timeframe, interval, tuple(sorted(final_weights.items())),
+                    freq, band, calendar, cov_method)
+                last_run = st.session_state.get("portfolio_run")
+                if run_key is not None and last_run is not None and last_run[0] == run_key:
+                    portfolio_ts, rebal_stats, metrics = last_run[1]
+                else:
+                    rebal_stats = None
+                    if freq == "None":
+                        portfolio_ts = cached_simulate_portfolio(prices, normalized, final_weights, freq)
+                    elif interval == "1d" or band is not None:
+                        portfolio_ts, rebal_stats = cached_rebalance_portfolio(prices, final_weights, freq, band, calendar)
+                    else:
+                        # Intraday histories are simulated from a float32 panel, chunk by chunk
+                        with span("simulate_portfolio_compact") as s:
+                            s.record(prices)
+                            portfolio_ts, rebal_stats = simulate_portfolio_compact(CompactPanel.from_frame(prices), final_weights, freq,
+                                                                                   calendar=calendar, return_stats=True)
+                    metrics = cached_get_advanced_metrics(prices, portfolio_ts, final_weights, cov_method, ann_factor)
+                    st.session_state["portfolio_run"] = (run_key, (portfolio_ts, rebal_stats, metrics))
                 st.caption("🔄 Data automatically refreshes every 5 minutes")
                 
                 # --- REPORTING BUTTONS ---
                 c1, c2 = st.columns([1, 3])
                 with c1:
                     if st.button("Generate Daily Report"):
-                        if log_daily_performance(metrics):
+                        run_config = {"tickers": tickers, "weights": final_weights, "freq": freq, "timeframe": timeframe,
+                                      "interval": interval, "band": band, "calendar": calendar}
+                        if log_daily_performance(metrics, tickers, run_config):
                             st.success("Report logged.")
                 
                 with c2:
                     if st.checkbox("Show Report History"):
-                        if os.path.exists("portfolio_history.csv"):
-                            history_df = pd.read_csv("portfolio_history.csv")
-                            st.dataframe(history_df.sort_index(ascending=False), use_container_width=True)
+                        store = get_history_store()
+                        scope = st.radio("Scope", ["This portfolio", "All portfolios"], horizontal=True)
+                        portfolio_id = portfolio_identifier(tickers) if scope == "This portfolio" else None
+                        n_rows = store.count(portfolio_id=portfolio_id)
+                        if n_rows:
+                            page_size = 50
+                            n_pages = (n_rows - 1) // page_size + 1
+                            page = st.number_input(f"Page (1-{n_pages}, newest first)", min_value=1, max_value=n_pages, value=1)
+                            history_df = store.page(page - 1, page_size, portfolio_id=portfolio_id)
+                            st.dataframe(history_df, use_container_width=True)
                         else:
                             st.info("No history found yet.")
 
                 # 5. Performance Chart
-                fig = go.Figure()
-                for t in tickers:
-                    fig.add_trace(go.Scatter(x=normalized.index, y=normalized[t], name=t, line=dict(dash='dot', width=1)))
-                fig.add_trace(go.Scatter(x=portfolio_ts.index, y=portfolio_ts, name="PORTFOLIO", line=dict(width=4, color='gold')))
-                
-                fig.update_layout(
-                    title="Cumulative Performance (Base 100)", 
-                    yaxis_title="Relative Value", 
-                    template="plotly_dark",
-                    hovermode="x unified"
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                with span("performance_chart", "render") as s:
+                    s.record(normalized)
+                    # Decimated to the pixel budget (extremes kept), WebGL for many points,
+                    # and cached so an autorefresh with unchanged prices reuses the figure
+                    lines = [(normalized[t], t, dict(dash='dot', width=1)) for t in tickers]
+                    lines.append((portfolio_ts, "PORTFOLIO", dict(width=4, color='gold')))
+                    fig = line_figure(
+                        lines,
+                        title="Cumulative Performance (Base 100)", 
+                        yaxis_title="Relative Value", 
+                        template="plotly_dark",
+                        hovermode="x unified"
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
 
                 # 6. Metrics Display
-                m1, m2, m3 = st.columns(3)
+                m1, m2, m3, m4 = st.columns(4)
                 m1.metric("Total Return", f"{metrics['Total Return']:.2%}")
                 m2.metric("Portfolio Volatility", f"{metrics['Portfolio Vol']:.2%}")
                 m3.metric("Diversification Benefit", f"{metrics['Diversification Benefit']:.2%}")
+                m4.metric("Ex-Ante Volatility", f"{metrics['Ex-Ante Vol']:.2%}")
+                if rebal_stats is not None:
+                    r1, r2, _, _ = st.columns(4)
+                    r1.metric("Rebalances", rebal_stats["Rebalances"])
+                    r2.metric("Turnover (one-way)", f"{rebal_stats['Turnover']:.2%}")
 
                 st.subheader("Correlation Matrix")
-                corr_matrix = metrics["Correlation"]
-                heatmap_fig = go.Figure(data=go.Heatmap(
-                    z=corr_matrix.values,
-                    x=corr_matrix.columns,
-                    y=corr_matrix.index,
-                    colorscale='RdBu_r',
-                    zmin=-1, zmax=1,
-                    text=corr_matrix.round(2).values,
-                    texttemplate="%{text}",
-                    showscale=True
-                ))
-                heatmap_fig.update_layout(
-                    template="plotly_dark",
-                    yaxis_autorange='reversed'
-                )
-                st.plotly_chart(heatmap_fig, use_container_width=True)        
+                with span("correlation_heatmap", "render") as s:
+                    corr_matrix = s.record(metrics["Correlation"])
+                    # Cell labels are unreadable (and heavy to send) for large universes
+                    show_text = len(corr_matrix) <= 20
+                    heatmap_fig = go.Figure(data=go.Heatmap(
+                        z=corr_matrix.values,
+                        x=corr_matrix.columns,
+                        y=corr_matrix.index,
+                        colorscale='RdBu_r',
+                        zmin=-1, zmax=1,
+                        text=corr_matrix.round(2).values if show_text else None,
+                        texttemplate="%{text}" if show_text else None,
+                        showscale=True
+                    ))
+                    heatmap_fig.update_layout(
+                        template="plotly_dark",
+                        yaxis_autorange='reversed'
+                    )
+                    st.plotly_chart(heatmap_fig, use_container_width=True)        
+
+                # 7. All timeframes at once, from the longest history already loaded
+                if st.checkbox("Show Horizon Comparison"):
+                    full_prices, _ = fetch_portfolio_data(tickers, period=longest, interval=interval)
+                    horizons, _ = cached_horizon_table(full_prices, final_weights, time_options, freq, band, calendar, ann_factor)
+                    if horizons.empty:
+                        st.info("Not enough history to compare horizons.")
+                    else:
+                        horizons = horizons.assign(Start=horizons["Start"].astype(str).str[:16])
+                        formats = {"Total Return": "{:.2%}", "Volatility": "{:.2%}", "Sharpe Ratio": "{:.2f}",
+                                   "Max Drawdown": "{:.2%}", "Turnover": "{:.2%}"}
+                        st.dataframe(horizons.style.format({c: f for c, f in formats.items() if c in horizons.columns}),
+                                     use_container_width=True)
+
+                # 8. Forward-looking risk (simulated paths for the current weights)
+                if st.checkbox("Show Monte Carlo Risk"):
+                    mc1, mc2, mc3 = st.columns(3)
+                    mc_method = mc1.radio("Simulation", ["Block Bootstrap", "Multivariate Normal"], horizontal=True)
+                    n_paths = mc2.selectbox("Paths", [1_000, 10_000, 100_000], index=1)
+                    horizon = mc3.slider("Horizon (bars)", 5, 504, 252)
+                    risk = cached_simulate_risk(prices, final_weights, n_paths, horizon,
+                                                "bootstrap" if mc_method == "Block Bootstrap" else "normal",
+                                                rebalance_freq=freq, band=band, calendar=calendar,
+                                                cov_method=cov_method)
+                    if risk is None:
+                        st.info("Not enough history to simulate.")
+                    else:
+                        v1, v2, v3, v4 = st.columns(4)
+                        v1.metric("VaR (95%)", f"{risk['VaR']:.2%}")
+                        v2.metric("CVaR (95%)", f"{risk['CVaR']:.2%}")
+                        v3.metric("Expected Return", f"{risk['Expected Return']:.2%}")
+                        v4.metric("Probability of Loss", f"{risk['Probability of Loss']:.2%}")
+
+                        with span("monte_carlo_chart", "render") as s:
+                            s.record(risk["Paths"])
+                            bands = risk["Bands"]
+                            mc_fig = go.Figure()
+                            mc_fig.add_trace(go.Scatter(x=bands.index, y=bands[0.95], line=dict(width=0), showlegend=False))
+                            mc_fig.add_trace(go.Scatter(x=bands.index, y=bands[0.05], fill='tonexty', line=dict(width=0), name="5%-95%"))
+                            mc_fig.add_trace(go.Scatter(x=bands.index, y=bands[0.75], line=dict(width=0), showlegend=False))
+                            mc_fig.add_trace(go.Scatter(x=bands.index, y=bands[0.25], fill='tonexty', line=dict(width=0), name="25%-75%"))
+                            mc_fig.add_trace(go.Scatter(x=bands.index, y=bands[0.5], name="Median", line=dict(color='gold', width=3)))
+                            mc_fig.update_layout(title="Simulated Portfolio Value (Base 100)", xaxis_title="Bars ahead",
+                                                 template="plotly_dark", hovermode="x unified")
+                            st.plotly_chart(mc_fig, use_container_width=True)
+
+                        quantile_table = pd.DataFrame({"Terminal Value": risk["Terminal Quantiles"],
+                                                       "Max Drawdown": risk["Drawdown Quantiles"]})
+                        quantile_table.index = [f"{q:.0%}" for q in quantile_table.index]
+                        st.dataframe(quantile_table.T, use_container_width=True)
+
+                # 9. Drawdown episodes of every asset and the portfolio, from one pass over the panel
+                if st.checkbox("Show Drawdown Episodes"):
+                    with span("drawdown_episodes") as s:
+                        episodes = cached_drawdown_episodes(s.record(normalized.assign(Portfolio=portfolio_ts)))
+                    summary = episodes.max_drawdown().to_frame()
+                    summary["Episodes"] = episodes.bounds[1:] - episodes.bounds[:-1]
+                    st.dataframe(summary.T.style.format("{:.2%}", subset=pd.IndexSlice["Max Drawdown", :]),
+                                 use_container_width=True)
+                    dd1, dd2 = st.columns(2)
+                    dd_asset = dd1.selectbox("Series", ["Portfolio"] + tickers)
+                    k = dd2.slider("Episodes", 3, 20, 5)
+                    formats = {"Depth": "{:.2%}"}
+                    st.markdown("**Deepest**")
+                    st.dataframe(episodes.deepest(k, asset=dd_asset).style.format(formats), use_container_width=True)
+                    st.markdown("**Longest Underwater**")
+                    st.dataframe(episodes.longest(k, asset=dd_asset).style.format(formats), use_container_width=True)
+
+                # 10. Rolling risk of every asset and the portfolio, linear in the bars whatever the window
+                if st.checkbox("Show Rolling Metrics"):
+                    rm1, rm2 = st.columns(2)
+                    rolling_metric = rm1.radio("Metric", ["Volatility", "Sharpe Ratio", "Max Drawdown", "Correlation to Portfolio"],
+                                               horizontal=True)
+                    window = rm2.slider("Window (bars)", 10, 252, 63)
+                    with span("rolling_metrics") as s:
+                        levels = s.record(normalized.assign(Portfolio=portfolio_ts))
+                        if rolling_metric == "Correlation to Portfolio":
+                            pairs = [(t, "Portfolio") for t in tickers]
+                            rolling = cached_rolling_correlation(levels.pct_change(), window, pairs).set_axis(tickers, axis=1)
+                        else:
+                            rolling = cached_rolling_metrics(levels, window, ann_factor)[rolling_metric]
+                        rolling = rolling.dropna(how="all")
+                    if rolling.empty:
+                        st.info("Not enough bars for this window.")
+                    else:
+                        lines = [(rolling[t], t, dict(dash='dot', width=1)) for t in tickers]
+                        if "Portfolio" in rolling:
+                            lines.append((rolling["Portfolio"], "PORTFOLIO", dict(width=3, color='gold')))
+                        fig = line_figure(lines, title=f"Rolling {rolling_metric} ({window} bars)",
+                                          template="plotly_dark", hovermode="x unified")
+                        st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.error("Not enough assets with price data (at least 3 are needed).")
     else:
         st.warning("Please select at least 3 assets to comply with project rules.")
 
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+
+# Calendar schedules; "Tolerance Band" rebalances when a weight drifts too far instead
+FREQUENCIES = ["None", "Weekly", "Monthly", "Quarterly", "Yearly", "Tolerance Band"]
+DEFAULT_BAND = 0.05
+
+# Rows simulated per step while scanning for the next drift event (doubles up to the max)
+MIN_SCAN_ROWS = 64
+MAX_SCAN_ROWS = 4096
+
+
+def _period_key(index, rebalance_freq):
+    if rebalance_freq == "Weekly":
+        local = index.tz_localize(None) if index.tz is not None else index
+        days = local.values.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday: shift so that weeks run Monday to Sunday
+        return (days + 3) // 7
+    if rebalance_freq == "Monthly":
+        return np.asarray(index.year) * 12 + np.asarray(index.month)
+    if rebalance_freq == "Quarterly":
+        return np.asarray(index.year) * 4 + np.asarray(index.quarter)
+    if rebalance_freq == "Yearly":
+        return np.asarray(index.year)
+    return None
+
+
+def rebalance_mask(index, rebalance_freq, calendar=None):
+    """
+    Flags the dates on which positions are reset to the target weights
+    (first date of each new week/month/quarter/year, same rule as the original day loop).
+    With a calendar ("XPAR", "XNYS", ...) the rebalance happens on the first bar of the
+    first trading session of each period, so mixed stock/crypto panels never rebalance
+    while the exchange is closed.
+    """
+    mask = np.zeros(len(index), dtype=bool)
+    if len(index) < 2:
+        return mask
+    if calendar:
+        return _calendar_mask(index, rebalance_freq, calendar)
+    key = _period_key(index, rebalance_freq)
+    if key is None:
+        return mask
+    mask[1:] = key[1:] != key[:-1]
+    return mask
+
+
+def _calendar_mask(index, rebalance_freq, calendar):
+    import pandas_market_calendars as mcal
+    mask = np.zeros(len(index), dtype=bool)
+    sched = mcal.get_calendar(calendar).schedule(start_date=index[0].date(), end_date=index[-1].date())
+    if sched.empty:
+        return mask
+    sessions = pd.DatetimeIndex(sched.index)
+    key = _period_key(sessions, rebalance_freq)
+    if key is None:
+        return mask
+    # The first session opens a new period only if the panel started in an earlier one
+    start_key = _period_key(index[:1], rebalance_freq)[0]
+    first = np.concatenate(([key[0] != start_key], key[1:] != key[:-1]))
+    if index.tz is not None:
+        # Intraday: the first bar at or after the session open
+        targets = sched["market_open"][first].dt.tz_convert(index.tz)
+    else:
+        targets = sessions[first]
+    rows = np.unique(index.searchsorted(pd.DatetimeIndex(targets)))
+    mask[rows[(rows > 0) & (rows < len(index))]] = True
+    return mask
+
+
+def segment_bounds(mask):
+    """
+    Splits rows 1..T-1 into [start, end) segments that begin at each rebalance date.
+    """
+    n = len(mask)
+    if n < 2:
+        return []
+    starts = np.flatnonzero(mask[1:]) + 1
+    starts = np.concatenate(([1], starts[starts > 1]))
+    ends = np.append(starts[1:], n)
+    return list(zip(starts, ends))
+
+
+def simulate_rebalanced(returns, weights, mask, initial_value=100.0, positions=None, return_positions=False,
+                        stats=None):
+    """
+    Vectorized rebalancing: within each segment the positions grow with the cumulative
+    product of (1 + returns), so the portfolio value is a single matrix product.
+
+    returns: (T x N) array of simple returns (row 0 is ignored)
+    weights: (N,) target weights, or (K x N) to simulate K portfolios at once
+    positions: dollar positions at row 0, to continue a previous chunk (default initial_value * weights)
+    stats: a {"Rebalances", "Turnover"} dict (as simulate_events returns) to add this call's events to
+    Returns a (T,) array of values, or (T x K) for a weight matrix, plus the final
+    positions when return_positions is True.
+    """
+    returns = np.asarray(returns, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    values = np.empty((returns.shape[0],) + weights.shape[:-1])
+    if returns.shape[0] == 0:
+        return (values, positions) if return_positions else values
+    positions = initial_value * weights if positions is None else np.asarray(positions, dtype=float)
+    values[0] = positions.sum(axis=-1)
+    for start, end in segment_bounds(mask):
+        if mask[start]:
+            total = positions.sum(axis=-1, keepdims=True)
+            if stats is not None:
+                stats["Rebalances"] += 1
+                stats["Turnover"] += 0.5 * np.abs(positions / total - weights).sum(axis=-1)
+            positions = total * weights
+        growth = np.cumprod(1 + returns[start:end], axis=0)
+        values[start:end] = growth @ positions.T
+        positions = positions * growth[-1]
+    return (values, positions) if return_positions else values
+
+
+def simulate_events(returns, weights, mask=None, band=None, initial_value=100.0,
+                    min_rows=MIN_SCAN_ROWS, max_rows=MAX_SCAN_ROWS, state=None):
+    """
+    Path-dependent rebalancing kernel for one portfolio.
+
+    Scheduled rebalances come from `mask` (as in simulate_rebalanced); with `band`, the
+    portfolio is also rebalanced at the close of any bar where a weight has drifted more
+    than `band` (absolute, e.g. 0.05) from its target, taking effect from the next bar.
+    Between events the positions grow with a cumulative product over blocks of rows; the
+    block doubles while no event is found, so long calm stretches are skipped in a few
+    vectorized steps.
+
+    Returns (values, stats) where stats holds the number of rebalance events and the
+    one-way turnover (sum over events of half the absolute weight changes).
+
+    `state` (a dict, filled in on return) continues a previous call: row 0 of `returns`
+    and `mask` is then the last row already simulated, so appending k bars costs O(k).
+    """
+    returns = np.asarray(returns, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n_rows = returns.shape[0]
+    values = np.empty(n_rows)
+    resume = state is not None and "positions" in state
+    stats = dict(state["stats"]) if resume else {"Rebalances": 0, "Turnover": 0.0}
+    if n_rows == 0:
+        return values, stats
+    positions = state["positions"] if resume else initial_value * weights
+    values[0] = positions.sum()
+    scheduled = np.flatnonzero(mask[1:]) + 1 if mask is not None else np.empty(0, dtype=int)
+    next_event = 0
+    pending = state["pending"] if resume else False
+    rows = max_rows if band is None else min_rows
+
+    t = 1
+    while t < n_rows:
+        while next_event < len(scheduled) and scheduled[next_event] < t:
+            next_event += 1
+        if pending or (next_event < len(scheduled) and scheduled[next_event] == t):
+            total = positions.sum()
+            stats["Rebalances"] += 1
+            stats["Turnover"] += 0.5 * float(np.abs(positions / total - weights).sum())
+            positions = total * weights
+            pending = False
+            next_event += next_event < len(scheduled) and scheduled[next_event] == t
+
+        end = min(t + rows, n_rows)
+        if next_event < len(scheduled):
+            end = min(end, scheduled[next_event])
+        path = np.cumprod(1 + returns[t:end], axis=0) * positions
+        path_values = path.sum(axis=1)
+
+        if band is not None:
+            drift = np.abs(path / path_values[:, None] - weights).max(axis=1) > band
+            hit = np.flatnonzero(drift)
+            if len(hit):
+                end = t + hit[0] + 1
+                path, path_values = path[:hit[0] + 1], path_values[:hit[0] + 1]
+                pending = True
+                rows = min_rows
+            else:
+                rows = min(rows * 2, max_rows)
+
+        values[t:end] = path_values
+        positions = path[-1]
+        t = end
+    if state is not None:
+        state.update({"positions": positions, "pending": pending, "stats": dict(stats)})
+    return values, stats
+
+
+def simulate_rebalanced_loop(returns, weights_dict, rebalance_freq, band=None):
+    """
+    Reference day-by-day implementation (the original simulate_portfolio loop),
+    kept for equivalence checks and benchmarks.
+    """
+    portfolio_val = pd.Series(100.0, index=returns.index)
+    current_positions = {t: 100.0 * w for t, w in weights_dict.items()}
+    drifted = False
+
+    for i in range(1, len(returns.index)):
+        curr_date, prev_date = returns.index[i], returns.index[i-1]
+
+        rebalance = drifted
+        if rebalance_freq == "Weekly" and curr_date.isocalendar()[:2] != prev_date.isocalendar()[:2]: rebalance = True
+        elif rebalance_freq == "Monthly" and curr_date.month != prev_date.month: rebalance = True
+        elif rebalance_freq == "Quarterly" and curr_date.quarter != prev_date.quarter: rebalance = True
+        elif rebalance_freq == "Yearly" and curr_date.year != prev_date.year: rebalance = True
+
+        if rebalance:
+            total_current = sum(current_positions.values())
+            current_positions = {t: total_current * w for t, w in weights_dict.items()}
+
+        day_sum = 0
+        for t in weights_dict.keys():
+            current_positions[t] *= (1 + returns.at[curr_date, t])
+            day_sum += current_positions[t]
+        portfolio_val.at[curr_date] = day_sum
+        drifted = band is not None and any(abs(current_positions[t] / day_sum - w) > band for t, w in weights_dict.items())
+
+    return portfolio_val
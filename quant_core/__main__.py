@@ -0,0 +1,122 @@
+"""
+Headless command line for the engines (no streamlit/plotly imports):
+
+    python -m quant_core report [--configs cfg/ ...] [--workers N] [--timeout S]
+    python -m quant_core daemon [--configs cfg/ ...] [--every 300] [--runs N]
+    python -m quant_core backtest MC.PA --strategy "RSI Strategy" --params '{"rsi_period": 14}'
+    python -m quant_core backtest MC.PA --strategy "RSI Strategy" --period 5y --walk-forward [--train 252 --test 63]
+
+Engine modules are imported inside each command, so argument errors and --help
+return immediately.
+"""
+import os
+import sys
+import json
+import argparse
+
+
+def cmd_report(args):
+    from report_generator import generate_report
+    generate_report(args.configs, workers=args.workers, timeout=args.timeout, profile_log=args.profile)
+    return 0
+
+
+def cmd_daemon(args):
+    from report_daemon import ReportDaemon
+    ReportDaemon(args.configs, every=args.every, log_path=args.log, profile_log=args.profile).run(args.runs)
+    return 0
+
+
+def cmd_backtest(args):
+    from quant_a_single_asset.engine import fetch_asset_data, apply_strategy, compute_performance_metrics
+    from quant_core.intraday import periods_per_year
+
+    ticker = args.ticker.upper()
+    prices = fetch_asset_data(ticker, period=args.period, interval=args.interval)
+    if prices is None or prices.empty:
+        print(f"Error: no data found for {ticker}")
+        return 1
+    if args.walk_forward:
+        return walk_forward_report(args, ticker, prices)
+    params = json.loads(args.params) if args.params else {}
+    strategy = apply_strategy(prices, args.strategy, params)
+    metrics = compute_performance_metrics(strategy, periods_per_year(args.interval, [ticker]))
+
+    if args.json:
+        print(json.dumps({"ticker": ticker, "strategy": args.strategy, "params": params,
+                          "bars": len(prices), "metrics": metrics}))
+    else:
+        print(f"[{ticker}] {args.strategy} {params or ''} over {len(prices)} bars ({args.period}, {args.interval})")
+        print(f"Total Return: {metrics['Total Return']:.2%}")
+        print(f"Sharpe Ratio: {metrics['Sharpe Ratio']:.2f}")
+        print(f"Max Drawdown: {metrics['Max Drawdown']:.2%}")
+        print(f"Volatility: {metrics['Volatility']:.2%}")
+    return 0
+
+
+def walk_forward_report(args, ticker, prices):
+    """
+    Walk-forward splits of the strategy's default grid (--params is ignored: the grid is swept).
+    """
+    from quant_a_single_asset.walk_forward import walk_forward
+    from quant_core.intraday import periods_per_year
+
+    splits = walk_forward(prices, args.strategy, train=args.train, test=args.test,
+                          periods_per_year=periods_per_year(args.interval, [ticker]))
+    if splits.empty:
+        print(f"Error: {len(prices)} bars is not enough for one {args.train}/{args.test} train/test split")
+        return 1
+    if args.json:
+        print(splits.to_json(orient="records", date_format="iso"))
+    else:
+        print(f"[{ticker}] {args.strategy} walk-forward over {len(prices)} bars "
+              f"(train {args.train}, test {args.test})")
+        print(splits.to_string(index=False))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m quant_core", description="Headless quant engines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="Generate the daily report")
+    report.add_argument("--configs", nargs="+", help="Config files and/or directories of JSON configs")
+    report.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    report.add_argument("--timeout", type=float, default=None, help="Seconds before unfinished configs are reported as failed")
+    report.add_argument("--profile", default=os.environ.get("QUANT_PROFILE_LOG"),
+                        help="Append timing spans as JSON lines to this file")
+    report.set_defaults(func=cmd_report)
+
+    daemon = commands.add_parser("daemon", help="Keep the engines resident and rewrite the report on a schedule")
+    daemon.add_argument("--configs", nargs="+", help="Config files and/or directories of JSON configs")
+    daemon.add_argument("--every", type=float, default=300, help="Seconds between report runs")
+    daemon.add_argument("--runs", type=int, default=None, help="Stop after this many runs (default: run until interrupted)")
+    daemon.add_argument("--log", default=os.environ.get("QUANT_DAEMON_LOG", "report_daemon.jsonl"),
+                        help="Append per-run latency and memory as JSON lines to this file")
+    daemon.add_argument("--profile", default=os.environ.get("QUANT_PROFILE_LOG"),
+                        help="Append timing spans as JSON lines to this file")
+    daemon.set_defaults(func=cmd_daemon)
+
+    backtest = commands.add_parser("backtest", help="Backtest a single-asset strategy")
+    backtest.add_argument("ticker")
+    backtest.add_argument("--strategy", default="Buy and Hold",
+                          choices=["Buy and Hold", "Momentum (SMA Crossover)", "RSI Strategy", "Bollinger Bands"])
+    backtest.add_argument("--params", default=None, help="Strategy parameters as JSON")
+    backtest.add_argument("--period", default="1y")
+    backtest.add_argument("--interval", default="1d")
+    backtest.add_argument("--json", action="store_true", help="Print the result as JSON")
+    backtest.add_argument("--walk-forward", action="store_true",
+                          help="Sweep the parameter grid on rolling train windows and score it out of sample")
+    backtest.add_argument("--train", type=int, default=252, help="Train window in bars (walk-forward)")
+    backtest.add_argument("--test", type=int, default=63, help="Test window in bars (walk-forward)")
+    backtest.set_defaults(func=cmd_backtest)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import os
+import json
+import time
+import threading
+import pandas as pd
+
+from quant_core.providers import provider_from_env, period_start
+
+DEFAULT_STORE_DIR = os.environ.get("QUANT_PRICE_STORE", "price_store")
+
+
+class BarStore:
+    """
+    On-disk columnar (Parquet) store of closing prices, one file per ticker and interval.
+    Only the tail since the last stored bar is fetched from the provider, everything else is served locally.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR, provider=None, max_age=300):
+        self.root = root
+        self.provider = provider if provider is not None else provider_from_env()
+        # Seconds after which the last bar is considered stale and refetched
+        self.max_age = max_age
+        self.last_stats = {}
+        # Last fetch error per ticker ({"kind", "message", "attempts", "at"}), cleared once it returns data
+        self.errors = {}
+        # Series already read, keyed by (ticker, interval), valid while their file is unchanged
+        self._memory = {}
+        # Parsed _meta.json per interval, keyed like _memory by the file's (mtime, size)
+        self._meta_memory = {}
+        # The refresher thread and the session threads all update _meta.json
+        self._meta_lock = threading.Lock()
+
+    # --- File layout ---
+    def _dir(self, interval):
+        return os.path.join(self.root, interval)
+
+    def _path(self, ticker, interval):
+        return os.path.join(self._dir(interval), f"{ticker}.parquet")
+
+    def _meta_path(self, interval):
+        return os.path.join(self._dir(interval), "_meta.json")
+
+    @staticmethod
+    def _version(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read_meta(self, interval):
+        """
+        Returns a copy of _meta.json, parsed again only when the file changed.
+        """
+        path = self._meta_path(interval)
+        version = self._version(path)
+        if version is None:
+            return {}
+        cached = self._meta_memory.get(interval)
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
+        try:
+            with open(path, "r") as f:
+                meta = json.load(f)
+        except Exception as e:
+            print(f"Error reading store metadata: {e}")
+            return {}
+        self._meta_memory[interval] = (version, meta)
+        return dict(meta)
+
+    def _update_meta(self, interval, entries):
+        """
+        Merges the refreshed entries into _meta.json (re-read under the lock, so updates
+        of other threads are kept) and replaces the file atomically.
+        """
+        os.makedirs(self._dir(interval), exist_ok=True)
+        path = self._meta_path(interval)
+        with self._meta_lock:
+            meta = self._read_meta(interval)
+            for t, entry in entries.items():
+                current = meta.get(t, {})
+                merged = {**current, **entry}
+                # Another thread may have covered more history or refreshed later
+                if current.get("covered_from") and entry.get("covered_from"):
+                    merged["covered_from"] = min(current["covered_from"], entry["covered_from"],
+                                                 key=pd.Timestamp)
+                merged["refreshed_at"] = max(current.get("refreshed_at", 0), entry.get("refreshed_at", 0))
+                meta[t] = merged
+            tmp = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp, path)
+            self._meta_memory[interval] = (self._version(path), meta)
+
+    def read(self, ticker, interval="1d"):
+        """
+        Returns the stored close Series for a ticker (None if nothing is stored).
+        A long-running process reads each file once: later calls only stat it.
+        """
+        path = self._path(ticker, interval)
+        version = self._version(path)
+        if version is None:
+            return None
+        cached = self._memory.get((ticker, interval))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        series = _read_close(path, ticker)
+        self._memory[(ticker, interval)] = (version, series)
+        return series
+
+    def _write(self, ticker, interval, series):
+        os.makedirs(self._dir(interval), exist_ok=True)
+        path = self._path(ticker, interval)
+        tmp = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        series.rename("Close").to_frame().to_parquet(tmp)
+        os.replace(tmp, path)
+        # The series just written is what read() would return: no need to read it back
+        self._memory[(ticker, interval)] = (self._version(path), series.rename(ticker))
+
+    # --- Refresh ---
+    def _fetch_into(self, tickers, interval, start, stored, meta, now):
+        report = getattr(self.provider, "fetch_report", None)
+        if report is not None:
+            fetched, errors = report(tickers, interval=interval, start=start)
+        else:
+            fetched, errors = self.provider.fetch(tickers, interval=interval, start=start), {}
+        for t, error in errors.items():
+            self.errors[t] = {**error, "at": now}
+        for t in tickers:
+            new = fetched[t].dropna() if t in fetched.columns else pd.Series(dtype=float)
+            old = stored.get(t)
+            if old is not None and not new.empty:
+                # New bars override the stored ones (the last stored bar may have been partial)
+                merged = pd.concat([old[old.index < new.index[0]], new])
+            elif old is not None:
+                merged = old
+            else:
+                merged = new
+            if merged.empty:
+                continue
+            if t not in errors:
+                self.errors.pop(t, None)
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            self._write(t, interval, merged)
+            stored[t] = merged
+            # Copied: meta's entries may be shared with the parsed _meta.json kept in memory
+            entry = dict(meta.get(t, {}))
+            covered = entry.get("covered_from")
+            start_iso = _naive(start).isoformat()
+            if old is None or covered is None or pd.Timestamp(start_iso) < pd.Timestamp(covered):
+                entry["covered_from"] = start_iso
+            entry["refreshed_at"] = now
+            meta[t] = entry
+
+    def load(self, tickers, period="1y", interval="1d", max_age=None):
+        """
+        Returns a wide (date x ticker) frame of closes covering the period, refreshing only what is missing.
+        max_age overrides the store's staleness threshold for this call (0 always fetches the tail).
+        """
+        max_age = self.max_age if max_age is None else max_age
+        t0 = time.perf_counter()
+        tickers = list(tickers)
+        meta = self._read_meta(interval)
+        stored = {t: self.read(t, interval) for t in tickers}
+        read_s = time.perf_counter() - t0
+
+        now = time.time()
+        probe = next((s.index for s in stored.values() if s is not None and not s.empty), None)
+        start = period_start(period, probe)
+
+        # Tickers without data back to the requested start need a full download
+        missing = []
+        stale = []
+        for t in tickers:
+            entry = meta.get(t, {})
+            covered = entry.get("covered_from")
+            error = self.errors.get(t)
+            if stored[t] is None and error is not None and now - error["at"] <= max_age:
+                # Failed recently: not retried on every rerun
+                continue
+            if stored[t] is None or covered is None or pd.Timestamp(covered) > _naive(start):
+                missing.append(t)
+            elif now - entry.get("refreshed_at", 0) > max_age:
+                stale.append(t)
+
+        t1 = time.perf_counter()
+        if missing:
+            self._fetch_into(missing, interval, start, stored, meta, now)
+        if stale:
+            tail_start = min(stored[t].index[-1] for t in stale)
+            self._fetch_into(stale, interval, tail_start, stored, meta, now)
+        if missing or stale:
+            refreshed = [t for t in missing + stale if meta.get(t, {}).get("refreshed_at") == now]
+            self._update_meta(interval, {t: meta[t] for t in refreshed})
+        fetch_s = time.perf_counter() - t1
+
+        frames = {t: s for t, s in stored.items() if s is not None and not s.empty}
+        if not frames:
+            prices = pd.DataFrame(columns=tickers, dtype=float)
+        else:
+            prices = pd.DataFrame(frames).sort_index()
+            prices = prices.loc[prices.index >= _align_tz(start, prices.index)]
+        self.last_stats = {
+            "tickers": len(tickers),
+            "full_fetch": missing,
+            "tail_fetch": stale,
+            "errors": {t: self.errors[t] for t in missing + stale if t in self.errors},
+            "read_seconds": read_s,
+            "fetch_seconds": fetch_s,
+            "total_seconds": time.perf_counter() - t0,
+        }
+        return prices
+
+    def ticker_errors(self, tickers):
+        """
+        Last fetch errors of these tickers (kept until they return data again).
+        """
+        return {t: self.errors[t] for t in tickers if t in self.errors}
+
+
+def _read_close(path, ticker):
+    """
+    Close Series of a stored file, built straight from the Arrow columns: read_parquet
+    rebuilds the frame from its pandas metadata, which costs more than the read itself
+    for files this small.
+    """
+    import pyarrow.parquet as pq
+    table = pq.read_table(path, use_pandas_metadata=False)
+    index_name = next(n for n in table.column_names if n != "Close")
+    dates = table.column(index_name)
+    index = pd.DatetimeIndex(dates.to_numpy())
+    if getattr(dates.type, "tz", None):
+        index = index.tz_localize("UTC").tz_convert(dates.type.tz)
+    index.name = None if index_name.startswith("__index_level_") else index_name
+    return pd.Series(table.column("Close").to_numpy(), index=index, name=ticker)
+
+
+def _naive(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _align_tz(ts, index):
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is None:
+        return _naive(ts)
+    return ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+
+
+_default_store = None
+
+
+def get_default_store():
+    """
+    Returns the process-wide store used by the engines.
+    """
+    global _default_store
+    if _default_store is None:
+        _default_store = BarStore()
+    return _default_store
+
+
+def set_default_store(store):
+    """
+    Replaces the process-wide store (e.g. with one backed by a FixtureProvider).
+    """
+    global _default_store
+    _default_store = store
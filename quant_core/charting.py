@@ -0,0 +1,138 @@
+"""
+Rendering layer for long line charts (intraday or multi-year histories).
+
+Series longer than the pixel budget are decimated with LTTB (Largest Triangle Three
+Buckets, Steinarsson 2013), which keeps the visual shape; the global peak, the global
+low and the deepest drawdown (trough and the peak before it) are always kept. Figures
+switch to WebGL traces above WEBGL_THRESHOLD points and are cached on the content of
+their data, so an autorefresh with unchanged prices reuses the same figure (and sends
+the same payload) instead of rebuilding it.
+"""
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from quant_core.memo import content_hash
+
+# Points kept per trace (about the width of a full-screen chart)
+PIXEL_BUDGET = 2000
+
+# Average bucket size up to which LTTB runs on Python floats rather than NumPy slices
+SMALL_BUCKET = 32
+
+# Total points above which SVG traces get slow in the browser
+WEBGL_THRESHOLD = 20_000
+
+# Figures kept by line_figure, shared by all sessions (never mutate a returned figure)
+FIGURE_CACHE_ITEMS = 32
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def _x_values(index):
+    """
+    Numeric x positions of an index: nanoseconds since the first timestamp, positions otherwise.
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        ns = index.as_unit("ns").asi8
+        return (ns - ns[0]).astype(float)
+    return np.arange(len(index), dtype=float)
+
+
+def lttb_indices(y, n_out, x=None):
+    """
+    Positions of the n_out points selected by LTTB. The first and last points are always
+    kept; every bucket in between contributes the point forming the largest triangle with
+    the previously selected point and the average of the next bucket.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Average point of every bucket (the last "next bucket" is the final point)
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    # Triangle area with the previous point a and the next average, for each candidate j:
+    # |alpha * y_j + beta * x_j + gamma|
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    if n // n_out <= SMALL_BUCKET:
+        # Small buckets: plain Python floats beat per-bucket NumPy calls
+        xs, ys, bounds = x.tolist(), y.tolist(), edges.tolist()
+        next_x, next_y = avg_x.tolist(), avg_y.tolist()
+        for i in range(n_out - 2):
+            alpha, beta = xs[a] - next_x[i + 1], next_y[i + 1] - ys[a]
+            gamma = -alpha * ys[a] - beta * xs[a]
+            best = -1.0
+            for j in range(bounds[i], bounds[i + 1]):
+                area = abs(alpha * ys[j] + beta * xs[j] + gamma)
+                if area > best:
+                    best, a = area, j
+            selected[i + 1] = a
+    else:
+        for i in range(n_out - 2):
+            lo, hi = edges[i], edges[i + 1]
+            alpha, beta = x[a] - avg_x[i + 1], avg_y[i + 1] - y[a]
+            gamma = -alpha * y[a] - beta * x[a]
+            a = lo + int(np.argmax(np.abs(alpha * y[lo:hi] + beta * x[lo:hi] + gamma)))
+            selected[i + 1] = a
+    return selected
+
+
+def extreme_indices(y):
+    """
+    Positions of the global high and low, and of the deepest drawdown's peak and trough.
+    """
+    filled = pd.Series(np.asarray(y, dtype=float)).ffill().bfill().to_numpy()
+    if len(filled) == 0 or np.isnan(filled).all():
+        return np.array([], dtype=np.int64)
+    trough = int(np.argmin(filled / np.maximum.accumulate(filled)))
+    peak = int(np.argmax(filled[:trough + 1]))
+    return np.unique([int(np.argmax(filled)), int(np.argmin(filled)), peak, trough])
+
+
+def decimate(series, n_out=PIXEL_BUDGET):
+    """
+    The points of `series` to draw: LTTB selection plus the extremes (at most n_out + 4).
+    Short series are returned as they are.
+    """
+    if len(series) <= n_out:
+        return series
+    # Gaps would never win a bucket, their neighbours' values stand in for them
+    y = series.ffill().bfill().to_numpy(dtype=float)
+    keep = np.union1d(lttb_indices(y, n_out, _x_values(series.index)), extreme_indices(y))
+    return series.iloc[keep]
+
+
+def line_figure(lines, n_out=PIXEL_BUDGET, webgl_threshold=WEBGL_THRESHOLD, **layout):
+    """
+    Line chart of `lines`, a list of (series, name, line style dict) tuples, with each
+    series decimated to n_out points; `layout` goes to update_layout.
+    Cached on the content of the data, names, styles and layout.
+    """
+    key = content_hash([(s, name, style) for s, name, style in lines], n_out, webgl_threshold, layout)
+    with _figures_lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            return _figures[key]
+
+    drawn = [(decimate(s, n_out), name, style) for s, name, style in lines]
+    trace = go.Scattergl if sum(len(s) for s, _, _ in drawn) > webgl_threshold else go.Scatter
+    fig = go.Figure()
+    for s, name, style in drawn:
+        fig.add_trace(trace(x=s.index, y=s.to_numpy(), name=name, mode="lines", line=style))
+    fig.update_layout(**layout)
+
+    with _figures_lock:
+        _figures[key] = fig
+        while len(_figures) > FIGURE_CACHE_ITEMS:
+            _figures.popitem(last=False)
+    return fig
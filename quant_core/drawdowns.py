@@ -0,0 +1,195 @@
+"""
+Drawdown episodes of a whole (time x series) matrix, e.g. every asset plus the portfolio.
+
+An episode runs from a peak to the first bar back at that peak (the recovery). It is
+underwater in between and has its deepest point at the trough. All the episodes of all
+the columns come out of one vectorized pass: running peaks, then the runs of underwater
+bars (column-major), then one segmented minimum for the depths.
+
+    table = drawdown_episodes(frame)        # DataFrame, Series or (T x K) array
+    table.deepest(5)                        # the five deepest episodes overall
+    table.longest(5, asset="Portfolio")     # longest time underwater for one column
+    table.max_drawdown()                    # per column, as compute_performance_metrics
+
+The table is a set of flat arrays (one row per episode, grouped by column). Its depth
+and duration orders are sorted once when it is built, so queries only slice them.
+"""
+import numpy as np
+import pandas as pd
+from quant_core.memo import memoize
+
+
+def _ffill(x):
+    """
+    Forward-fills the NaNs of each column (a gap does not end an episode); leading NaNs stay.
+    Also returns, for each cell, the row its value comes from (the last non-NaN row).
+    """
+    rows = np.where(np.isnan(x), 0, np.arange(x.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return x[rows, np.arange(x.shape[1])], rows
+
+
+class DrawdownTable:
+    """
+    Episodes as parallel arrays: asset (column number), start (row of the peak), trough,
+    recovery (first row back at the peak, -1 while still underwater) and depth (trough
+    value over peak, minus 1).
+    """
+
+    def __init__(self, asset, start, trough, recovery, depth, n_rows, index=None, columns=None):
+        self.asset = asset
+        self.start = start
+        self.trough = trough
+        self.recovery = recovery
+        self.depth = depth
+        self.n_rows = n_rows
+        self.index = index if index is not None else pd.RangeIndex(n_rows)
+        self.columns = list(columns)
+        self.col = {c: j for j, c in enumerate(self.columns)}
+
+        # Bars from the peak to the recovery (to the last bar for ongoing episodes)
+        self.duration = np.where(recovery >= 0, recovery, n_rows - 1) - start
+        # Episodes are grouped by column: [bounds[j], bounds[j + 1]) are those of column j
+        self.bounds = np.searchsorted(asset, np.arange(len(self.columns) + 1))
+        # Query orders, overall and within each column's group
+        self._by_depth = np.argsort(depth, kind="stable")
+        self._by_duration = np.argsort(-self.duration, kind="stable")
+        self._col_by_depth = np.lexsort((depth, asset))
+        self._col_by_duration = np.lexsort((-self.duration, asset))
+
+    def __len__(self):
+        return len(self.depth)
+
+    @property
+    def nbytes(self):
+        arrays = [self.asset, self.start, self.trough, self.recovery, self.depth, self.duration,
+                  self._by_depth, self._by_duration, self._col_by_depth, self._col_by_duration]
+        return sum(a.nbytes for a in arrays)
+
+    def _top(self, overall, by_column, k, asset):
+        if asset is None:
+            return overall[:k]
+        j = self.col[asset]
+        lo, hi = self.bounds[j], self.bounds[j + 1]
+        return by_column[lo:min(lo + k, hi)]
+
+    # --- Queries ---
+    def deepest(self, k=5, asset=None):
+        """
+        The k deepest episodes (of one column, or overall).
+        """
+        return self.frame(self._top(self._by_depth, self._col_by_depth, k, asset))
+
+    def longest(self, k=5, asset=None):
+        """
+        The k episodes with the longest time from peak to recovery (ongoing ones count up
+        to the last bar).
+        """
+        return self.frame(self._top(self._by_duration, self._col_by_duration, k, asset))
+
+    def ongoing(self):
+        """
+        Episodes not recovered by the last bar (at most one per column).
+        """
+        return self.frame(np.flatnonzero(self.recovery < 0))
+
+    def episodes(self, asset=None):
+        """
+        Every episode in time order (of one column, or all of them grouped by column).
+        """
+        if asset is None:
+            return self.frame(np.arange(len(self)))
+        j = self.col[asset]
+        return self.frame(np.arange(self.bounds[j], self.bounds[j + 1]))
+
+    def max_drawdown(self):
+        """
+        Deepest drawdown per column (0 for a column never below its peak).
+        """
+        deepest = np.zeros(len(self.columns))
+        has = self.bounds[1:] > self.bounds[:-1]
+        deepest[has] = np.minimum.reduceat(self.depth, self.bounds[:-1][has]) if len(self) else []
+        return pd.Series(deepest, index=self.columns, name="Max Drawdown")
+
+    def frame(self, rows):
+        """
+        DataFrame of some episodes (rows of the table), with dates from the index.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        recovered = self.recovery[rows] >= 0
+        recovery = self.index[np.where(recovered, self.recovery[rows], 0)]
+        start, end = self.index[self.start[rows]], self.index[np.where(recovered, self.recovery[rows], self.n_rows - 1)]
+        df = pd.DataFrame({
+            "Asset": [self.columns[j] for j in self.asset[rows]],
+            "Peak": start,
+            "Trough": self.index[self.trough[rows]],
+            "Recovery": recovery.where(recovered) if isinstance(recovery, pd.DatetimeIndex) else np.where(recovered, recovery, -1),
+            "Depth": self.depth[rows],
+            "Bars": self.duration[rows],
+        })
+        if isinstance(self.index, pd.DatetimeIndex):
+            df["Duration"] = end - start
+        return df
+
+
+def drawdown_episodes(values, index=None, columns=None):
+    """
+    DrawdownTable of every column of `values` (DataFrame, Series or T x K array of prices
+    or portfolio values), in one pass over the matrix.
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_frame(name=values.name if values.name is not None else 0)
+    if isinstance(values, pd.DataFrame):
+        index = values.index if index is None else index
+        columns = list(values.columns) if columns is None else columns
+        values = values.to_numpy(dtype=float)
+    x = np.asarray(values, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    n_rows, n_cols = x.shape
+    columns = list(range(n_cols)) if columns is None else list(columns)
+
+    x, source = _ffill(x)
+    peak = np.fmax.accumulate(x, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = x / peak - 1
+    under = dd < 0
+
+    # Runs of underwater bars, column by column: +1 where one starts, -1 on its recovery row
+    # (n_rows for an episode still open at the end)
+    edges = np.diff(under.T.astype(np.int8), axis=1, prepend=0, append=0)
+    asset, first = np.nonzero(edges == 1)
+    recovery = np.nonzero(edges == -1)[1]
+
+    # Depth: segmented minimum of the column-major drawdowns. Each segment runs to the next
+    # episode's first bar, but whatever lies between two episodes is 0 or NaN
+    flat = dd.T.ravel()
+    seg_starts = asset * n_rows + first
+    if len(seg_starts):
+        depth = np.fmin.reduceat(flat, seg_starts)
+        # Trough: first underwater bar of each episode equal to its minimum (the underwater
+        # bars are exactly the episodes' runs, one after the other)
+        pos = np.flatnonzero(under.T.ravel())
+        seg = np.repeat(np.arange(len(seg_starts)), recovery - first)
+        hit = np.flatnonzero(flat[pos] == depth[seg])
+        first_hit = hit[np.searchsorted(seg[hit], np.arange(len(seg_starts)))]
+        trough = pos[first_hit] - asset * n_rows
+    else:
+        depth = np.empty(0)
+        trough = np.empty(0, dtype=np.int64)
+
+    return DrawdownTable(
+        asset=asset.astype(np.int32),
+        # The bar before the first underwater one may be a filled gap: the peak is the
+        # real bar its value comes from
+        start=source[first - 1, asset].astype(np.int32),
+        trough=trough.astype(np.int32),
+        recovery=np.where(recovery < n_rows, recovery, -1).astype(np.int32),
+        depth=depth,
+        n_rows=n_rows,
+        index=index,
+        columns=columns,
+    )
+
+
+cached_drawdown_episodes = memoize("drawdown_episodes", version=2)(drawdown_episodes)
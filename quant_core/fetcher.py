@@ -0,0 +1,180 @@
+"""
+Concurrent fetch layer wrapped around a price provider.
+
+Tickers are downloaded in batches on a small thread pool (at most max_concurrency requests
+in flight, spaced by min_interval seconds; a provider that is not thread-safe caps this
+with its own max_concurrency). A request that raises or exceeds the timeout is retried
+with exponential backoff; a batch that still fails is split into single tickers, so one
+bad symbol (delisted coins are common in the crypto list) only costs its own column.
+Retries and splits share one time budget per fetch, after which the remaining tickers
+are reported as timed out.
+
+    fetcher = ConcurrentFetcher(YahooProvider())
+    prices, errors = fetcher.fetch_report(tickers, interval="1d", start=start)
+    # errors: {ticker: {"kind": "error" | "timeout" | "no_data", "message": ..., "attempts": n}}
+
+It keeps the provider interface (fetch returns the frame only), so BarStore can use it in
+place of the provider it wraps.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+# Tickers per request
+BATCH_SIZE = 10
+
+# Requests in flight at once
+MAX_CONCURRENCY = 4
+
+# Extra attempts after a failed request, waiting BACKOFF_SECONDS * 2**attempt in between
+RETRIES = 2
+BACKOFF_SECONDS = 0.5
+
+# Seconds before a request is abandoned (per batch, hence per ticker once a batch is split)
+TIMEOUT_SECONDS = 30
+
+# Seconds for a whole fetch, retries and splits included
+TOTAL_TIMEOUT_SECONDS = 60
+
+
+class FetchTimeout(Exception):
+    pass
+
+
+class _Call:
+    """
+    fn() running in a daemon thread. A request that hangs is not started again: the next
+    attempt waits for the same call, so at most one download per request runs at a time.
+    """
+
+    def __init__(self, fn):
+        self.outcome = {}
+        self.thread = threading.Thread(target=self._run, args=(fn,), name="price-fetch", daemon=True)
+        self.thread.start()
+
+    def _run(self, fn):
+        try:
+            self.outcome["value"] = fn()
+        except Exception as e:
+            self.outcome["error"] = e
+
+    @property
+    def running(self):
+        return self.thread.is_alive()
+
+    def result(self, timeout):
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            raise FetchTimeout(f"no response after {timeout:.0f}s")
+        if "error" in self.outcome:
+            raise self.outcome["error"]
+        return self.outcome["value"]
+
+
+def _error(kind, message, attempts):
+    return {"kind": kind, "message": message, "attempts": attempts}
+
+
+class ConcurrentFetcher:
+    """
+    Provider wrapper downloading in concurrent batches, with retries and per-ticker errors.
+    """
+
+    def __init__(self, provider, batch_size=BATCH_SIZE, max_concurrency=MAX_CONCURRENCY, retries=RETRIES,
+                 backoff=BACKOFF_SECONDS, timeout=TIMEOUT_SECONDS, total_timeout=TOTAL_TIMEOUT_SECONDS,
+                 min_interval=0.0):
+        self.provider = provider
+        self.name = getattr(provider, "name", "provider")
+        self.batch_size = max(1, batch_size)
+        # Providers that are not thread-safe (yfinance) set their own limit
+        self.max_concurrency = max(1, min(max_concurrency, getattr(provider, "max_concurrency", max_concurrency)))
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.total_timeout = total_timeout
+        # Seconds between the starts of two requests (rate limit shared by all workers)
+        self.min_interval = min_interval
+        self._next_start = 0.0
+        self._rate_lock = threading.Lock()
+
+    def _wait_turn(self):
+        if self.min_interval <= 0:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def _request(self, tickers, interval, start, period, deadline):
+        """
+        One batch with retries. Returns (frame, None) or (None, error dict).
+        """
+        error, call = None, None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(min(self.backoff * 2 ** (attempt - 1), max(0.0, deadline - time.monotonic())))
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, error or _error("timeout", f"fetch budget of {self.total_timeout}s used up", attempt)
+            if call is None or not call.running:
+                self._wait_turn()
+                call = _Call(lambda: self.provider.fetch(tickers, interval=interval, start=start, period=period))
+            try:
+                return call.result(remaining if self.timeout is None else min(self.timeout, remaining)), None
+            except FetchTimeout as e:
+                error = _error("timeout", str(e), attempt + 1)
+            except Exception as e:
+                error = _error("error", f"{type(e).__name__}: {e}", attempt + 1)
+        return None, error
+
+    def _fetch_batch(self, tickers, interval, start, period, deadline):
+        """
+        Returns ({ticker: Series}, {ticker: error}) for one batch, splitting it when it fails.
+        """
+        frame, error = self._request(tickers, interval, start, period, deadline)
+        if frame is None:
+            if len(tickers) == 1 or time.monotonic() >= deadline:
+                return {}, {t: error for t in tickers}
+            series, errors = {}, {}
+            for t in tickers:
+                s, e = self._fetch_batch([t], interval, start, period, deadline)
+                series.update(s)
+                errors.update(e)
+            return series, errors
+
+        series, errors = {}, {}
+        for t in tickers:
+            s = frame[t].dropna() if t in frame.columns else None
+            if s is None or s.empty:
+                errors[t] = _error("no_data", "no bars returned (delisted or unknown symbol?)", 1)
+            else:
+                series[t] = s
+        return series, errors
+
+    def fetch_report(self, tickers, interval="1d", start=None, period=None):
+        """
+        Returns (wide close frame of the tickers that returned data, {ticker: error}).
+        """
+        tickers = list(dict.fromkeys(tickers))
+        batches = [tickers[i:i + self.batch_size] for i in range(0, len(tickers), self.batch_size)]
+        series, errors = {}, {}
+        deadline = time.monotonic() + (self.total_timeout if self.total_timeout is not None else float("inf"))
+        if len(batches) == 1 or self.max_concurrency == 1:
+            results = [self._fetch_batch(b, interval, start, period, deadline) for b in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                results = list(pool.map(lambda b: self._fetch_batch(b, interval, start, period, deadline), batches))
+        for s, e in results:
+            series.update(s)
+            errors.update(e)
+
+        ok = [t for t in tickers if t in series]
+        if not ok:
+            return pd.DataFrame(columns=tickers, dtype=float), errors
+        return pd.DataFrame({t: series[t] for t in ok}).sort_index(), errors
+
+    def fetch(self, tickers, interval="1d", start=None, period=None):
+        return self.fetch_report(tickers, interval=interval, start=start, period=period)[0]
@@ -0,0 +1,299 @@
+import os
+import sys
+import pickle
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from quant_core.profiling import span, note_cache
+
+DEFAULT_MEMO_DIR = os.environ.get("QUANT_MEMO_DIR", ".memo_cache")
+
+
+def _feed(h, obj):
+    """
+    Feeds a stable byte representation of obj into the hash.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(type(obj).__name__.encode())
+        h.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Index):
+        h.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(str((obj.dtype, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for k in sorted(obj, key=repr):
+            _feed(h, k)
+            _feed(h, obj[k])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _feed(h, item)
+        h.update(b"]")
+    elif isinstance(obj, (float, np.floating)):
+        h.update(repr(float(obj)).encode())
+    elif isinstance(obj, (int, np.integer)) and not isinstance(obj, bool):
+        h.update(repr(int(obj)).encode())
+    else:
+        h.update(repr(obj).encode())
+    h.update(b"|")
+
+
+def content_hash(*objs):
+    """
+    Hash of the content of price panels, arrays and plain configs (dicts, lists, scalars).
+    """
+    h = hashlib.sha256()
+    for obj in objs:
+        _feed(h, obj)
+    return h.hexdigest()
+
+
+def _nbytes(obj):
+    """
+    Approximate memory held by a cached value (arrays, frames, containers of them).
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True))
+    if isinstance(obj, pd.Index):
+        return int(obj.memory_usage())
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_nbytes(k) + _nbytes(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_nbytes(item) for item in obj)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, (int, np.integer)):
+        return int(nbytes)
+    return sys.getsizeof(obj)
+
+
+class Memo:
+    """
+    Two-tier memoization: an in-memory LRU of recent results backed by a size-bounded
+    LRU directory of pickles, shared by the dashboards and the report generator.
+    The memory tier is bounded by both an item count and a byte budget.
+    Cached objects are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_MEMO_DIR, max_memory_items=256, max_disk_bytes=256 * 1024 * 1024,
+                 max_memory_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._sizes = {}
+        self._memory_bytes = 0
+        # Bytes of pickles in cache_dir: scanned once, then kept up to date by put()
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"memory_hits": self.hits_memory, "disk_hits": self.hits_disk, "misses": self.misses,
+                    "memory_items": len(self._memory), "memory_bytes": self._memory_bytes}
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _remember(self, key, value):
+        size = _nbytes(value)
+        with self._lock:
+            if size > self.max_memory_bytes:
+                # Larger than the whole budget: only kept on disk
+                return
+            self._memory_bytes += size - self._sizes.get(key, 0)
+            self._memory[key] = value
+            self._sizes[key] = size
+            self._memory.move_to_end(key)
+            while self._memory and (len(self._memory) > self.max_memory_items
+                                    or self._memory_bytes > self.max_memory_bytes):
+                old, _ = self._memory.popitem(last=False)
+                self._memory_bytes -= self._sizes.pop(old)
+
+    def get(self, key):
+        """
+        Returns (found, value), looking in memory first and then on disk.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return True, self._memory[key]
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+                os.utime(path)  # Refresh its LRU position
+                with self._lock:
+                    self.hits_disk += 1
+                self._remember(key, value)
+                return True, value
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error reading memo entry: {e}")
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def contains(self, key):
+        """
+        True when key is cached in memory or on disk (its value is then the one any put
+        would write: keys are content hashes of the inputs).
+        """
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.cache_dir) and os.path.exists(self._path(key))
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(key)
+            tmp = path + f".{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tmp)
+            with self._disk_lock:
+                try:
+                    replaced = os.path.getsize(path)
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp, path)
+                if self._disk_bytes is None:
+                    self._disk_bytes = self._scan()[1]
+                else:
+                    self._disk_bytes += size - replaced
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict()
+        except Exception as e:
+            print(f"Error writing memo entry: {e}")
+
+    def _scan(self):
+        """
+        (entries, total bytes) of the pickles in cache_dir; entries are (mtime, size, name).
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        return entries, sum(e[1] for e in entries)
+
+    def _evict(self):
+        # Only over budget: rescan (other processes share the directory) and drop the oldest
+        entries, total = self._scan()
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                total -= size
+            except FileNotFoundError:
+                total -= size
+        self._disk_bytes = total
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._sizes.clear()
+            self._memory_bytes = 0
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            with self._disk_lock:
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".pkl"):
+                        os.remove(os.path.join(self.cache_dir, name))
+                self._disk_bytes = 0
+
+
+_default_memo = None
+
+
+def get_memo():
+    """
+    Returns the process-wide memo used by the cached engine functions.
+    """
+    global _default_memo
+    if _default_memo is None:
+        _default_memo = Memo()
+    return _default_memo
+
+
+def set_memo(memo):
+    global _default_memo
+    _default_memo = memo
+
+
+def memoize(namespace, version=1):
+    """
+    Decorator caching a function on the content hash of its arguments.
+    Bump `version` when the function's output changes, so stale disk entries are ignored.
+    The wrapper also exposes .key(...) and .store(value, ...) so results computed by
+    another path (e.g. an incremental backtest) can be published under the same key.
+    """
+    prefix = namespace if version == 1 else f"{namespace}.v{version}"
+
+    def decorator(fn):
+        def key(*args, **kwargs):
+            return prefix + "-" + content_hash(args, kwargs)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Each memoized call is a profiling span (sized on its first argument)
+            with span(namespace) as s:
+                if args:
+                    s.record(args[0])
+                memo = get_memo()
+                k = key(*args, **kwargs)
+                found, value = memo.get(k)
+                note_cache(found)
+                if found:
+                    return value
+                value = fn(*args, **kwargs)
+                memo.put(k, value)
+                return value
+
+        def store(value, *args, **kwargs):
+            """
+            Publishes value under the key of these arguments. Returns False (and writes
+            nothing) when that key is already cached.
+            """
+            memo, k = get_memo(), key(*args, **kwargs)
+            if memo.contains(k):
+                return False
+            memo.put(k, value)
+            return True
+
+        wrapper.key = key
+        wrapper.store = store
+        return wrapper
+    return decorator
+
+
+def memo_stats():
+    """
+    Hit/miss counters of the process-wide memo.
+    """
+    return get_memo().stats()
@@ -0,0 +1,231 @@
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from quant_core.bar_store import get_default_store
+
+# Panels kept by get_panel (served until the store would refresh them)
+PANEL_CACHE_ITEMS = 8
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+class PriceStore:
+    """
+    Aligned price panel shared by the modules: float64 closes (T x N, column-major) on the
+    union calendar of the tickers, a ticker -> column map and a validity mask (True where
+    the asset actually has a bar; crypto trades on days the stocks do not).
+
+    Arrays are read-only and handed out without copies: column(), frame() over all columns
+    and window() are views. The gap-filled and normalized (base 100) arrays are only
+    computed when first asked for.
+    """
+
+    def __init__(self, values, index, columns, valid=None, parent=None):
+        self.values = _read_only(values)
+        self.index = index
+        self.columns = list(columns)
+        self.col = {t: j for j, t in enumerate(self.columns)}
+        self.valid = _read_only(~np.isnan(values) if valid is None else valid)
+        # (panel, rows) this one is a window of: its filled values are a slice of the parent's
+        self._parent = parent
+        self._filled = None
+        self._normalized = None
+
+    @classmethod
+    def from_frame(cls, prices):
+        """
+        Panel of a wide (date x ticker) frame of closes, such as BarStore.load returns.
+        Rows where no ticker traded are dropped, and so are tickers without any bar (they
+        are not `in` the panel).
+        """
+        prices = prices.dropna(how="all").dropna(axis=1, how="all")
+        return cls(np.asfortranarray(prices.to_numpy(dtype=float)), prices.index, prices.columns)
+
+    @classmethod
+    def load(cls, tickers, period="1y", interval="1d", store=None):
+        store = store if store is not None else get_default_store()
+        return cls.from_frame(store.load(list(tickers), period=period, interval=interval))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, ticker):
+        return ticker in self.col
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def empty(self):
+        return len(self.index) == 0 or not self.columns
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.valid.nbytes
+
+    # --- Lazy derived arrays ---
+    @property
+    def filled(self):
+        """
+        Closes with gaps filled forward, then backward for the first rows (as the portfolio
+        module always did), so every asset has a price on every bar of the union calendar.
+        """
+        if self._filled is None:
+            if self._parent is not None:
+                panel, rows = self._parent
+                self._filled = panel.filled[rows]
+            else:
+                filled = pd.DataFrame(self.values).ffill().bfill().to_numpy()
+                self._filled = _read_only(np.asfortranarray(filled))
+        return self._filled
+
+    @property
+    def normalized(self):
+        """
+        Filled closes rebased to 100 on the first bar.
+        """
+        if self._normalized is None:
+            filled = self.filled
+            self._normalized = _read_only(np.asfortranarray(filled / filled[0] * 100))
+        return self._normalized
+
+    def _array(self, kind):
+        if kind == "raw":
+            return self.values
+        if kind == "filled":
+            return self.filled
+        if kind == "normalized":
+            return self.normalized
+        raise ValueError(f"Unknown panel values: {kind}")
+
+    # --- Views ---
+    def column(self, ticker, kind="filled"):
+        """
+        One ticker on the union calendar, as a Series viewing the panel ("raw", "filled"
+        or "normalized").
+        """
+        return pd.Series(self._array(kind)[:, self.col[ticker]], index=self.index, name=ticker, copy=False)
+
+    def asset(self, ticker):
+        """
+        One ticker on its own calendar (only the bars it traded), as the single-asset
+        module expects. This selection is a copy.
+        """
+        j = self.col[ticker]
+        rows = self.valid[:, j]
+        return pd.Series(self.values[rows, j], index=self.index[rows], name=ticker)
+
+    def frame(self, kind="filled", tickers=None):
+        """
+        DataFrame of the panel (or of some tickers, which takes a copy of those columns).
+        """
+        array = self._array(kind)
+        if tickers is None or list(tickers) == self.columns:
+            return pd.DataFrame(array, index=self.index, columns=self.columns, copy=False)
+        cols = [self.col[t] for t in tickers]
+        return pd.DataFrame(array[:, cols], index=self.index, columns=list(tickers))
+
+    def window(self, start=None, end=None):
+        """
+        Panel restricted to start <= date <= end, sharing the arrays of this one (gaps at
+        its start are filled from the bars before it). Its normalized view is rebased on
+        its own first bar.
+        """
+        lo = 0 if start is None else self.index.searchsorted(_align(start, self.index), side="left")
+        hi = len(self.index) if end is None else self.index.searchsorted(_align(end, self.index), side="right")
+        rows = slice(lo, hi)
+        return PriceStore(self.values[rows], self.index[rows], self.columns, self.valid[rows], parent=(self, rows))
+
+    def subset(self, tickers):
+        """
+        Panel of some tickers (copied once), on the union calendar of those tickers only.
+        """
+        cols = [self.col[t] for t in tickers]
+        rows = self.valid[:, cols].any(axis=1)
+        return PriceStore(np.asfortranarray(self.values[rows][:, cols]), self.index[rows], tickers,
+                          np.asfortranarray(self.valid[rows][:, cols]))
+
+
+def _align(ts, index):
+    ts = pd.Timestamp(ts)
+    tz = getattr(index, "tz", None)
+    if tz is None:
+        return ts.tz_localize(None) if ts.tzinfo is not None else ts
+    return ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+
+
+_panels = OrderedDict()
+_panels_lock = threading.Lock()
+
+# Snapshots published by the background refresher: (root, period, interval) -> (version, published_at, panel).
+# Entries are replaced, never modified, so readers need no lock.
+_published = {}
+
+
+def publish_panel(panel, period="1y", interval="1d", version=0, root=None):
+    """
+    Makes `panel` the shared snapshot for (period, interval), served by get_panel to every
+    session while it is fresh.
+    """
+    root = root if root is not None else get_default_store().root
+    _published[(root, period, interval)] = (version, time.time(), panel)
+
+
+def published_snapshot(tickers, period="1y", interval="1d"):
+    """
+    (version, panel) of the fresh published snapshot covering these tickers, or None.
+    """
+    store = get_default_store()
+    entry = _published.get((store.root, period, interval))
+    if entry is None:
+        return None
+    version, published_at, panel = entry
+    if time.time() - published_at > store.max_age or not set(tickers) <= set(panel.columns):
+        return None
+    return version, panel
+
+
+def get_panel(tickers, period="1y", interval="1d"):
+    """
+    Shared panel for these tickers. The refresher's snapshot, or a panel already loaded for
+    the same period and interval that covers them (e.g. the screener's universe), is reused
+    while the store considers it fresh, so the modules and the report do not each reload and
+    realign the same closes.
+    """
+    tickers = list(tickers)
+    snapshot = published_snapshot(tickers, period, interval)
+    if snapshot is not None:
+        panel = snapshot[1]
+        return panel if tickers == panel.columns else panel.subset(tickers)
+    store = get_default_store()
+    now = time.time()
+    with _panels_lock:
+        for (root, p, i, cols), (loaded_at, panel) in reversed(_panels.items()):
+            if (root, p, i) == (store.root, period, interval) and now - loaded_at <= store.max_age \
+                    and set(tickers) <= set(cols):
+                return panel if tickers == panel.columns else panel.subset(tickers)
+    panel = PriceStore.load(tickers, period, interval, store)
+    with _panels_lock:
+        # Keyed on the columns actually loaded (tickers without data are not covered)
+        _panels[(store.root, period, interval, tuple(panel.columns))] = (now, panel)
+        while len(_panels) > PANEL_CACHE_ITEMS:
+            _panels.popitem(last=False)
+    return panel
+
+
+def clear_panels():
+    with _panels_lock:
+        _panels.clear()
+
+
+def fetch_errors(tickers):
+    """
+    Why tickers are missing from their panel: the store's last fetch error for each.
+    """
+    return get_default_store().ticker_errors(tickers)
@@ -0,0 +1,209 @@
+"""
+Lightweight timing spans around the fetch, compute and render stages.
+
+    profiler = start_profiler("quant_b")
+    with span("fetch_portfolio_data", "fetch") as s:
+        prices = ...
+        s.record(prices)              # rows / cols of the result
+    finish_profiler(profiler)         # exports JSON lines if a log path is set
+
+Memoized engine calls open their own span and mark it as a cache hit or miss.
+Profilers are per thread (one per Streamlit session rerun); when none is active, or
+it is disabled, span() returns a shared no-op object.
+"""
+import os
+import json
+import time
+import threading
+import pandas as pd
+
+# JSON lines destination; setting it enables profiling of every run
+PROFILE_LOG = os.environ.get("QUANT_PROFILE_LOG")
+
+STAGES = ["fetch", "compute", "render"]
+
+_local = threading.local()
+
+
+def _shape(obj):
+    """
+    (rows, cols) of a price panel, series or array result; (None, None) otherwise.
+    """
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    shape = getattr(obj, "shape", None)
+    if not shape:
+        return None, None
+    return int(shape[0]), int(shape[1]) if len(shape) > 1 else 1
+
+
+class Span:
+    def __init__(self, profiler, name, stage):
+        self.profiler = profiler
+        self.name = name
+        self.stage = stage
+        self.rows = None
+        self.cols = None
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, obj):
+        """
+        Stores the shape of obj (typically the prices or the result) and returns obj.
+        """
+        self.rows, self.cols = _shape(obj)
+        return obj
+
+    def __enter__(self):
+        self.depth = len(self.profiler.stack)
+        self.profiler.stack.append(self)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.t0
+        self.profiler.stack.pop()
+        if self.hits or self.misses:
+            cache = "hit" if not self.misses else "miss" if not self.hits else "partial"
+        else:
+            cache = None
+        self.profiler.spans.append({
+            "run": self.profiler.run,
+            "name": self.name,
+            "stage": self.stage,
+            "start": self.t0 - self.profiler.t0,
+            "seconds": seconds,
+            "depth": self.depth,
+            "rows": self.rows,
+            "cols": self.cols,
+            "cache": cache,
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+class _NullSpan:
+    """
+    Shared stand-in used when profiling is off.
+    """
+    def record(self, obj):
+        return obj
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Collects the spans of one run (a dashboard rerun, a report job).
+    """
+
+    def __init__(self, run="", enabled=True, log_path=PROFILE_LOG):
+        self.run = run
+        self.enabled = enabled
+        self.log_path = log_path
+        self.spans = []
+        self.stack = []
+        self.t0 = time.perf_counter()
+        self.timestamp = time.time()
+
+    def span(self, name, stage="compute"):
+        return Span(self, name, stage) if self.enabled else _NULL_SPAN
+
+    def extend(self, spans, timestamp=None):
+        """
+        Adds spans recorded elsewhere (e.g. by a report worker process); `timestamp` is
+        that profiler's creation time, used to put its spans on this run's timeline.
+        """
+        offset = 0.0 if timestamp is None else timestamp - self.timestamp
+        self.spans.extend({**s, "run": self.run or s["run"], "start": s["start"] + offset} for s in spans)
+
+    def frame(self):
+        """
+        Spans in start order; nested spans (depth > 0) are part of their parent's time.
+        """
+        columns = ["run", "name", "stage", "start", "seconds", "depth", "rows", "cols", "cache", "error"]
+        df = pd.DataFrame(self.spans, columns=columns)
+        return df.sort_values("start", kind="stable").reset_index(drop=True)
+
+    def totals(self):
+        """
+        Seconds per stage, top-level spans only.
+        """
+        top = [s for s in self.spans if s["depth"] == 0]
+        return {stage: sum(s["seconds"] for s in top if s["stage"] == stage) for stage in STAGES}
+
+    def export(self, path=None):
+        """
+        Appends the spans as JSON lines (one object per span).
+        """
+        path = path or self.log_path
+        if not path or not self.spans:
+            return False
+        try:
+            with open(path, "a") as f:
+                for s in sorted(self.spans, key=lambda s: s["start"]):
+                    f.write(json.dumps({"ts": self.timestamp, "pid": os.getpid(), **s}) + "\n")
+            return True
+        except Exception as e:
+            print(f"Error writing profile: {e}")
+            return False
+
+
+def get_profiler():
+    """
+    The profiler active in this thread, if any.
+    """
+    return getattr(_local, "profiler", None)
+
+
+def set_profiler(profiler):
+    _local.profiler = profiler
+
+
+def start_profiler(run="", enabled=None, log_path=PROFILE_LOG):
+    """
+    Activates a new profiler for this thread. Enabled when asked to or when a log path is set.
+    """
+    profiler = Profiler(run, enabled=bool(enabled or log_path), log_path=log_path)
+    set_profiler(profiler)
+    return profiler
+
+
+def finish_profiler(profiler):
+    """
+    Deactivates the profiler and exports its spans if it has a log path.
+    """
+    if get_profiler() is profiler:
+        set_profiler(None)
+    if profiler.enabled:
+        profiler.export()
+    return profiler
+
+
+def span(name, stage="compute"):
+    """
+    Context manager timing a block in the active profiler (no-op without one).
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is None or not profiler.enabled:
+        return _NULL_SPAN
+    return Span(profiler, name, stage)
+
+
+def note_cache(found):
+    """
+    Marks the innermost open span as a cache hit or miss.
+    """
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None and profiler.stack:
+        if found:
+            profiler.stack[-1].hits += 1
+        else:
+            profiler.stack[-1].misses += 1
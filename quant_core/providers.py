@@ -0,0 +1,159 @@
+import os
+import time
+import pandas as pd
+from quant_core.fetcher import ConcurrentFetcher
+
+
+# Yahoo only serves recent intraday history (days back), and 1m bars in requests of at most 8 days
+INTRADAY_HISTORY_DAYS = {"1m": 29, "2m": 59, "5m": 59, "15m": 59, "30m": 59, "60m": 729, "1h": 729, "90m": 59}
+REQUEST_WINDOW_DAYS = {"1m": 7}
+
+
+# Seconds yfinance waits on each HTTP request, so a stuck download ends on its own
+# (well within the fetch layer's per-request timeout)
+REQUEST_TIMEOUT_SECONDS = 10
+
+
+class YahooProvider:
+    """
+    Downloads adjusted closes from Yahoo Finance.
+
+    Each ticker goes through its own yf.Ticker(...).history() call, which keeps no
+    module-level state (unlike yf.download in older yfinance releases), so the fetch
+    layer can run several batches at once.
+    """
+    name = "yahoo"
+
+    def __init__(self, timeout=REQUEST_TIMEOUT_SECONDS):
+        self.timeout = timeout
+
+    def fetch(self, tickers, interval="1d", start=None, period=None):
+        # Imported on the first download only: yfinance alone takes ~0.3s to import
+        import yfinance as yf
+        if interval in INTRADAY_HISTORY_DAYS:
+            return self._fetch_intraday(yf, tickers, interval, start, period)
+        if start is not None:
+            return self._history(yf, tickers, interval, start=start)
+        return self._history(yf, tickers, interval, period=period or "1y")
+
+    def _history(self, yf, tickers, interval, **window):
+        """
+        Wide (date x ticker) frame of closes, one request per ticker. Daily bars are indexed
+        by naive dates (the exchanges' time zones differ), intraday bars in UTC.
+        """
+        closes = {}
+        for t in tickers:
+            data = yf.Ticker(t).history(interval=interval, auto_adjust=True, timeout=self.timeout, **window)
+            if data is None or data.empty:
+                continue
+            close = data['Close']
+            if close.index.tz is not None:
+                close.index = (close.index.tz_convert("UTC") if interval in INTRADAY_HISTORY_DAYS
+                               else close.index.tz_localize(None))
+            closes[t] = close
+        if not closes:
+            return pd.DataFrame(columns=list(tickers), dtype=float)
+        return pd.DataFrame(closes).sort_index()
+
+    def _fetch_intraday(self, yf, tickers, interval, start, period):
+        """
+        Intraday bars: the start is clamped to Yahoo's retention and 1m history
+        is downloaded in consecutive windows.
+        """
+        now = pd.Timestamp.now(tz="UTC")
+        earliest = now - pd.Timedelta(days=INTRADAY_HISTORY_DAYS[interval])
+        start = period_start(period or "1mo", now=now) if start is None else pd.Timestamp(start)
+        start = max(start if start.tz is not None else start.tz_localize("UTC"), earliest)
+        step = pd.Timedelta(days=REQUEST_WINDOW_DAYS.get(interval, INTRADAY_HISTORY_DAYS[interval] + 1))
+
+        frames = []
+        while start < now:
+            end = min(start + step, now)
+            frames.append(self._history(yf, tickers, interval, start=start, end=end))
+            start = end
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=list(tickers), dtype=float)
+        close = pd.concat(frames)
+        return close[~close.index.duplicated(keep="last")].sort_index()
+
+
+class FixtureProvider:
+    """
+    Serves closes from local data, standing in for Yahoo in tests and offline runs.
+    Accepts a wide DataFrame (date x ticker) or a dict of {ticker: Series}.
+    `latency` (seconds per request) and `failures` ({ticker: number of requests including it
+    that raise}) simulate a slow or flaky network for the fetch layer.
+    """
+    name = "fixture"
+
+    def __init__(self, frames, latency=0.0, failures=None):
+        if isinstance(frames, dict):
+            frames = pd.DataFrame(frames)
+        self.frames = frames.sort_index()
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.calls = 0
+
+    @classmethod
+    def from_directory(cls, path):
+        """
+        Builds a provider from one '<TICKER>.csv' (Date, Close) or '<TICKER>.parquet' file per ticker.
+        """
+        series = {}
+        for fname in sorted(os.listdir(path)):
+            ticker, ext = os.path.splitext(fname)
+            full = os.path.join(path, fname)
+            if ext == ".csv":
+                df = pd.read_csv(full, index_col=0, parse_dates=True)
+            elif ext == ".parquet":
+                df = pd.read_parquet(full)
+            else:
+                continue
+            series[ticker.upper()] = df['Close'] if 'Close' in df.columns else df.iloc[:, 0]
+        return cls(series)
+
+    def fetch(self, tickers, interval="1d", start=None, period=None):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        failing = [t for t in tickers if self.failures.get(t, 0) > 0]
+        if failing:
+            for t in failing:
+                self.failures[t] -= 1
+            raise ConnectionError(f"simulated failure for {', '.join(failing)}")
+        cols = [t for t in tickers if t in self.frames.columns]
+        data = self.frames[cols]
+        if start is not None:
+            data = data.loc[data.index >= pd.Timestamp(start)]
+        elif period is not None:
+            data = data.loc[data.index >= period_start(period, data.index)]
+        return data.dropna(how="all")
+
+
+def period_start(period, index=None, now=None):
+    """
+    Translates a yfinance-style period ("1mo", "6mo", "1y", "2y", "ytd", "max") into a start timestamp.
+    """
+    tz = getattr(index, "tz", None)
+    now = pd.Timestamp.now(tz=tz) if now is None else pd.Timestamp(now)
+    if period == "max":
+        return pd.Timestamp("1900-01-01", tz=tz)
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1, tz=tz)
+    units = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+    for suffix, unit in units.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return (now - pd.DateOffset(**{unit: int(period[:-len(suffix)])})).normalize()
+    raise ValueError(f"Unknown period: {period}")
+
+
+def provider_from_env():
+    """
+    Picks the provider from QUANT_DATA_PROVIDER ("yahoo" or "fixture:<directory>"), behind
+    the concurrent fetch layer.
+    """
+    spec = os.environ.get("QUANT_DATA_PROVIDER", "yahoo")
+    if spec.startswith("fixture:"):
+        return ConcurrentFetcher(FixtureProvider.from_directory(spec.split(":", 1)[1]))
+    return ConcurrentFetcher(YahooProvider())
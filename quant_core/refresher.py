@@ -0,0 +1,145 @@
+"""
+Background price refresher shared by every dashboard session of the server process.
+
+Sessions subscribe the tickers they display on each rerun; one daemon thread polls the
+union of the live subscriptions (one batched tail download per period/interval instead
+of one per session) and publishes each result as an immutable PriceStore snapshot that
+get_panel serves without blocking. Every snapshot carries a version that only changes
+when the prices do, so a session can skip recomputing when the version it last used is
+still current.
+"""
+import time
+import threading
+import numpy as np
+from quant_core.bar_store import get_default_store
+from quant_core.panel import PriceStore, publish_panel, published_snapshot
+
+# Seconds between polls (below the store's max_age, so snapshots never go stale while it runs)
+POLL_SECONDS = 240
+
+# Seconds after which tickers no session has asked for again are dropped from the poll
+IDLE_SECONDS = 900
+
+
+def _same_prices(a, b):
+    return a.columns == b.columns and a.index.equals(b.index) and np.array_equal(a.values, b.values, equal_nan=True)
+
+
+class PriceRefresher:
+    """
+    Polls the subscribed tickers in a daemon thread and publishes versioned snapshots.
+    """
+
+    def __init__(self, poll_seconds=POLL_SECONDS, idle_seconds=IDLE_SECONDS, store=None):
+        self.poll_seconds = poll_seconds
+        self.idle_seconds = idle_seconds
+        self.store = store if store is not None else get_default_store()
+        # (period, interval) -> {ticker: last time a session asked for it}
+        self.subscriptions = {}
+        # (period, interval) -> (version, panel) last published
+        self.snapshots = {}
+        self.last_poll = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, tickers, period="1y", interval="1d"):
+        """
+        Registers tickers a session displays (call on every rerun to keep them polled).
+        Tickers missing from the current snapshot wake the thread for an early poll.
+        """
+        now = time.time()
+        with self._lock:
+            group = self.subscriptions.setdefault((period, interval), {})
+            new = [t for t in tickers if t not in group]
+            for t in tickers:
+                group[t] = now
+        if new:
+            self._wake.set()
+
+    def version(self, tickers, period="1y", interval="1d"):
+        """
+        Version of the published snapshot get_panel serves for these tickers, or None when it
+        does not cover them (the session then loaded its own prices).
+        """
+        snapshot = published_snapshot(tickers, period, interval)
+        return None if snapshot is None else snapshot[0]
+
+    def refresh(self):
+        """
+        One poll: reloads every subscribed group and publishes it, bumping the version only
+        when its prices changed. Returns the number of groups published.
+        """
+        now = time.time()
+        with self._lock:
+            groups = {}
+            for key, group in self.subscriptions.items():
+                for t in [t for t, seen in group.items() if now - seen > self.idle_seconds]:
+                    del group[t]
+                if group:
+                    groups[key] = sorted(group)
+            for key in [k for k in self.subscriptions if not self.subscriptions[k]]:
+                del self.subscriptions[key]
+
+        published = 0
+        for (period, interval), tickers in groups.items():
+            try:
+                # max_age=0: always fetch the tail, this is the only poller
+                panel = PriceStore.from_frame(self.store.load(tickers, period, interval, max_age=0))
+            except Exception as e:
+                print(f"Error refreshing {period}/{interval}: {e}")
+                self.last_error = str(e)
+                continue
+            if panel.empty:
+                continue
+            version, previous = self.snapshots.get((period, interval), (0, None))
+            if previous is not None and _same_prices(previous, panel):
+                panel = previous
+            else:
+                version += 1
+            self.snapshots[(period, interval)] = (version, panel)
+            publish_panel(panel, period, interval, version, root=self.store.root)
+            published += 1
+        self.last_poll = time.time()
+        return published
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            self.refresh()
+            self._wake.wait(self.poll_seconds)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="price-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def get_refresher(start=True):
+    """
+    The process-wide refresher (Streamlit runs every session in the same process), started
+    on first use.
+    """
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = PriceRefresher()
+        if start:
+            _refresher.start()
+        return _refresher
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+from quant_core.memo import memoize
+
+# Rolling metrics over a whole (time x asset) matrix. Sums use cumulative sums and
+# extrema use the van Herk/Gil-Werman block scan (the vectorized equivalent of a
+# monotonic deque), so every function is O(T x N) whatever the window length.
+
+
+def _as_matrix(data):
+    """
+    Returns (2D float array, rebuild function) for a Series, DataFrame or array.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=float), lambda a: pd.DataFrame(a, index=data.index, columns=data.columns)
+    if isinstance(data, pd.Series):
+        return data.to_numpy(dtype=float)[:, None], lambda a: pd.Series(a[:, 0], index=data.index, name=data.name)
+    arr = np.asarray(data, dtype=float)
+    if arr.ndim == 1:
+        return arr[:, None], lambda a: a[:, 0]
+    return arr, lambda a: a
+
+
+def rolling_sum(values, window):
+    """
+    Trailing sum over `window` rows via cumulative sums (NaN until the window is full).
+    """
+    values = np.asarray(values, dtype=float)
+    csum = np.empty((len(values) + 1,) + values.shape[1:])
+    csum[0] = 0.0
+    np.cumsum(values, axis=0, out=csum[1:])
+    out = np.empty(values.shape)
+    out[:window - 1] = np.nan
+    if window <= len(values):
+        np.subtract(csum[window:], csum[:-window], out=out[window - 1:])
+    return out
+
+
+def _full_windows(valid, window):
+    """
+    Rows whose trailing window holds `window` valid values.
+    """
+    n = len(valid)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), n)
+    if (valid.sum(axis=0) == n - first).all():
+        # Only leading gaps (as in returns, or assets listed later): no count needed
+        return np.arange(n)[:, None] - first >= window - 1
+    return rolling_sum(valid.astype(float), window) == window
+
+
+def _rolling_moments(returns, window):
+    # Demeaning by the full-sample mean keeps the cumulative sums well conditioned
+    valid = ~np.isnan(returns)
+    mu = np.nanmean(returns, axis=0) if valid.any() else np.zeros(returns.shape[1:])
+    centered = returns - mu
+    centered[~valid] = 0.0
+    full = _full_windows(valid, window)
+    s1 = rolling_sum(centered, window)
+    np.square(centered, out=centered)
+    s2 = rolling_sum(centered, window)
+    mean = np.where(full, s1 / window + mu, np.nan)
+    s1 *= s1
+    s1 /= window
+    np.subtract(s2, s1, out=s2)
+    s2 /= window - 1
+    var = np.where(full, np.maximum(s2, 0.0), np.nan)
+    return mean, np.sqrt(var)
+
+
+def _sharpe(mean, std, periods_per_year):
+    vol = std * np.sqrt(periods_per_year)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(vol > 0, mean * periods_per_year / vol, np.where(np.isnan(vol), np.nan, 0.0))
+
+
+def rolling_sharpe(returns, window, periods_per_year=252):
+    """
+    Rolling Sharpe ratio (annualized mean / annualized vol, 0 when flat), as in compute_performance_metrics.
+    """
+    arr, rebuild = _as_matrix(returns)
+    mean, std = _rolling_moments(arr, window)
+    return rebuild(_sharpe(mean, std, periods_per_year))
+
+
+def _blocks(values, window):
+    # Pads (repeating the last row) to a whole number of blocks of `window` rows
+    n = len(values)
+    n_blocks = -(-n // window)
+    pad = n_blocks * window - n
+    if pad:
+        values = np.concatenate([values, np.repeat(values[-1:], pad, axis=0)])
+    return values.reshape(n_blocks, window, -1)
+
+
+def _window_positions(n, window):
+    ends = np.arange(window - 1, n)
+    return ends - window + 1, ends
+
+
+def rolling_extrema(values, window):
+    """
+    Trailing max and min over `window` rows, O(T x N) for any window.
+    """
+    arr, rebuild = _as_matrix(values)
+    n, cols = arr.shape
+    out_max = np.full(arr.shape, np.nan)
+    out_min = np.full(arr.shape, np.nan)
+    if window > n or n == 0:
+        return rebuild(out_max), rebuild(out_min)
+    b = _blocks(arr, window)
+    pmax = np.maximum.accumulate(b, axis=1).reshape(-1, cols)
+    pmin = np.minimum.accumulate(b, axis=1).reshape(-1, cols)
+    smax = np.maximum.accumulate(b[:, ::-1], axis=1)[:, ::-1].reshape(-1, cols)
+    smin = np.minimum.accumulate(b[:, ::-1], axis=1)[:, ::-1].reshape(-1, cols)
+    starts, ends = _window_positions(n, window)
+    out_max[ends] = np.maximum(smax[starts], pmax[ends])
+    out_min[ends] = np.minimum(smin[starts], pmin[ends])
+    return rebuild(out_max), rebuild(out_min)
+
+
+def rolling_max_drawdown(values, window):
+    """
+    Deepest peak-to-trough loss with both points inside the trailing window (negative, or 0).
+    `values` are price or portfolio levels.
+
+    Per block, prefix and suffix (max, min, max drawdown) summaries are computed with
+    accumulate scans; a window spanning two blocks combines the suffix of the first with
+    the prefix of the second, the cross term being min(prefix) / max(suffix) - 1.
+    """
+    arr, rebuild = _as_matrix(values)
+    n, cols = arr.shape
+    out = np.full(arr.shape, np.nan)
+    if window > n or n == 0:
+        return rebuild(out)
+    b = _blocks(arr, window)
+    pmax = np.maximum.accumulate(b, axis=1)
+    pmin = np.minimum.accumulate(b, axis=1)
+    pmdd = np.minimum.accumulate(b / pmax - 1, axis=1)
+    rev = b[:, ::-1]
+    smax = np.maximum.accumulate(rev, axis=1)[:, ::-1]
+    smin_rev = np.minimum.accumulate(rev, axis=1)
+    # For each start u: min over t >= u of v_t / v_u - 1, then the best u from here to the block end
+    smdd = np.minimum.accumulate(smin_rev / rev - 1, axis=1)[:, ::-1]
+
+    pmax, pmin, pmdd = (a.reshape(-1, cols) for a in (pmax, pmin, pmdd))
+    smax, smdd = smax.reshape(-1, cols), smdd.reshape(-1, cols)
+    starts, ends = _window_positions(n, window)
+    cross = pmin[ends] / smax[starts] - 1
+    combined = np.minimum(np.minimum(smdd[starts], pmdd[ends]), cross)
+    aligned = (starts % window == 0)[:, None]
+    out[ends] = np.where(aligned, smdd[starts], combined)
+    return rebuild(out)
+
+
+def rolling_correlation(returns, window, pairs=None):
+    """
+    Rolling Pearson correlation for every pair of columns (or only the given (a, b) pairs).
+    Returns a DataFrame with one (a, b) MultiIndex column per pair.
+    """
+    frame = returns if isinstance(returns, pd.DataFrame) else pd.DataFrame(returns)
+    cols = list(frame.columns)
+    arr = frame.to_numpy(dtype=float)
+    arr = arr - np.nanmean(arr, axis=0)
+    valid = ~np.isnan(arr)
+    arr = np.where(valid, arr, 0.0)
+
+    if pairs is None:
+        pairs = [(cols[i], cols[j]) for i in range(len(cols)) for j in range(i + 1, len(cols))]
+    pos = {c: k for k, c in enumerate(cols)}
+
+    s1 = rolling_sum(arr, window)
+    s2 = rolling_sum(arr ** 2, window)
+    var = s2 - s1 ** 2 / window
+    out = np.full((len(arr), len(pairs)), np.nan)
+
+    # Group the pairs by their first column: one (T x k) cross-product per group
+    by_first = {}
+    for k, (a, b) in enumerate(pairs):
+        by_first.setdefault(pos[a], []).append((k, pos[b]))
+    for i, items in by_first.items():
+        ks = [k for k, _ in items]
+        js = [j for _, j in items]
+        both = (valid[:, [i]] & valid[:, js]).astype(float)
+        full = rolling_sum(both, window) == window
+        sxy = rolling_sum(arr[:, [i]] * arr[:, js], window)
+        cov = sxy - s1[:, [i]] * s1[:, js] / window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.sqrt(var[:, [i]] * var[:, js])
+        out[:, ks] = np.where(full, np.clip(corr, -1, 1), np.nan)
+
+    return pd.DataFrame(out, index=frame.index, columns=pd.MultiIndex.from_tuples(pairs))
+
+
+def rolling_metrics(values, window, periods_per_year=252):
+    """
+    Rolling volatility, Sharpe ratio and max drawdown of every column of `values` (price or
+    portfolio levels), each shaped like `values`. The return moments are computed once for
+    both the volatility and the Sharpe ratio.
+    """
+    arr, rebuild = _as_matrix(values)
+    returns = np.full(arr.shape, np.nan)
+    returns[1:] = arr[1:] / arr[:-1] - 1
+    mean, std = _rolling_moments(returns, window)
+    return {
+        "Volatility": rebuild(std * np.sqrt(periods_per_year)),
+        "Sharpe Ratio": rebuild(_sharpe(mean, std, periods_per_year)),
+        "Max Drawdown": rolling_max_drawdown(values, window),
+    }
+
+
+# Memoized variants for the dashboards
+cached_rolling_metrics = memoize("rolling_metrics")(rolling_metrics)
+cached_rolling_correlation = memoize("rolling_correlation")(rolling_correlation)
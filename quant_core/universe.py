@@ -0,0 +1,26 @@
+"""
+Ticker universe offered by both dashboards (and screened by Quant A).
+"""
+
+# Shuffled CAC 40 and Top 50 Cryptos for a diverse selection
+UNIVERSE = {
+    "CAC 40 (France)": [
+        "AI.PA", "AIR.PA", "ALO.PA", "MT.AS", "AXA.PA", "BNP.PA", "EN.PA", "CAP.PA", 
+        "CA.PA", "ACA.PA", "BN.PA", "DSY.PA", "ENGI.PA", "EL.PA", "ERF.PA", "RMS.PA", 
+        "KER.PA", "OR.PA", "LR.PA", "MC.PA", "ML.PA", "ORA.PA", "PUB.PA", "RNO.PA", 
+        "SAF.PA", "SGO.PA", "SAN.PA", "SU.PA", "GLE.PA", "STLA.PA", "STM.PA", "TEP.PA", 
+        "HO.PA", "TTE.PA", "URW.AS", "VIE.PA", "VIV.PA", "WLN.PA", "DG.PA", "EDEN.PA"
+    ],
+    "Crypto 50 (Global)": [
+        "BTC-USD", "ETH-USD", "USDT-USD", "BNB-USD", "SOL-USD", "XRP-USD", "USDC-USD", 
+        "ADA-USD", "DOGE-USD", "TRX-USD", "DOT-USD", "LINK-USD", "MATIC-USD", "SHIB-USD", 
+        "DAI-USD", "LTC-USD", "BCH-USD", "UNI-USD", "AVAX-USD", "XLM-USD", "ATOM-USD", 
+        "XMR-USD", "ETC-USD", "FIL-USD", "HBAR-USD", "APT-USD", "NEAR-USD", "VET-USD", 
+        "OP-USD", "ARB-USD", "RNDR-USD", "INJ-USD", "STX-USD", "GRT-USD", "KAS-USD", 
+        "THETA-USD", "MKR-USD", "LDO-USD", "BSV-USD", "AAVE-USD", "EGLD-USD", "TIA-USD", 
+        "QNT-USD", "FLOW-USD", "SUI-USD", "SEI-USD", "ALGO-USD", "FTM-USD", "GALA-USD", "DYDX-USD"
+    ]
+}
+
+# Flat list, in category order
+ALL_TICKERS = [t for tickers in UNIVERSE.values() for t in tickers]
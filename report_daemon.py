@@ -0,0 +1,199 @@
+"""
+Resident version of report_generator: stays in memory and rewrites the dated report on
+a schedule.
+
+    python -m quant_core daemon [--configs cfg/ ...] [--every 300] [--runs N]
+
+Between runs it keeps the imported engines, the closes already read from the store and,
+per config, the incremental state of the strategy (IncrementalBacktest) or portfolio
+(IncrementalPortfolio). A run only downloads the tail of each series and pushes the new
+bars through that state; when the rows already seen changed (the period window moved to
+a new day, a bar was revised), the config is rebuilt from its first bar, so the report
+always matches the cold script. Latency, new bars and memory of every run are appended
+as JSON lines to the daemon log.
+"""
+import os
+import json
+import time
+from datetime import datetime
+
+from report_generator import (collect_jobs, fetch_universe, format_report, write_report, portfolio_weights,
+                              quant_a_lines, quant_b_lines, _job_input, QUANT_A_READY)
+from quant_b_portfolio.incremental import IncrementalPortfolio
+from quant_core.intraday import periods_per_year
+from quant_core.profiling import PROFILE_LOG, start_profiler, finish_profiler, span
+
+if QUANT_A_READY:
+    from quant_a_single_asset.online import IncrementalBacktest
+
+# JSON lines of per-run latency and memory
+DAEMON_LOG = os.environ.get("QUANT_DAEMON_LOG", "report_daemon.jsonl")
+
+# Seconds between runs (the dashboards refresh every 5 minutes too)
+DEFAULT_EVERY = 300
+
+
+def rss_mb():
+    """
+    Resident memory of this process in MB (peak RSS where /proc is not available).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _state_key(job):
+    # A config edited between runs gets a fresh state
+    return job["name"], job["kind"], json.dumps(job["conf"], sort_keys=True)
+
+
+class ReportDaemon:
+    """
+    Runs the report every `every` seconds, updating each config's state with the new bars.
+    """
+
+    def __init__(self, config_paths=None, every=DEFAULT_EVERY, log_path=DAEMON_LOG, profile_log=PROFILE_LOG):
+        self.config_paths = config_paths
+        self.every = every
+        self.log_path = log_path
+        self.profile_log = profile_log
+        self.states = {}
+        self.runs = 0
+
+    def _update_quant_a(self, job, panel):
+        conf = job["conf"]
+        ticker = conf.get("ticker", "BTC-USD").upper()
+        strat_type = conf.get("strategy", "Buy and Hold")
+        prices = panel.asset(ticker) if ticker in panel else None
+        if prices is None or prices.empty:
+            return [f"[QUANT A: {ticker}]: No data found."], 0, False
+
+        key = _state_key(job)
+        state = self.states.get(key)
+        if state is None:
+            state = IncrementalBacktest(strat_type, conf.get("params", {}),
+                                        periods_per_year(conf.get("interval", "1d"), [ticker]))
+            self.states[key] = state
+        before = (state.index[0], len(state.index)) if state.index else None
+        _, metrics = state.update(prices)
+        kept = before is not None and bool(state.index) and state.index[0] == before[0] and len(state.index) >= before[1]
+        new_bars = len(state.index) - before[1] if kept else len(state.index)
+        return quant_a_lines(ticker, strat_type, metrics), new_bars, before is not None and not kept
+
+    def _update_quant_b(self, job, panel):
+        conf = job["conf"]
+        tickers = [t.upper() for t in conf.get("tickers", [])]
+        freq = conf.get("freq", "None")
+        # As in the report, tickers without data are left out and the weights renormalized
+        available = [t for t in tickers if t in panel]
+        dropped = [t for t in tickers if t not in panel]
+        if not available:
+            return ["[QUANT B: PORTFOLIO]: No data found."], 0, False
+
+        key = _state_key(job)
+        state = self.states.get(key)
+        # A ticker that failed (or came back) changes the portfolio: start a new state
+        changed = state is not None and set(state.weights_dict) != set(available)
+        if state is None or changed:
+            state = IncrementalPortfolio(portfolio_weights(conf, available), freq, conf.get("band"), conf.get("calendar"),
+                                         periods_per_year(conf.get("interval", "1d"), available))
+            self.states[key] = state
+        before, rebuilds = len(state.values), state.rebuilds
+        _, rebal_stats, metrics = state.update(panel)
+        rebuilt = changed or state.rebuilds > rebuilds
+        new_bars = len(state.values) if rebuilt or not before else len(state.values) - before
+        return quant_b_lines(available, freq, metrics, rebal_stats, dropped), new_bars, rebuilt
+
+    def _run_job(self, job, panel):
+        """
+        Same result dict as report_generator.run_job, plus the bars processed.
+        """
+        t0 = time.perf_counter()
+        new_bars, rebuilt = 0, False
+        try:
+            with span(job["name"]) as s:
+                if isinstance(panel, Exception):
+                    raise panel
+                s.record(panel)
+                if job["kind"] == "A":
+                    lines, new_bars, rebuilt = self._update_quant_a(job, panel)
+                else:
+                    lines, new_bars, rebuilt = self._update_quant_b(job, panel)
+            error = None
+        except Exception as e:
+            # A failed update leaves a state that may be half-updated: rebuild it next run
+            self.states.pop(_state_key(job), None)
+            lines, error = [f"[QUANT {job['kind']} ERROR]: {str(e)}"], str(e)
+        return {"name": job["name"], "lines": lines, "seconds": time.perf_counter() - t0, "error": error,
+                "new_bars": new_bars, "rebuilt": rebuilt}
+
+    def tick(self):
+        """
+        One report run. Returns the log record (latency, bars processed, memory).
+        """
+        start = time.perf_counter()
+        started_at = datetime.now()
+        profiler = start_profiler("daemon", log_path=self.profile_log)
+
+        jobs, skipped = collect_jobs(self.config_paths)
+        data, fetch_timings = fetch_universe(jobs)
+        fetch_s = time.perf_counter() - start
+        results = [self._run_job(job, _job_input(job, data)) for job in jobs]
+        compute_s = time.perf_counter() - start - fetch_s
+
+        # Configs removed since the last run release their state
+        live = {_state_key(job) for job in jobs}
+        self.states = {k: v for k, v in self.states.items() if k in live}
+
+        report_lines = format_report(jobs, results, skipped, fetch_timings, started_at, named=bool(self.config_paths))
+        report_lines.append(f"Total: {time.perf_counter() - start:.2f}s")
+        filename = write_report(report_lines)
+        finish_profiler(profiler)
+
+        self.runs += 1
+        record = {
+            "run": self.runs,
+            "ts": time.time(),
+            "seconds": time.perf_counter() - start,
+            "fetch_seconds": fetch_s,
+            "compute_seconds": compute_s,
+            "jobs": len(jobs),
+            "failed": sum(1 for r in results if r["error"]),
+            "new_bars": sum(r["new_bars"] for r in results),
+            "rebuilt": sum(1 for r in results if r["rebuilt"]),
+            "rss_mb": rss_mb(),
+            "report": filename,
+        }
+        self._log(record)
+        return record
+
+    def _log(self, record):
+        print(f"Run {record['run']}: {record['seconds']:.3f}s (fetch {record['fetch_seconds']:.3f}s, "
+              f"compute {record['compute_seconds']:.3f}s), {record['new_bars']} new bars, "
+              f"{record['rebuilt']} rebuilt, {record['rss_mb']:.1f} MB")
+        if not self.log_path:
+            return
+        try:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Error writing daemon log: {e}")
+
+    def run(self, runs=None):
+        """
+        Runs every `every` seconds until interrupted (or after `runs` runs).
+        """
+        try:
+            while runs is None or self.runs < runs:
+                t0 = time.monotonic()
+                self.tick()
+                if runs is not None and self.runs >= runs:
+                    break
+                time.sleep(max(0.0, self.every - (time.monotonic() - t0)))
+        except KeyboardInterrupt:
+            print("Report daemon stopped.")
+        return self.runs
@@ -1,89 +1,388 @@
 import os
+import sys
 import json
+import time
+import argparse
+import multiprocessing
+from multiprocessing.connection import wait
 from datetime import datetime
 
 # Import Quant A logic
 try:
-    from quant_a_single_asset.engine import fetch_asset_data, apply_strategy, compute_performance_metrics
+    from quant_a_single_asset.engine import cached_apply_strategy, cached_compute_performance_metrics
     QUANT_A_READY = True
 except ImportError:
     QUANT_A_READY = False
 
 # Import Quant B logic
-from quant_b_portfolio.portfolio_engine import fetch_portfolio_data, simulate_portfolio, get_advanced_metrics
-from quant_b_portfolio.data_manager import load_config as load_config_b
+from quant_b_portfolio.portfolio_engine import cached_simulate_portfolio, cached_rebalance_portfolio, cached_get_advanced_metrics
+from quant_b_portfolio.data_manager import load_config as load_config_b, CONFIG_FILE as CONFIG_B_PATH
+from quant_core.panel import PriceStore, fetch_errors
+from quant_core.intraday import periods_per_year
+from quant_core.profiling import Profiler, PROFILE_LOG, get_profiler, set_profiler, start_profiler, finish_profiler, span
 
 # Paths to your config files
 CONFIG_A_PATH = "asset_config_a.json"
+# Quant A configs saved before intervals existed analyse one year of daily bars
+QUANT_A_PERIOD = "1y"
 
-def generate_report():
-    report_lines = [f"=== DAILY QUANT REPORT - {datetime.now().strftime('%Y-%m-%d %H:%M')} ===", ""]
 
-    # --- PART 1: QUANT A (Single Asset) ---
+def make_job(name, conf):
+    """
+    Turns a Quant A ({"ticker": ...}) or Quant B ({"tickers": [...]}) config into a report job.
+    """
+    if "tickers" in conf:
+        tickers = [t.upper() for t in conf.get("tickers", [])]
+        return {"name": name, "kind": "B", "conf": conf, "tickers": tickers,
+                "period": conf.get("timeframe", "1y"), "interval": conf.get("interval", "1d")}
+    if "ticker" in conf or "strategy" in conf:
+        ticker = conf.get("ticker", "BTC-USD").upper()
+        return {"name": name, "kind": "A", "conf": conf, "tickers": [ticker],
+                "period": conf.get("period", QUANT_A_PERIOD), "interval": conf.get("interval", "1d")}
+    raise ValueError(f"{name}: not a Quant A or Quant B configuration")
+
+
+def load_jobs(paths):
+    """
+    Reads every JSON config in the given files/directories.
+    Returns (jobs, errors) where errors are (name, message) pairs.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".json"))
+        else:
+            files.append(path)
+    jobs, errors = [], []
+    for path in files:
+        name = os.path.basename(path)
+        try:
+            with open(path, "r") as f:
+                jobs.append(make_job(name, json.load(f)))
+        except Exception as e:
+            errors.append((name, str(e)))
+    return jobs, errors
+
+
+def fetch_universe(jobs):
+    """
+    Fetches the union of tickers once per (period, interval), aligned in one PriceStore panel.
+    Returns {(period, interval): panel or exception} and per-group timings (with the fetch
+    errors of the tickers that returned no data).
+    """
+    groups = {}
+    for job in jobs:
+        groups.setdefault((job["period"], job["interval"]), set()).update(job["tickers"])
+    data, timings = {}, []
+    for (period, interval), tickers in groups.items():
+        t0 = time.perf_counter()
+        with span(f"load {period}/{interval}", "fetch") as s:
+            missing = {}
+            try:
+                panel = s.record(PriceStore.load(sorted(tickers), period=period, interval=interval))
+                data[(period, interval)] = panel
+                missing = {t: None for t in sorted(tickers) if t not in panel}
+                missing.update(fetch_errors(missing))
+            except Exception as e:
+                data[(period, interval)] = e
+        timings.append((f"{period}/{interval}", len(tickers), time.perf_counter() - t0, missing))
+    return data, timings
+
+
+def run_quant_a(conf, panel):
+    ticker = conf.get("ticker", "BTC-USD").upper()
+    strat_type = conf.get("strategy", "Buy and Hold")
+    params = conf.get("params", {})
+
+    prices = panel.asset(ticker) if ticker in panel else None
+    if prices is None or prices.empty:
+        return [f"[QUANT A: {ticker}]: No data found."]
+
+    strat_ts = cached_apply_strategy(prices, strat_type, params)
+    metrics = cached_compute_performance_metrics(strat_ts, periods_per_year(conf.get("interval", "1d"), [ticker]))
+    return quant_a_lines(ticker, strat_type, metrics)
+
+
+def quant_a_lines(ticker, strat_type, metrics):
+    return [
+        f"[QUANT A: {ticker}]",
+        f"Strategy: {strat_type}",
+        f"Total Return: {metrics['Total Return']:.2%}",
+        f"Sharpe Ratio: {metrics['Sharpe Ratio']:.2f}",
+        f"Max Drawdown: {metrics['Max Drawdown']:.2%}",
+        "-" * 30,
+    ]
+
+
+def portfolio_weights(conf, available=None):
+    """
+    Normalized weights of a Quant B config, restricted to the `available` tickers (those
+    that returned data) when given.
+    """
+    tickers = [t.upper() for t in conf.get("tickers", [])]
+    if available is not None:
+        tickers = [t for t in tickers if t in available]
+    # Re-calculate weights if equal_weights was active
+    if conf.get("equal_weights"):
+        raw_weights = {t: (100.0 / len(tickers)) / 100 for t in tickers}
+    else:
+        # Ensure weight keys match uppercase tickers
+        raw_weights = {t.upper(): w for t, w in conf.get("weights", {}).items()}
+        if available is not None:
+            raw_weights = {t: w for t, w in raw_weights.items() if t in tickers}
+    # Same normalization as the dashboard, so its memoized results can be reused
+    total = sum(raw_weights.values())
+    if not total:
+        raise ValueError("no weight on the tickers with data")
+    return {k: v / total for k, v in raw_weights.items()}
+
+
+def run_quant_b(conf, panel):
+    tickers = [t.upper() for t in conf.get("tickers", [])]
+    freq = conf.get("freq", "None")
+
+    # Tickers that returned no data are left out and the weights renormalized, as on the dashboard
+    available = [t for t in tickers if t in panel]
+    dropped = [t for t in tickers if t not in panel]
+    if not available:
+        return ["[QUANT B: PORTFOLIO]: No data found."]
+    prices, normalized = panel.frame("filled", available), panel.frame("normalized", available)
+    final_weights = portfolio_weights(conf, available)
+
+    rebal_stats = None
+    if freq == "None":
+        portfolio_ts = cached_simulate_portfolio(prices, normalized, final_weights, freq)
+    else:
+        portfolio_ts, rebal_stats = cached_rebalance_portfolio(prices, final_weights, freq, conf.get("band"), conf.get("calendar"))
+    ann_factor = periods_per_year(conf.get("interval", "1d"), available)
+    metrics = cached_get_advanced_metrics(prices, portfolio_ts, final_weights, "sample", ann_factor)
+    return quant_b_lines(available, freq, metrics, rebal_stats, dropped)
+
+
+def quant_b_lines(tickers, freq, metrics, rebal_stats=None, dropped=()):
+    lines = [
+        f"[QUANT B: PORTFOLIO]",
+        f"Assets: {', '.join(tickers)}",
+    ]
+    if dropped:
+        lines.append(f"Left out (no data): {', '.join(dropped)}")
+    lines += [
+        f"Total Return: {metrics['Total Return']:.2%}",
+        f"Portfolio Volatility: {metrics['Portfolio Vol']:.2%}",
+        f"Diversification Benefit: {metrics['Diversification Benefit']:.2%}",
+    ]
+    if rebal_stats is not None:
+        lines.append(f"Rebalancing: {freq}, {rebal_stats['Rebalances']} events, turnover {rebal_stats['Turnover']:.2%}")
+    return lines + ["-" * 30]
+
+
+def run_job(job, panel, profile=False):
+    """
+    Worker entry point: never raises, so one failing config cannot affect the others.
+    With `profile`, the job's spans are returned with the result.
+    """
+    t0 = time.perf_counter()
+    outer = get_profiler()
+    profiler = Profiler(job["name"], enabled=profile, log_path=None)
+    set_profiler(profiler)
+    try:
+        with span(job["name"]) as s:
+            if isinstance(panel, Exception):
+                raise panel
+            s.record(panel)
+            if job["kind"] == "A":
+                lines = run_quant_a(job["conf"], panel)
+            else:
+                lines = run_quant_b(job["conf"], panel)
+        error = None
+    except Exception as e:
+        error = str(e)
+        lines = [f"[QUANT {job['kind']} ERROR]: {error}"]
+    finally:
+        set_profiler(outer)
+    return {"name": job["name"], "lines": lines, "seconds": time.perf_counter() - t0, "error": error,
+            "spans": profiler.spans, "profile_ts": profiler.timestamp}
+
+
+def _job_input(job, data):
+    # Each job gets (and sends to its worker) only its own columns, realigned on their calendar
+    panel = data[(job["period"], job["interval"])]
+    if isinstance(panel, Exception):
+        return panel
+    return panel.subset([t for t in job["tickers"] if t in panel])
+
+
+def _job_process(conn, job, panel, profile):
+    # Worker process of one job: sends its result back through the pipe
+    conn.send(run_job(job, panel, profile))
+    conn.close()
+
+
+def run_jobs(jobs, data, workers=None, timeout=None, profile=False):
+    """
+    Runs the per-config computations, each on its own worker process (at most `workers`
+    at once) when there is more than one worker. Jobs still running after `timeout`
+    seconds are terminated and reported as timed out. Results keep the order of `jobs`.
+    """
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_job(job, _job_input(job, data), profile) for job in jobs]
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = list(enumerate(jobs))
+    running = {}
+    results = {}
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                i, job = pending.pop(0)
+                recv, send = multiprocessing.Pipe(duplex=False)
+                proc = multiprocessing.Process(target=_job_process, args=(send, job, _job_input(job, data), profile),
+                                               name=f"report-{job['name']}", daemon=True)
+                proc.start()
+                send.close()
+                running[recv] = (i, proc)
+            left = None if deadline is None else deadline - time.monotonic()
+            if left is not None and left <= 0:
+                break
+            # A pipe is ready once its result is sent, or at EOF if the worker died
+            for recv in wait(list(running), timeout=left):
+                i, proc = running.pop(recv)
+                try:
+                    results[i] = recv.recv()
+                except EOFError:
+                    proc.join()
+                    error = f"worker exited with code {proc.exitcode}"
+                    results[i] = {"name": jobs[i]["name"], "lines": [f"[QUANT {jobs[i]['kind']} ERROR]: {error}"],
+                                  "seconds": 0.0, "error": error}
+                recv.close()
+                proc.join()
+    finally:
+        # A stuck worker must not keep the nightly run alive
+        for recv, (i, proc) in running.items():
+            proc.terminate()
+            proc.join()
+            recv.close()
+    for i, job in enumerate(jobs):
+        if i not in results:
+            results[i] = {"name": job["name"], "lines": [f"[QUANT {job['kind']} ERROR]: timed out after {timeout}s"],
+                          "seconds": float(timeout or 0), "error": "timeout"}
+    return [results[i] for i in range(len(jobs))]
+
+
+def default_jobs():
+    """
+    The single-dashboard setup: asset_config_a.json and portfolio_config.json.
+    Returns (jobs, skipped report lines).
+    """
+    jobs, skipped = [], []
     if QUANT_A_READY and os.path.exists(CONFIG_A_PATH):
         try:
             with open(CONFIG_A_PATH, "r") as f:
-                conf_a = json.load(f)
-            
-            # Case-insensitivity and data fetching
-            ticker = conf_a.get("ticker", "BTC-USD").upper()
-            strat_type = conf_a.get("strategy", "Buy and Hold")
-            params = conf_a.get("params", {})
-            
-            prices = fetch_asset_data(ticker)
-            if prices is not None:
-                strat_ts = apply_strategy(prices, strat_type, params)
-                metrics = compute_performance_metrics(strat_ts)
-                
-                report_lines.append(f"[QUANT A: {ticker}]")
-                report_lines.append(f"Strategy: {strat_type}")
-                report_lines.append(f"Total Return: {metrics['Total Return']:.2%}")
-                report_lines.append(f"Sharpe Ratio: {metrics['Sharpe Ratio']:.2f}")
-                report_lines.append(f"Max Drawdown: {metrics['Max Drawdown']:.2%}")
-                report_lines.append("-" * 30)
+                jobs.append(make_job(CONFIG_A_PATH, json.load(f)))
         except Exception as e:
-            report_lines.append(f"[QUANT A ERROR]: {str(e)}")
+            skipped.append(f"[QUANT A ERROR]: {str(e)}")
     else:
-        report_lines.append("[QUANT A]: No configuration found or module missing. Skipping.")
+        skipped.append("[QUANT A]: No configuration found or module missing. Skipping.")
 
-    # --- PART 2: QUANT B (Portfolio) ---
     conf_b = load_config_b()
     if conf_b:
-        try:
-            tickers = [t.upper() for t in conf_b.get("tickers", [])]
-            weights = conf_b.get("weights", {})
-            freq = conf_b.get("freq", "None")
-            timeframe = conf_b.get("timeframe", "1y")
-            
-            prices, normalized = fetch_portfolio_data(tickers, period=timeframe)
-            if prices is not None:
-                # Re-calculate weights if equal_weights was active
-                if conf_b.get("equal_weights"):
-                    final_weights = {t: 1.0/len(tickers) for t in tickers}
-                else:
-                    # Ensure weight keys match uppercase tickers
-                    final_weights = {t.upper(): w for t, w in weights.items()}
-                
-                portfolio_ts = simulate_portfolio(prices, normalized, final_weights, freq)
-                metrics = get_advanced_metrics(prices, portfolio_ts, final_weights)
-                
-                report_lines.append(f"[QUANT B: PORTFOLIO]")
-                report_lines.append(f"Assets: {', '.join(tickers)}")
-                report_lines.append(f"Total Return: {metrics['Total Return']:.2%}")
-                report_lines.append(f"Portfolio Volatility: {metrics['Portfolio Vol']:.2%}")
-                report_lines.append(f"Diversification Benefit: {metrics['Diversification Benefit']:.2%}")
-                report_lines.append("-" * 30)
-        except Exception as e:
-            report_lines.append(f"[QUANT B ERROR]: {str(e)}")
+        jobs.append(make_job(CONFIG_B_PATH, conf_b))
     else:
-        report_lines.append("[QUANT B]: No portfolio configuration found.")
+        skipped.append("[QUANT B]: No portfolio configuration found.")
+    return jobs, skipped
 
-    # --- SAVE REPORT ---
+
+def collect_jobs(config_paths=None):
+    """
+    Jobs of the dashboard configs, or of every config found in `config_paths`.
+    Returns (jobs, skipped report lines).
+    """
+    if not config_paths:
+        return default_jobs()
+    jobs, errors = load_jobs(config_paths)
+    if not QUANT_A_READY:
+        errors += [(j["name"], "Quant A module missing") for j in jobs if j["kind"] == "A"]
+        jobs = [j for j in jobs if j["kind"] != "A"]
+    return jobs, [f"[CONFIG ERROR: {name}]: {msg}" for name, msg in errors]
+
+
+def format_report(jobs, results, skipped, fetch_timings, started_at, named=False):
+    """
+    Report lines: the Quant A sections, then the Quant B ones, then the timings.
+    `started_at` is the datetime of the header; with `named`, each section is titled
+    with its config file.
+    """
+    report_lines = [f"=== DAILY QUANT REPORT - {started_at.strftime('%Y-%m-%d %H:%M')} ===", ""]
+    # Keep the Quant A sections before the Quant B ones, as in the single-config report
+    for kind in ("A", "B"):
+        for job, result in zip(jobs, results):
+            if job["kind"] == kind:
+                if named:
+                    report_lines.append(f"# {result['name']}")
+                report_lines.extend(result["lines"])
+    report_lines.extend(skipped)
+
+    # --- TIMING ---
+    report_lines += ["", "=== TIMING ==="]
+    for group, n_tickers, seconds, missing in fetch_timings:
+        report_lines.append(f"Fetch {group}: {n_tickers} tickers in {seconds:.2f}s")
+        for t, error in missing.items():
+            reason = f"{error['kind']}: {error['message']}" if error else "no data"
+            report_lines.append(f"  no data for {t} ({reason})")
+    for result in results:
+        status = f" ({'FAILED' if result['error'] else 'OK'})"
+        report_lines.append(f"{result['name']}: {result['seconds']:.2f}s{status}")
+    return report_lines
+
+
+def write_report(report_lines):
+    """
+    Saves the report as report_<YYYYMMDD>.txt and returns the filename.
+    """
     report_content = "\n".join(report_lines)
     filename = f"report_{datetime.now().strftime('%Y%m%d')}.txt"
     with open(filename, "w") as f:
         f.write(report_content)
     print(f"Report generated: {filename}")
+    return filename
+
+
+def generate_report(config_paths=None, workers=None, timeout=None, profile_log=PROFILE_LOG):
+    """
+    Builds the consolidated daily report for the dashboard configs, or for every config
+    found in `config_paths` (files and/or directories). Returns the report filename.
+    With `profile_log`, the fetch/compute spans of the run are appended there as JSON lines.
+    """
+    start = time.perf_counter()
+    started_at = datetime.now()
+    profiler = start_profiler("report", log_path=profile_log)
+
+    jobs, skipped = collect_jobs(config_paths)
+    data, fetch_timings = fetch_universe(jobs)
+    results = run_jobs(jobs, data, workers=workers, timeout=timeout, profile=profiler.enabled)
+    for result in results:
+        if "spans" in result:
+            profiler.extend(result["spans"], result["profile_ts"])
+
+    report_lines = format_report(jobs, results, skipped, fetch_timings, started_at, named=bool(config_paths))
+    report_lines.append(f"Total: {time.perf_counter() - start:.2f}s")
+
+    # --- SAVE REPORT ---
+    filename = write_report(report_lines)
+    finish_profiler(profiler)
+    return filename
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily quant report")
+    parser.add_argument("--configs", nargs="+", help="Config files and/or directories of JSON configs")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before unfinished configs are reported as failed")
+    parser.add_argument("--profile", default=PROFILE_LOG, help="Append timing spans as JSON lines to this file")
+    args = parser.parse_args(argv)
+    generate_report(args.configs, workers=args.workers, timeout=args.timeout, profile_log=args.profile)
+
 
 if __name__ == "__main__":
-    generate_report()
\ No newline at end of file
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+"""
+Shared fixtures: seeded synthetic closes and a store/memo that stay in a temporary directory.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_core.bar_store import BarStore, get_default_store, set_default_store
+from quant_core.memo import Memo, get_memo, set_memo
+from quant_core.panel import clear_panels
+from quant_core.providers import FixtureProvider
+
+
+def make_prices(n_assets=4, n_days=400, seed=0, end=None, gaps=False):
+    """
+    Seeded GBM closes ending today (so period windows such as "1y" cover them). With
+    gaps, the first asset only trades on weekdays (a stock next to crypto).
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.today().normalize() if end is None else pd.Timestamp(end)
+    index = pd.date_range(end=end, periods=n_days, freq="D")
+    rets = rng.normal(0.0003, 0.02, size=(n_days, n_assets))
+    prices = pd.DataFrame(100 * np.cumprod(1 + rets, axis=0), index=index,
+                          columns=[f"A{i}" for i in range(n_assets)])
+    if gaps:
+        prices.iloc[index.dayofweek >= 5, 0] = np.nan
+    return prices
+
+
+@pytest.fixture
+def prices():
+    return make_prices()
+
+
+@pytest.fixture
+def memo():
+    # In-memory only, so tests never read or leave a .memo_cache behind
+    outer = get_memo()
+    memo = Memo(cache_dir=None)
+    set_memo(memo)
+    yield memo
+    set_memo(outer)
+
+
+@pytest.fixture
+def fixture_store(tmp_path, memo):
+    """
+    Returns a function installing a BarStore over these closes as the process-wide store.
+    """
+    outer = get_default_store()
+
+    def install(frame):
+        store = BarStore(root=str(tmp_path / "store"), provider=FixtureProvider(frame), max_age=0)
+        set_default_store(store)
+        clear_panels()
+        return store
+
+    yield install
+    set_default_store(outer)
+    clear_panels()
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from quant_core.bar_store import BarStore
+from quant_core.providers import FixtureProvider
+
+
+def test_warm_reload_is_served_without_reading_or_fetching(prices, tmp_path, monkeypatch):
+    provider = FixtureProvider(prices)
+    store = BarStore(root=str(tmp_path), provider=provider, max_age=300)
+    cold = store.load(prices.columns)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("warm reload opened a file")
+    monkeypatch.setattr("quant_core.bar_store._read_close", fail)
+    monkeypatch.setattr("quant_core.bar_store.json.load", fail)
+    warm = store.load(prices.columns)
+    assert provider.calls == 1
+    pd.testing.assert_frame_equal(warm, cold)
+
+
+def test_restart_reads_the_same_closes(prices, tmp_path):
+    BarStore(root=str(tmp_path), provider=FixtureProvider(prices), max_age=300).load(prices.columns)
+    restarted = BarStore(root=str(tmp_path), provider=FixtureProvider(prices), max_age=300)
+    loaded = restarted.load(prices.columns)
+    assert restarted.provider.calls == 0
+    pd.testing.assert_frame_equal(loaded, prices.loc[loaded.index[0]:], check_freq=False)
+
+
+def test_intraday_timezone_survives_the_file(prices, tmp_path):
+    closes = prices["A0"].set_axis(pd.date_range("2024-01-02 14:30", periods=len(prices), freq="h",
+                                                 tz="UTC").tz_convert("America/New_York"))
+    BarStore(root=str(tmp_path), provider=FixtureProvider(prices))._write("A0", "1h", closes)
+    read = BarStore(root=str(tmp_path), provider=FixtureProvider(prices)).read("A0", "1h")
+    pd.testing.assert_series_equal(read, closes.rename("A0"), check_freq=False)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from quant_b_portfolio.batch_engine import simulate_portfolios, random_weights
+from quant_b_portfolio.portfolio_engine import simulate_portfolio, get_advanced_metrics
+from quant_b_portfolio.rebalance_engine import FREQUENCIES
+
+
+@pytest.mark.parametrize("freq", FREQUENCIES)
+def test_batch_matches_one_portfolio_at_a_time(prices, freq):
+    normalized = prices / prices.iloc[0] * 100
+    weights = random_weights(6, prices.shape[1], seed=1)
+    batch = simulate_portfolios(prices, weights, freq, chunk_size=4, periods_per_year=365)
+
+    for k, w in enumerate(weights):
+        weights_dict = dict(zip(prices.columns, w))
+        expected = simulate_portfolio(prices, normalized, weights_dict, freq)
+        np.testing.assert_allclose(batch["Values"].iloc[:, k].to_numpy(), expected.to_numpy(), rtol=1e-10)
+        reference = get_advanced_metrics(prices, expected, weights_dict, "sample", 365)
+        for name in ("Total Return", "Portfolio Vol", "Ex-Ante Vol", "Diversification Benefit"):
+            assert batch[name][k] == pytest.approx(reference[name], rel=1e-9, abs=1e-12)
+
+
+def test_batch_calendar_schedule(prices):
+    normalized = prices / prices.iloc[0] * 100
+    weights = random_weights(3, prices.shape[1], seed=2)
+    paths = simulate_portfolios(prices, weights, "Monthly", calendar="XPAR")["Values"]
+    for k, w in enumerate(weights):
+        expected = simulate_portfolio(prices, normalized, dict(zip(prices.columns, w)), "Monthly", calendar="XPAR")
+        np.testing.assert_allclose(paths.iloc[:, k].to_numpy(), expected.to_numpy(), rtol=1e-10)
+
+
+def test_batch_rejects_unknown_frequency(prices):
+    with pytest.raises(ValueError):
+        simulate_portfolios(prices, random_weights(2, prices.shape[1], seed=0), "Daily")
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_core.drawdowns import drawdown_episodes
+
+
+def brute_force(x):
+    """
+    Episodes of one column, bar by bar: (start, trough, recovery, depth). NaN bars are
+    skipped (a gap neither starts nor ends an episode).
+    """
+    episodes, peak, peak_row, current = [], np.nan, -1, None
+    for i, v in enumerate(x):
+        if np.isnan(v):
+            continue
+        if current is not None:
+            if v >= peak:
+                episodes.append((*current[:2], i, current[2] / peak - 1))
+                current = None
+            elif v < current[2]:
+                current[1:] = [i, v]
+        elif v < peak:
+            current = [peak_row, i, v]
+        if current is None and not v < peak:
+            peak, peak_row = v, i
+    if current is not None:
+        episodes.append((*current[:2], -1, current[2] / peak - 1))
+    return episodes
+
+
+def random_walks(n_rows=300, n_cols=5, seed=0, gap_rate=0.15):
+    rng = np.random.default_rng(seed)
+    x = 100 * np.cumprod(1 + rng.normal(0, 0.02, size=(n_rows, n_cols)), axis=0)
+    x[rng.random(x.shape) < gap_rate] = np.nan
+    x[:7, 1] = np.nan                          # Leading gap
+    x[50:60, 2] = x[49, 2]                     # Flat stretch at the same level
+    x[:, 3] = np.linspace(1, 2, n_rows)        # Never underwater
+    return x
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force(seed):
+    x = random_walks(seed=seed)
+    table = drawdown_episodes(x)
+    for j in range(x.shape[1]):
+        rows = np.arange(table.bounds[j], table.bounds[j + 1])
+        actual = list(zip(table.start[rows], table.trough[rows], table.recovery[rows], table.depth[rows]))
+        expected = brute_force(x[:, j])
+        assert len(actual) == len(expected)
+        for a, e in zip(actual, expected):
+            assert a[:3] == e[:3]
+            assert a[3] == pytest.approx(e[3], rel=1e-12)
+    deepest = [min((e[3] for e in brute_force(x[:, j])), default=0.0) for j in range(x.shape[1])]
+    np.testing.assert_allclose(table.max_drawdown().to_numpy(), deepest, rtol=1e-12)
+
+
+def test_peak_before_a_gap():
+    # The peak is bar 22; bar 23 is a gap filled with its price
+    x = np.concatenate([np.linspace(100, 122, 23), [np.nan], [110.0, 105.0, 125.0]])
+    episode = drawdown_episodes(x).episodes().iloc[0]
+    assert (episode["Peak"], episode["Trough"], episode["Recovery"]) == (22, 25, 26)
+    assert episode["Bars"] == 4
+
+
+def test_queries_follow_the_episodes():
+    x = random_walks(seed=7)
+    index = pd.date_range("2024-01-01", periods=len(x), freq="D")
+    frame = pd.DataFrame(x, index=index, columns=list("ABCDE"))
+    table = drawdown_episodes(frame)
+    everything = table.episodes()
+    assert list(table.deepest(5)["Depth"]) == sorted(everything["Depth"])[:5]
+    assert list(table.longest(3, asset="A")["Bars"]) == sorted(table.episodes("A")["Bars"], reverse=True)[:3]
+    assert len(table.episodes("D")) == 0
+    ongoing = table.ongoing()
+    assert ongoing["Recovery"].isna().all() and ongoing["Asset"].is_unique
+    assert (everything["Peak"] < everything["Trough"]).all()
+    assert (everything["Duration"] == pd.to_timedelta(everything["Bars"], unit="D")).all()
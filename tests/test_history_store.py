@@ -0,0 +1,68 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from quant_b_portfolio.history_store import HistoryStore
+
+TIMES = ["2024-01-30 23:59:59", "2024-01-31 00:00:00", "2024-01-31 12:00:00",
+         "2024-01-31 23:59:59", "2024-02-01 00:00:00", "2024-02-01 09:30:00"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.db"))
+    store.append_many([{"ts": ts, "portfolio_id": "A+B" if i % 2 else "C", "config_id": "cfg",
+                        "total_return": 0.01 * i, "portfolio_vol": 0.2, "diversification_benefit": 0.01}
+                       for i, ts in enumerate(TIMES)])
+    return store
+
+
+def dates(frame):
+    return list(frame["Date"])
+
+
+@pytest.mark.parametrize("end", ["2024-01-31", date(2024, 1, 31)])
+def test_date_only_end_includes_the_whole_day(store, end):
+    assert dates(store.query(start="2024-01-31", end=end)) == TIMES[1:4]
+    assert store.count(start="2024-01-31", end=end) == 3
+
+
+@pytest.mark.parametrize("end", ["2024-01-31 12:00:00", datetime(2024, 1, 31, 12), pd.Timestamp("2024-01-31 12:00")])
+def test_timestamp_end_is_inclusive(store, end):
+    assert dates(store.query(start="2024-01-31", end=end)) == TIMES[1:3]
+
+
+def test_bounds_and_portfolio_filter(store):
+    assert dates(store.query()) == TIMES
+    assert dates(store.query(start="2024-01-31 12:00:00")) == TIMES[2:]
+    assert dates(store.query(end="2024-01-30")) == TIMES[:1]
+    assert dates(store.query(start="2024-02-01", end="2024-02-01", portfolio_id="A+B")) == TIMES[5:]
+    assert store.count(portfolio_id="C", end="2024-01-31") == 2
+
+
+def test_pages(store):
+    assert dates(store.page(0, page_size=4)) == TIMES[::-1][:4]
+    assert dates(store.page(1, page_size=4)) == TIMES[::-1][4:]
+    assert dates(store.page(0, page_size=4, newest_first=False)) == TIMES[:4]
+
+
+def test_import_csv_once_and_atomically(tmp_path):
+    csv = tmp_path / "history.csv"
+    pd.DataFrame({"Date": TIMES, "Total Return": 0.1, "Portfolio Volatility": 0.2,
+                  "Diversification Benefit": 0.0}).to_csv(csv, index=False)
+    store = HistoryStore(str(tmp_path / "history.db"))
+    assert store.import_csv(str(csv), chunksize=4) == len(TIMES)
+    assert store.import_csv(str(csv)) == 0
+    assert store.count() == len(TIMES)
+
+    # A bad row in the second chunk: nothing from the first chunk is kept, nor the marker
+    broken = tmp_path / "broken.csv"
+    pd.DataFrame({"Date": TIMES[:4] + ["not a date"], "Total Return": 0.1}).to_csv(broken, index=False)
+    with pytest.raises(Exception):
+        store.import_csv(str(broken), chunksize=4)
+    assert store.count() == len(TIMES)
+    # Once fixed, the same file imports in full
+    pd.DataFrame({"Date": TIMES[:5], "Total Return": 0.1}).to_csv(broken, index=False)
+    assert store.import_csv(str(broken), chunksize=4) == 5
+    assert store.count() == len(TIMES) + 5
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from quant_core.memo import Memo, memoize, get_memo, set_memo
+
+
+def test_memory_tier_byte_budget(tmp_path):
+    memo = Memo(cache_dir=None, max_memory_items=100, max_memory_bytes=10 * 8000)
+    for i in range(20):
+        memo.put(f"k{i}", np.full(1000, float(i)))
+    stats = memo.stats()
+    assert stats["memory_items"] == 10 and stats["memory_bytes"] == 10 * 8000
+    assert memo.get("k19")[0] and not memo.get("k0")[0]
+    # Larger than the whole budget: not kept in memory
+    memo.put("huge", np.zeros(20000))
+    assert not memo.get("huge")[0]
+
+
+def test_disk_tier_running_total(tmp_path):
+    memo = Memo(cache_dir=str(tmp_path), max_memory_items=0, max_disk_bytes=5 * 8000 + 2000)
+    for i in range(12):
+        memo.put(f"k{i}", np.full(1000, float(i)))
+    on_disk = sum(os.path.getsize(tmp_path / f) for f in os.listdir(tmp_path))
+    assert on_disk <= memo.max_disk_bytes and memo._disk_bytes == on_disk
+    found, value = memo.get("k11")
+    assert found and value[0] == 11.0
+    assert not memo.get("k0")[0]
+
+
+def test_store_skips_cached_keys(tmp_path):
+    outer = get_memo()
+    set_memo(Memo(cache_dir=str(tmp_path)))
+    try:
+        calls = []
+        double = memoize("test_double")(lambda frame: calls.append(1) or frame * 2)
+        frame = pd.DataFrame({"a": [1.0, 2.0]})
+        assert double.store(frame * 2, frame)
+        files = os.listdir(tmp_path)
+        assert not double.store(frame * 2, frame)
+        assert os.listdir(tmp_path) == files
+        pd.testing.assert_frame_equal(double(frame), frame * 2)
+        assert not calls
+    finally:
+        set_memo(outer)
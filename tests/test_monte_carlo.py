@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_prices
+
+from quant_b_portfolio.monte_carlo import simulate_risk, _rebalanced_paths, _future_mask
+from quant_b_portfolio.rebalance_engine import simulate_events, rebalance_mask, DEFAULT_BAND
+
+
+@pytest.mark.parametrize("band", [None, DEFAULT_BAND, 0.01])
+def test_path_loop_matches_the_event_kernel(band):
+    rng = np.random.default_rng(3)
+    rets = rng.normal(0.0005, 0.03, size=(20, 120, 4))
+    weights = np.array([0.4, 0.3, 0.2, 0.1])
+    mask = np.zeros(120, dtype=bool)
+    mask[[21, 42, 63, 84, 105]] = True
+    paths = _rebalanced_paths(rets, weights, mask, band)
+    for k in range(len(rets)):
+        # simulate_events starts from row 0 (the current value, no return)
+        expected, _ = simulate_events(np.vstack([np.zeros(4), rets[k]]), weights, np.concatenate([[False], mask]), band)
+        np.testing.assert_allclose(paths[k], expected[1:], rtol=1e-12)
+
+
+def test_future_mask_follows_the_bar_calendar():
+    # Weekday bars: the next months start on their first weekday
+    index = pd.bdate_range("2024-01-01", "2024-06-28")
+    mask = _future_mask(index, 70, "Monthly")
+    future = pd.bdate_range("2024-07-01", periods=70)
+    np.testing.assert_array_equal(mask, rebalance_mask(index[-1:].append(future), "Monthly")[1:])
+    assert mask[0] and mask.sum() == 4
+    assert not _future_mask(index, 70, "Tolerance Band").any()
+
+
+def test_rebalanced_risk_differs_from_buy_and_hold():
+    prices = make_prices(gaps=True).ffill().bfill()
+    weights = {t: 0.25 for t in prices.columns}
+    hold = simulate_risk(prices, weights, 2000, 126)
+    monthly = simulate_risk(prices, weights, 2000, 126, rebalance_freq="Monthly")
+    band = simulate_risk(prices, weights, 2000, 126, rebalance_freq="Tolerance Band", band=0.02)
+    # Same draws (same seed): the schedules only change how the paths are rebalanced
+    assert hold["VaR"] != monthly["VaR"] != band["VaR"]
+    for risk in (hold, monthly, band):
+        assert 0 < risk["VaR"] < risk["CVaR"] < 1
+    np.testing.assert_allclose(monthly["Paths"].iloc[0], 100.0)
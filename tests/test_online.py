@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+import pytest
+
+from quant_a_single_asset.engine import apply_strategy
+from quant_a_single_asset.online import IncrementalBacktest, OnlineStrategy
+
+STRATEGIES = [
+    ("Buy and Hold", {}),
+    ("Momentum (SMA Crossover)", {"short_window": 10, "long_window": 30}),
+    ("RSI Strategy", {"rsi_period": 14}),
+    ("Bollinger Bands", {"bb_window": 20, "bb_std": 1.5}),
+]
+
+
+def round_trip(backtest):
+    # Through JSON, as the daemon and save()/load() persist it
+    return IncrementalBacktest.from_dict(json.loads(json.dumps(backtest.to_dict())))
+
+
+@pytest.mark.parametrize("strategy, params", STRATEGIES)
+def test_online_strategy_round_trip(prices, strategy, params):
+    closes = prices["A0"].to_numpy()
+    online = OnlineStrategy(strategy, params)
+    for p in closes[:200]:
+        online.update(p)
+    restored = OnlineStrategy.from_dict(json.loads(json.dumps(online.to_dict())))
+    for p in closes[200:]:
+        assert restored.update(p) == online.update(p)
+
+
+@pytest.mark.parametrize("strategy, params", STRATEGIES)
+def test_checkpoint_round_trip_then_new_bars(prices, strategy, params):
+    closes = prices["A0"]
+    backtest = IncrementalBacktest(strategy, params)
+    backtest.update(closes.iloc[:250])
+    restored = round_trip(backtest)
+
+    series, metrics = restored.update(closes)
+    expected, expected_metrics = IncrementalBacktest(strategy, params).update(closes)
+    np.testing.assert_allclose(series.to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(series.to_numpy(), apply_strategy(closes, strategy, params).to_numpy(),
+                               rtol=1e-9, equal_nan=True)
+    for name, value in expected_metrics.items():
+        assert metrics[name] == pytest.approx(value, rel=1e-12, nan_ok=True)
+
+
+@pytest.mark.parametrize("strategy, params", STRATEGIES)
+def test_checkpoint_replays_revised_last_bar(prices, strategy, params):
+    # The last bar seen before saving was still forming: after a load, update() replays it
+    closes = prices["A0"]
+    partial = closes.iloc[:250].copy()
+    partial.iloc[-1] *= 1.03
+    backtest = IncrementalBacktest(strategy, params)
+    backtest.update(partial)
+
+    series, _ = round_trip(backtest).update(closes.iloc[:260])
+    expected, _ = IncrementalBacktest(strategy, params).update(closes.iloc[:260])
+    np.testing.assert_allclose(series.to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+def test_save_and_load(prices, tmp_path):
+    closes = prices["A0"]
+    backtest = IncrementalBacktest("RSI Strategy", {"rsi_period": 14}, periods_per_year=365)
+    backtest.update(closes.iloc[:300])
+    path = tmp_path / "state.json"
+    backtest.save(path)
+
+    loaded = IncrementalBacktest.load(path)
+    assert loaded.periods_per_year == 365
+    assert loaded.index == backtest.index
+    series, _ = loaded.update(closes)
+    expected, _ = backtest.update(closes)
+    np.testing.assert_allclose(series.to_numpy(), expected.to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+def test_new_bars(prices):
+    closes = prices["A0"]
+    backtest = IncrementalBacktest("Momentum (SMA Crossover)", {"short_window": 10, "long_window": 30})
+    backtest.update(closes.iloc[:300])
+    assert backtest.new_bars == 300
+    backtest.update(closes.iloc[:300])
+    assert backtest.new_bars == 0
+    backtest.update(closes.iloc[:303])
+    assert backtest.new_bars == 3
+    revised = closes.iloc[:303].copy()
+    revised.iloc[-1] *= 1.01
+    backtest.update(revised)
+    assert backtest.new_bars == 1
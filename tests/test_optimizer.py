@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_b_portfolio.optimizer import optimize_portfolio
+
+
+@pytest.fixture
+def risk_model():
+    rng = np.random.default_rng(0)
+    n, T = 40, 750
+    factors = rng.normal(0, 0.01, (T, 3))
+    returns = pd.DataFrame(factors @ rng.normal(1, 0.3, (n, 3)).T / 3 + rng.normal(0.0004, 0.012, (T, n)),
+                           columns=[f"A{i}" for i in range(n)])
+    return returns.cov(), returns.mean()
+
+
+def test_target_volatility_needs_a_target(risk_model):
+    with pytest.raises(ValueError):
+        optimize_portfolio(*risk_model, "Target Volatility")
+
+
+def test_unreachable_target_is_reported(risk_model):
+    reached = optimize_portfolio(*risk_model, "Target Volatility", target_vol=0.12)
+    assert reached["Target Reached"] and reached["Volatility"] == pytest.approx(0.12, rel=1e-3)
+    capped = optimize_portfolio(*risk_model, "Target Volatility", target_vol=0.5, max_weight=0.1)
+    assert capped["Target Reached"] is False
+    assert capped["Volatility"] < 0.5 and capped["Weights"].max() <= 0.1 + 1e-9
+    assert optimize_portfolio(*risk_model, "Max Sharpe")["Target Reached"] is None
+
+
+def test_capped_max_sharpe_warm_start(risk_model):
+    cold = optimize_portfolio(*risk_model, "Max Sharpe", max_weight=0.1)
+    assert cold["Weights"].sum() == pytest.approx(1.0) and cold["Weights"].max() <= 0.1 + 1e-9
+    warm = optimize_portfolio(*risk_model, "Max Sharpe", max_weight=0.1, w0=cold["Weights"].values,
+                              risk_aversion0=cold["Risk Aversion"], search_step0=cold["Search Step"],
+                              step0=cold["Step Size"])
+    assert warm["Sharpe Ratio"] == pytest.approx(cold["Sharpe Ratio"], rel=1e-6)
+    np.testing.assert_allclose(warm["Weights"], cold["Weights"], atol=1e-4)
+    assert warm["Iterations"] < 0.75 * cold["Iterations"]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from quant_core.intraday import CompactPanel
+from quant_b_portfolio.portfolio_engine import simulate_portfolio, rebalance_portfolio, simulate_portfolio_compact
+from quant_b_portfolio.rebalance_engine import (simulate_rebalanced_loop, simulate_rebalanced, simulate_events,
+                                                rebalance_mask, DEFAULT_BAND)
+
+CALENDAR = ["Weekly", "Monthly", "Quarterly", "Yearly"]
+
+
+def weights_of(prices):
+    w = np.linspace(1, 2, prices.shape[1])
+    return dict(zip(prices.columns, w / w.sum()))
+
+
+@pytest.mark.parametrize("freq", CALENDAR + ["Tolerance Band"])
+def test_vectorized_engines_match_the_loop(prices, freq):
+    band = DEFAULT_BAND if freq == "Tolerance Band" else None
+    weights = weights_of(prices)
+    expected = simulate_rebalanced_loop(prices.pct_change().fillna(0), weights, freq, band)
+
+    normalized = prices / prices.iloc[0] * 100
+    actual = simulate_portfolio(prices, normalized, weights, freq)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-10)
+    path, _ = rebalance_portfolio(prices, weights, freq)
+    np.testing.assert_allclose(path.to_numpy(), expected.to_numpy(), rtol=1e-10)
+
+
+@pytest.mark.parametrize("freq", CALENDAR)
+def test_segment_engine_matches_the_event_kernel(prices, freq):
+    returns = prices.pct_change().fillna(0).to_numpy()
+    w = np.array(list(weights_of(prices).values()))
+    mask = rebalance_mask(prices.index, freq)
+    segments = simulate_rebalanced(returns, w, mask)
+    events, _ = simulate_events(returns, w, mask)
+    np.testing.assert_allclose(segments, events, rtol=1e-10)
+
+
+def test_band_rebalances_only_on_drift(prices):
+    weights = weights_of(prices)
+    _, tight = rebalance_portfolio(prices, weights, "Tolerance Band", band=0.01)
+    _, loose = rebalance_portfolio(prices, weights, "Tolerance Band", band=0.2)
+    assert tight["Rebalances"] > loose["Rebalances"]
+
+
+def test_resume_from_saved_state(prices):
+    # The daemon continues simulate_events from the positions of the previous run
+    returns = prices.pct_change().fillna(0).to_numpy()
+    w = np.array(list(weights_of(prices).values()))
+    mask = rebalance_mask(prices.index, "Monthly")
+    full, _ = simulate_events(returns, w, mask, DEFAULT_BAND)
+    state = {}
+    head, _ = simulate_events(returns[:200], w, mask[:200], DEFAULT_BAND, state=state)
+    tail, _ = simulate_events(returns[199:], w, mask[199:], DEFAULT_BAND, state=state)
+    np.testing.assert_allclose(np.concatenate([head, tail[1:]]), full, rtol=1e-12)
+
+
+@pytest.mark.parametrize("freq", ["None"] + CALENDAR)
+def test_compact_chunks_report_the_event_kernel_stats(prices, freq):
+    weights = weights_of(prices)
+    expected, expected_stats = rebalance_portfolio(prices, weights, freq)
+    panel = CompactPanel.from_frame(prices, dtype=np.float64)
+    # Chunk boundaries that fall on and off rebalance dates
+    path, stats = simulate_portfolio_compact(panel, weights, freq, chunk_rows=23, return_stats=True)
+    np.testing.assert_allclose(path.to_numpy(), expected.to_numpy(), rtol=1e-10)
+    assert stats["Rebalances"] == expected_stats["Rebalances"]
+    assert stats["Turnover"] == pytest.approx(expected_stats["Turnover"], rel=1e-10)
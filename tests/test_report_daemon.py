@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from report_daemon import ReportDaemon
+from report_generator import collect_jobs, fetch_universe, run_job, _job_input
+
+CONFIGS = {
+    "b_band.json": {"tickers": ["A0", "A1", "LATE"], "weights": {"A0": 0.5, "A1": 0.3, "LATE": 0.2},
+                    "freq": "Tolerance Band", "timeframe": "1y"},
+    "b_hold.json": {"tickers": ["A1", "A2", "LATE"], "equal_weights": True, "freq": "None", "timeframe": "1y"},
+    "b_monthly.json": {"tickers": ["A0", "A2", "LATE"], "equal_weights": True, "freq": "Monthly", "timeframe": "1y"},
+}
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    cfg = tmp_path / "cfg"
+    cfg.mkdir()
+    for name, conf in CONFIGS.items():
+        (cfg / name).write_text(json.dumps(conf))
+    # The dated report is written to the working directory
+    monkeypatch.chdir(tmp_path)
+    return ReportDaemon([str(cfg)], log_path=None, profile_log=None)
+
+
+def run_both(daemon):
+    """
+    (daemon lines, cold report lines) of every config on the current store contents.
+    """
+    jobs, _ = collect_jobs(daemon.config_paths)
+    data, _ = fetch_universe(jobs)
+    results = {}
+    for job in jobs:
+        panel = _job_input(job, data)
+        results[job["name"]] = (daemon._run_job(job, panel), run_job(job, panel))
+    return results
+
+
+def test_missing_ticker_then_back(prices, fixture_store, daemon):
+    # LATE has no data at first: left out, then added back once it returns bars
+    prices = prices.rename(columns={"A3": "LATE"})
+    store = fixture_store(prices.iloc[:-5][["A0", "A1", "A2"]])
+    for name, (incremental, cold) in run_both(daemon).items():
+        assert incremental["lines"] == cold["lines"], name
+        assert "Left out (no data): LATE" in incremental["lines"]
+
+    # Two new bars: extended in place, nothing rebuilt
+    store.provider.frames = prices.iloc[:-3][["A0", "A1", "A2"]]
+    for name, (incremental, cold) in run_both(daemon).items():
+        assert incremental["lines"] == cold["lines"], name
+        assert incremental["new_bars"] == 2 and not incremental["rebuilt"]
+
+    store.provider.frames = prices
+    for name, (incremental, cold) in run_both(daemon).items():
+        assert incremental["lines"] == cold["lines"], name
+        assert incremental["rebuilt"]
+        assert not any(l.startswith("Left out") for l in incremental["lines"])
+        assert any(l.startswith("Assets: ") and "LATE" in l for l in incremental["lines"])
+
+
+def test_tick_writes_the_report(prices, fixture_store, daemon, tmp_path):
+    fixture_store(prices[["A0", "A1", "A2"]])
+    record = daemon.tick()
+    assert record["jobs"] == len(CONFIGS) and record["failed"] == 0
+    report = (tmp_path / record["report"]).read_text()
+    assert report.count("Left out (no data): LATE") == len(CONFIGS)
+
+    second = daemon.tick()
+    assert second["rebuilt"] == 0
@@ -0,0 +1,77 @@
+import os
+import time
+import multiprocessing
+import pytest
+
+import report_generator
+from report_generator import make_job, fetch_universe, run_job, run_jobs, run_quant_b, portfolio_weights, _job_input
+
+
+def report_lines(conf):
+    job = make_job("portfolio.json", conf)
+    data, timings = fetch_universe([job])
+    return run_job(job, _job_input(job, data)), timings
+
+
+@pytest.mark.parametrize("freq", ["None", "Monthly", "Tolerance Band"])
+def test_missing_ticker_is_dropped_and_weights_renormalized(prices, fixture_store, freq):
+    fixture_store(prices)
+    with_missing = {"tickers": ["A0", "a1", "DELISTED"], "weights": {"A0": 0.5, "A1": 0.3, "DELISTED": 0.2},
+                    "freq": freq, "timeframe": "1y"}
+    result, timings = report_lines(with_missing)
+    assert result["error"] is None
+    lines = result["lines"]
+    assert "Assets: A0, A1" in lines
+    assert "Left out (no data): DELISTED" in lines
+    assert "DELISTED" in timings[0][3]
+
+    # Same metrics as the portfolio of the two tickers with data, weighted 5:3
+    expected, _ = report_lines({"tickers": ["A0", "A1"], "weights": {"A0": 5, "A1": 3}, "freq": freq, "timeframe": "1y"})
+    assert [l for l in lines if not l.startswith("Left out")] == expected["lines"]
+
+
+def test_equal_weights_over_the_tickers_with_data(prices, fixture_store):
+    fixture_store(prices)
+    result, _ = report_lines({"tickers": ["A0", "A1", "A2", "DELISTED"], "equal_weights": True, "freq": "Monthly"})
+    expected, _ = report_lines({"tickers": ["A0", "A1", "A2"], "equal_weights": True, "freq": "Monthly"})
+    assert [l for l in result["lines"] if not l.startswith("Left out")] == expected["lines"]
+
+
+def test_no_ticker_with_data(prices, fixture_store):
+    fixture_store(prices)
+    result, _ = report_lines({"tickers": ["GONE", "DELISTED"], "equal_weights": True})
+    assert result["lines"] == ["[QUANT B: PORTFOLIO]: No data found."]
+
+
+def test_portfolio_weights():
+    conf = {"tickers": ["a", "b", "c"], "weights": {"a": 2, "b": 1, "c": 1}}
+    assert portfolio_weights(conf) == {"A": 0.5, "B": 0.25, "C": 0.25}
+    assert portfolio_weights(conf, ["A", "C"]) == pytest.approx({"A": 2 / 3, "C": 1 / 3})
+    assert portfolio_weights({"tickers": ["a", "b"], "equal_weights": True}, ["B"]) == {"B": 1.0}
+    with pytest.raises(ValueError):
+        portfolio_weights({"tickers": ["a", "b"], "weights": {"a": 1, "b": 0}}, ["B"])
+
+
+def test_hung_and_crashed_workers_are_reported(prices, fixture_store, monkeypatch):
+    fixture_store(prices)
+    confs = {"ok.json": ["A0", "A1"], "hung.json": ["A1", "A2"], "crash.json": ["A2", "A3"], "queued.json": ["A0", "A3"]}
+    jobs = [make_job(name, {"tickers": tickers, "equal_weights": True, "freq": "Monthly"}) for name, tickers in confs.items()]
+    data, _ = fetch_universe(jobs)
+
+    def worker(job, panel, profile=False):
+        # Workers are forked, so they see this patched run_job
+        if job["name"] == "hung.json":
+            time.sleep(60)
+        if job["name"] == "crash.json":
+            os._exit(3)
+        return run_job(job, panel, profile)
+    monkeypatch.setattr(report_generator, "run_job", worker)
+
+    t0 = time.perf_counter()
+    results = run_jobs(jobs, data, workers=2, timeout=3)
+    assert time.perf_counter() - t0 < 10
+    assert not multiprocessing.active_children()
+    assert [r["name"] for r in results] == list(confs)
+    assert results[0]["error"] is None and results[3]["error"] is None
+    assert results[1]["error"] == "timeout"
+    assert results[2]["error"] == "worker exited with code 3"